@@ -1 +1,14 @@
-from .chatgpt_bot import Connect4Bot
\ No newline at end of file
+# bots are only imported when used (the ChatGPT bot needs the whole haystack stack)
+_bots = {
+    "Connect4Bot": ".chatgpt_bot",
+    "MCTSBot": ".mcts_bot",
+    "NNBot": ".nn_bot",
+    "PVSBot": ".pvs_bot",
+}
+
+
+def __getattr__(name: str):
+    if name in _bots:
+        from importlib import import_module
+        return getattr(import_module(_bots[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
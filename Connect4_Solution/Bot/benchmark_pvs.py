@@ -0,0 +1,57 @@
+import argparse
+import os
+
+from Bot import bitboard as bb
+from Bot.pvs_bot import PVSBot
+
+
+# positions as played columns (from the empty board)
+POSITIONS = {
+    "empty": [],
+    "opening": [3, 4, 3, 3, 4],
+    "middlegame": [3, 4, 4, 3, 2, 5, 5, 2, 3, 1],
+}
+
+
+def setup(moves: list[int]) -> tuple[int, int]:
+    """
+    Bitboard (current, mask) after playing the columns
+    """
+    current, mask = 0, 0
+    for col in moves:
+        current, mask = bb.play(current, mask, col)
+    return current, mask
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nodes per second and speedup of PVSBot by number of processes")
+    parser.add_argument("--depth", type=int, default=12, help="Search depth (time to depth is measured)")
+    parser.add_argument("--workers", type=int, nargs="*", help="Numbers of processes (default: 1, 2, 4, ... cores)")
+    parser.add_argument("--table-size", type=int, default=64, help="Transposition table in MB")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    workers = args.workers or sorted({1, cores} | {2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores})
+    print(f"{cores} CPU core(s), depth {args.depth}")
+    print(f"{'position':<12}{'workers':>8}{'time [s]':>10}{'nodes':>12}{'nodes/s':>12}{'speedup':>9}")
+
+    for name, moves in POSITIONS.items():
+        current, mask = setup(moves)
+        single_time = None
+
+        for n in workers:
+            # new bot per run -> empty transposition table
+            bot = PVSBot(time_limit=None, max_depth=1, workers=n, table_size_mb=args.table_size)
+            bot.analyze(current, mask)          # starts the worker processes
+            bot.max_depth = args.depth
+            result = bot.analyze(current, mask)
+            elapsed = result.nodes / bot.last_nodes_per_second
+            bot.close()
+
+            single_time = single_time or elapsed
+            print(f"{name:<12}{n:>8}{elapsed:>10.2f}{result.nodes:>12}"
+                  f"{bot.last_nodes_per_second:>12,.0f}{single_time / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
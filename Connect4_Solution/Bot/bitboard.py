@@ -0,0 +1,157 @@
+"""
+Bitboard representation of a Connect4 board (8 columns x 7 rows)
+
+Every column uses HEIGHT + 1 bits (one spare bit on top), bit 0 of a
+column is its bottom cell:
+
+     6 14 22 30 38 46 54 62
+     5 13 21 29 37 45 53 61
+    ...
+     0  8 16 24 32 40 48 56
+
+A position is described by two integers:
+    current:    stones of the player to move
+    mask:       all stones
+"""
+
+WIDTH = 8
+HEIGHT = 7
+H1 = HEIGHT + 1
+CELLS = WIDTH * HEIGHT
+
+BOTTOM_MASK = sum(1 << (col * H1) for col in range(WIDTH))
+BOARD_MASK = BOTTOM_MASK * ((1 << HEIGHT) - 1)
+
+# single column masks
+BOTTOM = [1 << (col * H1) for col in range(WIDTH)]
+TOP = [1 << (HEIGHT - 1 + col * H1) for col in range(WIDTH)]
+COLUMN = [((1 << HEIGHT) - 1) << (col * H1) for col in range(WIDTH)]
+
+# columns ordered from the center to the edges (better moves first)
+CENTER_ORDER = sorted(range(WIDTH), key=lambda col: abs(2 * col - (WIDTH - 1)))
+
+
+def from_board(board, active_icon: str) -> tuple[int, int, int]:
+    """
+    Convert a board (as returned by get_board) to a bitboard
+
+    Parameters:
+        board (np.ndarray):     7 x 8 board with 'X', 'O' and ' ' (row 0 is the top)
+        active_icon (str):      Icon of the player to move
+
+    Returns:
+        tuple:  (current, mask, number of moves played)
+    """
+    current = 0
+    mask = 0
+    moves = 0
+    for row in range(HEIGHT):
+        for col in range(WIDTH):
+            cell = board[row][col]
+            if cell not in ("X", "O"):
+                continue
+            bit = 1 << (col * H1 + HEIGHT - 1 - row)
+            mask |= bit
+            moves += 1
+            if cell == active_icon:
+                current |= bit
+    return current, mask, moves
+
+
+def to_board(current: int, mask: int, active_icon: str) -> list[list[str]]:
+    """
+    Convert a bitboard back to a board (list of rows, row 0 is the top)
+
+    Parameters:
+        current (int):      Stones of the player to move
+        mask (int):         All stones
+        active_icon (str):  Icon of the player to move
+
+    Returns:
+        list[list[str]]:    7 x 8 board with 'X', 'O' and ' '
+    """
+    other_icon = "O" if active_icon == "X" else "X"
+    board = []
+    for row in range(HEIGHT):
+        cells = []
+        for col in range(WIDTH):
+            bit = 1 << (col * H1 + HEIGHT - 1 - row)
+            if not mask & bit:
+                cells.append(" ")
+            else:
+                cells.append(active_icon if current & bit else other_icon)
+        board.append(cells)
+    return board
+
+
+def can_play(mask: int, col: int) -> bool:
+    """
+    Check if a column is not full
+    """
+    return not mask & TOP[col]
+
+
+def legal_moves(mask: int) -> list[int]:
+    """
+    All columns which are not full
+    """
+    return [col for col in range(WIDTH) if not mask & TOP[col]]
+
+
+def play(current: int, mask: int, col: int) -> tuple[int, int]:
+    """
+    Drop a stone of the player to move into a column
+
+    Returns:
+        tuple:  (current, mask) of the new position (the other player is to move)
+    """
+    return current ^ mask, mask | (mask + BOTTOM[col])
+
+
+def alignment(stones: int) -> bool:
+    """
+    Check if there are 4 stones in a row (vertical, horizontal or diagonal)
+    """
+    for shift in (1, H1, H1 - 1, H1 + 1):
+        pairs = stones & (stones >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def is_winning_move(current: int, mask: int, col: int) -> bool:
+    """
+    Check if the player to move wins by playing a column
+    """
+    stones = current | ((mask + BOTTOM[col]) & COLUMN[col])
+    return alignment(stones)
+
+
+def possible(mask: int) -> int:
+    """
+    Bitmask of the cells where a stone can be dropped next
+    """
+    return (mask + BOTTOM_MASK) & BOARD_MASK
+
+
+def winning_cells(stones: int, mask: int) -> int:
+    """
+    Bitmask of the empty cells which would complete 4 in a row for the given stones
+    """
+    # vertical
+    result = (stones << 1) & (stones << 2) & (stones << 3)
+
+    for shift in (H1, H1 - 1, H1 + 1):
+        # three in a row with a gap at one end
+        pairs = (stones << shift) & (stones << 2 * shift)
+        result |= pairs & (stones << 3 * shift)
+        result |= pairs & (stones >> shift)
+        pairs = (stones >> shift) & (stones >> 2 * shift)
+        result |= pairs & (stones << shift)
+        result |= pairs & (stones >> 3 * shift)
+
+    return result & (BOARD_MASK ^ mask)
+
+
+def popcount(value: int) -> int:
+    return value.bit_count()
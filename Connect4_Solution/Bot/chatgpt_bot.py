@@ -1,17 +1,8 @@
 import os
+from typing import TYPE_CHECKING
 
-
-from dotenv import load_dotenv
-
-import numpy as np
-
-from haystack import Pipeline, Document
-from haystack.utils import Secret
-from haystack.document_stores.in_memory import InMemoryDocumentStore
-from haystack.components.retrievers.in_memory import InMemoryBM25Retriever
-from haystack.components.generators import OpenAIGenerator
-from haystack.components.builders.answer_builder import AnswerBuilder
-from haystack.components.builders.prompt_builder import PromptBuilder
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Connect4Bot:
@@ -21,6 +12,15 @@ class Connect4Bot:
 
         print(F"creating Connect4Bot with ChatGPT connection")
 
+        # heavy imports only when the bot is created (importing the module stays cheap)
+        from dotenv import load_dotenv
+        from haystack import Pipeline, Document
+        from haystack.utils import Secret
+        from haystack.document_stores.in_memory import InMemoryDocumentStore
+        from haystack.components.retrievers.in_memory import InMemoryBM25Retriever
+        from haystack.components.generators import OpenAIGenerator
+        from haystack.components.builders.prompt_builder import PromptBuilder
+
         load_dotenv()
 
         api_key = os.getenv('API_KEY')
@@ -99,7 +99,7 @@ class Connect4Bot:
         return column
 
 
-    def make_move(self,board:np.ndarray, active_icon:str)->int:
+    def make_move(self,board:"np.ndarray", active_icon:str)->int:
         """
         makes a move based on a given board state
 
@@ -127,7 +127,8 @@ class Connect4Bot:
 
 
 if __name__ == "__main__":
-    
+    import numpy as np
+
     bot = Connect4Bot()
 
     # create test board
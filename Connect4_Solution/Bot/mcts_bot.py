@@ -0,0 +1,305 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Bot import bitboard as bb
+
+
+class Node:
+    """
+    Node of the search tree (one position)
+
+    Attributes:
+        current (int):      Stones of the player to move (bitboard)
+        mask (int):         All stones (bitboard)
+        move (int):         Column which led to this node (None for the root)
+        parent (Node):      Parent node
+        children (dict):    Column -> child node
+        untried (list):     Columns which are not expanded yet
+        visits (int):       Number of simulations through this node
+        wins (float):       Sum of results for the player who made 'move' (win 1, draw 0.5)
+        result (float):     Result of a finished game for the player who made 'move' (else None)
+    """
+    __slots__ = ("current", "mask", "move", "parent", "children", "untried", "visits", "wins", "result")
+
+    def __init__(self, current: int, mask: int, move: int = None, parent: "Node" = None, result: float = None) -> None:
+        self.current = current
+        self.mask = mask
+        self.move = move
+        self.parent = parent
+        self.children: dict[int, Node] = {}
+        self.untried: list[int] = [] if result is not None else bb.legal_moves(mask)
+        self.visits = 0
+        self.wins = 0.0
+        self.result = result
+
+
+class MCTS:
+    """
+    Monte Carlo Tree Search with UCT selection and random rollouts
+        The tree is kept between moves: set_position() continues with the
+        matching subtree if the new position was already searched.
+
+    Attributes:
+        root (Node):            Current position
+        exploration (float):    Exploration constant of UCT
+    """
+
+    def __init__(self, exploration: float = math.sqrt(2), rng: random.Random = None) -> None:
+        self.exploration = exploration
+        self.rng = rng or random.Random()
+        self.root: Node = None
+
+    def set_position(self, current: int, mask: int) -> None:
+        """
+        Set the position to search, reuse the old tree if it contains the position
+
+        Parameters:
+            current (int):  Stones of the player to move
+            mask (int):     All stones
+        """
+        if self.root is not None:
+            # the new position is usually 2 moves (own + enemy) after the old root
+            candidates = [self.root]
+            for _ in range(3):
+                for node in candidates:
+                    if node.current == current and node.mask == mask:
+                        node.parent = None
+                        self.root = node
+                        return
+                candidates = [child for node in candidates for child in node.children.values()]
+
+        self.root = Node(current, mask)
+
+    def search(self, deadline: float, max_simulations: int = None) -> int:
+        """
+        Run simulations until the deadline (or the number of simulations) is reached
+
+        Parameters:
+            deadline (float):       time.monotonic() when to stop
+            max_simulations (int):  Optional max. number of simulations
+
+        Returns:
+            int:    Number of simulations run
+        """
+        simulations = 0
+        while time.monotonic() < deadline and (max_simulations is None or simulations < max_simulations):
+            self.__simulate()
+            simulations += 1
+        return simulations
+
+    def statistics(self) -> dict[int, tuple[int, float]]:
+        """
+        Results of the root's children
+
+        Returns:
+            dict:   column -> (visits, wins)
+        """
+        return {col: (child.visits, child.wins) for col, child in self.root.children.items()}
+
+    def __simulate(self) -> None:
+        """
+        One iteration: selection, expansion, rollout and backpropagation
+        """
+        node = self.root
+
+        # 1. Selection (UCT) until a node with untried moves or the end of a game
+        while not node.untried and node.children and node.result is None:
+            log_visits = math.log(node.visits)
+            node = max(node.children.values(),
+                       key=lambda child: child.wins / child.visits
+                       + self.exploration * math.sqrt(log_visits / child.visits))
+
+        # 2. Expansion
+        if node.untried and node.result is None:
+            col = node.untried.pop(self.rng.randrange(len(node.untried)))
+            result = None
+            if bb.is_winning_move(node.current, node.mask, col):
+                result = 1.0
+            current, mask = bb.play(node.current, node.mask, col)
+            if result is None and mask == bb.BOARD_MASK:
+                result = 0.5
+            child = Node(current, mask, col, node, result)
+            node.children[col] = child
+            node = child
+
+        # 3. Rollout (result for the player who made the move into the node)
+        if node.result is not None:
+            reward = node.result
+        else:
+            reward = 1.0 - self.__rollout(node.current, node.mask)
+
+        # 4. Backpropagation (alternating players)
+        while node is not None:
+            node.visits += 1
+            node.wins += reward
+            reward = 1.0 - reward
+            node = node.parent
+
+    def __rollout(self, current: int, mask: int) -> float:
+        """
+        Play random moves until the game ends
+
+        Returns:
+            float:  Result for the player to move (win 1, draw 0.5, loss 0)
+        """
+        rng = self.rng
+        player_to_move = True
+        while True:
+            moves = [col for col in range(bb.WIDTH) if not mask & bb.TOP[col]]
+            if not moves:
+                return 0.5
+            col = moves[rng.randrange(len(moves))]
+            if bb.is_winning_move(current, mask, col):
+                return 1.0 if player_to_move else 0.0
+            current, mask = current ^ mask, mask | (mask + bb.BOTTOM[col])
+            player_to_move = not player_to_move
+
+
+# search tree of a worker process (kept between moves for tree reuse)
+_worker_tree: MCTS = None
+
+
+def _search_worker(current: int, mask: int, deadline: float, simulations: int,
+                   exploration: float, seed: int) -> tuple[dict, int]:
+    """
+    Search in a worker process (root parallelization)
+        deadline is a time.monotonic() of the parent (the clock is the same for all processes)
+
+    Returns:
+        tuple:  (statistics of the root's children, number of simulations)
+    """
+    global _worker_tree
+    if _worker_tree is None:
+        _worker_tree = MCTS(exploration, random.Random(seed))
+
+    _worker_tree.set_position(current, mask)
+    count = _worker_tree.search(deadline, simulations)
+    return _worker_tree.statistics(), count
+
+
+class MCTSBot:
+    """
+    Connect4 bot using Monte Carlo Tree Search
+        Same interface as Connect4Bot: make_move(board, active_icon) -> column
+
+        With more than one worker every process searches its own tree
+        (root parallelization) and the visits of the root's children are added up.
+        Every worker has its own single-process pool: each move runs exactly one
+        search per process, so every tree is reused by the same process.
+
+    Attributes:
+        time_limit (float):     Seconds per move
+        simulations (int):      Optional max. simulations per move (all workers together)
+        workers (int):          Number of processes searching in parallel
+        last_simulations (int): Simulations done for the last move
+    """
+
+    def __init__(self, time_limit: float = 1.0, simulations: int = None, workers: int = None,
+                 exploration: float = math.sqrt(2)) -> None:
+        """
+        Parameters:
+            time_limit (float):     Seconds per move
+            simulations (int):      Optional max. simulations per move
+            workers (int):          Number of processes (default: number of CPU cores)
+            exploration (float):    Exploration constant of UCT
+        """
+        self.time_limit = time_limit
+        self.simulations = simulations
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.last_simulations = 0
+
+        print(f"creating MCTSBot with {self.workers} worker(s)")
+
+        self.__tree = MCTS(exploration)
+        self.__pools = [ProcessPoolExecutor(1) for _ in range(self.workers)] if self.workers > 1 else []
+
+    def make_move(self, board, active_icon: str) -> int:
+        """
+        makes a move based on a given board state
+
+        Parameters:
+            board (ndarray):        7x8 Numpy array filled with O, X and ' '
+            active_icon (str):      Active Player Icon
+        Returns:
+            column (int)       Selected Column Nr between 0 and 7
+        """
+        current, mask, _ = bb.from_board(board, active_icon)
+        moves = bb.legal_moves(mask)
+        if not moves:
+            return 0
+
+        # obvious moves: win now, else block the enemy's win
+        for col in moves:
+            if bb.is_winning_move(current, mask, col):
+                return col
+        for col in moves:
+            if bb.is_winning_move(current ^ mask, mask, col):
+                return col
+
+        statistics = self.__search(current, mask)
+        if not statistics:
+            return moves[0]
+
+        # most visited move is the most robust choice
+        return max(statistics, key=lambda col: statistics[col][0])
+
+    def __search(self, current: int, mask: int) -> dict[int, tuple[int, float]]:
+        """
+        Search the position (in this process or in all worker processes)
+
+        Returns:
+            dict:   column -> (visits, wins) of the root's children
+        """
+        deadline = time.monotonic() + self.time_limit
+        if not self.__pools:
+            self.__tree.set_position(current, mask)
+            self.last_simulations = self.__tree.search(deadline, self.simulations)
+            return self.__tree.statistics()
+
+        simulations = None if self.simulations is None else max(1, self.simulations // self.workers)
+        seed = random.getrandbits(32)
+        futures = [pool.submit(_search_worker, current, mask, deadline, simulations, self.exploration, seed + worker)
+                   for worker, pool in enumerate(self.__pools)]
+
+        # add up the visits of all workers
+        merged: dict[int, tuple[int, float]] = {}
+        self.last_simulations = 0
+        for future in futures:
+            statistics, count = future.result()
+            self.last_simulations += count
+            for col, (visits, wins) in statistics.items():
+                old_visits, old_wins = merged.get(col, (0, 0.0))
+                merged[col] = (old_visits + visits, old_wins + wins)
+        return merged
+
+    def close(self) -> None:
+        """
+        Stop the worker processes
+        """
+        for pool in self.__pools:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+
+    bot = MCTSBot(time_limit=1.0)
+
+    # create test board (X has 3 in a row at the bottom)
+    board = [[" "] * bb.WIDTH for _ in range(bb.HEIGHT)]
+    board[6][1] = "O"
+    board[6][7] = "O"
+    board[5][1] = "O"
+    board[6][2:5] = ["X", "X", "X"]
+
+    col = bot.make_move(board, active_icon="O")
+    print(f"MCTSBot chose column {col} ({bot.last_simulations} simulations)")
+
+    # empty board -> full search
+    board = [[" "] * bb.WIDTH for _ in range(bb.HEIGHT)]
+    col = bot.make_move(board, active_icon="X")
+    print(f"MCTSBot chose column {col} on the empty board ({bot.last_simulations} simulations)")
+    bot.close()
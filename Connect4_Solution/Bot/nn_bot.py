@@ -0,0 +1,440 @@
+import math
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from Bot import bitboard as bb
+
+
+DEFAULT_WEIGHTS = os.path.join(os.path.dirname(__file__), "nn_weights.npz")
+
+# bit of every cell in the bitboard (skips the spare bit on top of each column)
+CELL_BITS = np.array([col * bb.H1 + row for col in range(bb.WIDTH) for row in range(bb.HEIGHT)])
+# cell index after mirroring the board (column c -> WIDTH - 1 - c)
+MIRROR_CELLS = np.array([(bb.WIDTH - 1 - col) * bb.HEIGHT + row for col in range(bb.WIDTH) for row in range(bb.HEIGHT)])
+INPUT_SIZE = 2 * bb.CELLS
+
+
+def encode(current: int, mask: int) -> np.ndarray:
+    """
+    Input features of a position: 56 cells of the player to move, then 56 cells of the enemy
+
+    Parameters:
+        current (int):  Stones of the player to move (bitboard)
+        mask (int):     All stones (bitboard)
+
+    Returns:
+        np.ndarray:     float32 array of length 112
+    """
+    own = np.unpackbits(np.frombuffer(current.to_bytes(8, "little"), np.uint8), bitorder="little")
+    enemy = np.unpackbits(np.frombuffer((current ^ mask).to_bytes(8, "little"), np.uint8), bitorder="little")
+    return np.concatenate((own[CELL_BITS], enemy[CELL_BITS])).astype(np.float32)
+
+
+def mirror(features: np.ndarray, policy: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mirror features (N x 112) and policies (N x 8) left <-> right (data augmentation)
+    """
+    planes = features.reshape(-1, 2, bb.CELLS)
+    mirrored = np.empty_like(planes)
+    mirrored[:, :, MIRROR_CELLS] = planes
+    return mirrored.reshape(features.shape), policy[:, ::-1]
+
+
+class PolicyValueNet:
+    """
+    Small policy / value network (NumPy, runs on the CPU)
+        112 inputs -> 128 -> 64 (ReLU) -> policy (8 logits) and value (tanh, -1...1)
+
+    Attributes:
+        params (dict[str, np.ndarray]):     Weights and biases
+    """
+
+    def __init__(self, hidden: tuple[int, int] = (128, 64), seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        h1, h2 = hidden
+
+        def layer(n_in: int, n_out: int) -> np.ndarray:
+            return (rng.standard_normal((n_in, n_out)) * math.sqrt(2.0 / n_in)).astype(np.float32)
+
+        self.params: dict[str, np.ndarray] = {
+            "W1": layer(INPUT_SIZE, h1), "b1": np.zeros(h1, np.float32),
+            "W2": layer(h1, h2), "b2": np.zeros(h2, np.float32),
+            "Wp": layer(h2, bb.WIDTH), "bp": np.zeros(bb.WIDTH, np.float32),
+            "Wv": layer(h2, 1), "bv": np.zeros(1, np.float32),
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "PolicyValueNet":
+        """
+        Load weights saved with save()
+        """
+        net = cls()
+        with np.load(path) as data:
+            net.params = {name: data[name].astype(np.float32) for name in data.files}
+        return net
+
+    def save(self, path: str) -> None:
+        np.savez(path, **self.params)
+
+    def forward(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Forward pass of a batch
+
+        Parameters:
+            x (np.ndarray):     Features (N x 112)
+
+        Returns:
+            tuple:  (policy logits (N x 8), values (N), intermediate results for backward)
+        """
+        p = self.params
+        z1 = x @ p["W1"] + p["b1"]
+        h1 = np.maximum(z1, 0)
+        z2 = h1 @ p["W2"] + p["b2"]
+        h2 = np.maximum(z2, 0)
+        logits = h2 @ p["Wp"] + p["bp"]
+        value = np.tanh(h2 @ p["Wv"] + p["bv"])[:, 0]
+        return logits, value, {"x": x, "z1": z1, "h1": h1, "z2": z2, "h2": h2}
+
+    def predict(self, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Policy (probabilities) and value of a batch
+
+        Parameters:
+            x (np.ndarray):     Features (N x 112)
+
+        Returns:
+            tuple:  (policies (N x 8), values (N))
+        """
+        logits, value, _ = self.forward(x)
+        logits = logits - logits.max(axis=1, keepdims=True)
+        policy = np.exp(logits)
+        policy /= policy.sum(axis=1, keepdims=True)
+        return policy, value
+
+    def loss_and_gradients(self, x: np.ndarray, target_policy: np.ndarray, target_value: np.ndarray,
+                           l2: float = 1e-4) -> tuple[float, dict]:
+        """
+        Loss (cross entropy of the policy + squared error of the value + L2) and its gradients
+
+        Parameters:
+            x (np.ndarray):             Features (N x 112)
+            target_policy (np.ndarray): Visit distribution of the search (N x 8)
+            target_value (np.ndarray):  Game result for the player to move (N), -1...1
+            l2 (float):                 Weight decay
+
+        Returns:
+            tuple:  (loss, gradients of all params)
+        """
+        p = self.params
+        n = x.shape[0]
+        logits, value, cache = self.forward(x)
+
+        shifted = logits - logits.max(axis=1, keepdims=True)
+        log_policy = shifted - np.log(np.exp(shifted).sum(axis=1, keepdims=True))
+        policy = np.exp(log_policy)
+
+        loss = (-(target_policy * log_policy).sum() / n
+                + ((value - target_value) ** 2).mean()
+                + l2 * sum((p[name] ** 2).sum() for name in ("W1", "W2", "Wp", "Wv")))
+
+        # backward
+        d_logits = (policy - target_policy) / n
+        d_value = (2 * (value - target_value) * (1 - value ** 2) / n)[:, None]
+
+        grads = {
+            "Wp": cache["h2"].T @ d_logits, "bp": d_logits.sum(axis=0),
+            "Wv": cache["h2"].T @ d_value, "bv": d_value.sum(axis=0),
+        }
+        d_h2 = d_logits @ p["Wp"].T + d_value @ p["Wv"].T
+        d_z2 = d_h2 * (cache["z2"] > 0)
+        grads["W2"] = cache["h1"].T @ d_z2
+        grads["b2"] = d_z2.sum(axis=0)
+        d_z1 = (d_z2 @ p["W2"].T) * (cache["z1"] > 0)
+        grads["W1"] = cache["x"].T @ d_z1
+        grads["b1"] = d_z1.sum(axis=0)
+
+        for name in ("W1", "W2", "Wp", "Wv"):
+            grads[name] = grads[name] + 2 * l2 * p[name]
+
+        return float(loss), grads
+
+
+class BatchedEvaluator:
+    """
+    Evaluates the leaves of all search threads in batches
+        Search threads call evaluate() and wait. A single inference thread collects
+        up to batch_size requests (waiting at most max_wait for more) and runs ONE
+        forward pass for all of them.
+
+    Attributes:
+        net (PolicyValueNet):   Network to evaluate with
+        batch_size (int):       Max. positions per forward pass
+        max_wait (float):       Max. seconds to wait for a full batch
+        evaluations (int):      Number of evaluated positions
+        batches (int):          Number of forward passes
+    """
+
+    def __init__(self, net: PolicyValueNet, batch_size: int = 16, max_wait: float = 0.001) -> None:
+        self.net = net
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+
+        self.evaluations = 0
+        self.batches = 0
+
+        self.__requests: queue.Queue = queue.Queue()
+        self.__thread = threading.Thread(target=self.__run, name="nn-inference", daemon=True)
+        self.__thread.start()
+
+    def evaluate(self, features: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+        Evaluate one position (blocks until its batch was evaluated)
+
+        Parameters:
+            features (np.ndarray):  Features of the position (see encode)
+
+        Returns:
+            tuple:  (policy (8), value for the player to move)
+        """
+        request = {"features": features, "done": threading.Event()}
+        self.__requests.put(request)
+        request["done"].wait()
+        return request["policy"], request["value"]
+
+    def __run(self) -> None:
+        """
+        Inference thread: collect requests to a batch and evaluate it
+        """
+        while True:
+            batch = [self.__requests.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.__requests.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+
+            policy, value = self.net.predict(np.stack([request["features"] for request in batch]))
+            self.evaluations += len(batch)
+            self.batches += 1
+
+            for i, request in enumerate(batch):
+                request["policy"] = policy[i]
+                request["value"] = float(value[i])
+                request["done"].set()
+
+
+class PUCTNode:
+    """
+    Node of the search tree
+
+    Attributes:
+        current (int):      Stones of the player to move (bitboard)
+        mask (int):         All stones (bitboard)
+        prior (float):      Probability of the network for the move into this node
+        visits (int):       Number of visits (incl. running ones -> virtual loss)
+        value_sum (float):  Sum of values for the player who moved into this node
+        children (dict):    Column -> child (empty until expanded)
+        terminal (float):   Value of a finished game for the player who moved into this node (else None)
+    """
+    __slots__ = ("current", "mask", "prior", "visits", "value_sum", "children", "terminal")
+
+    def __init__(self, current: int, mask: int, prior: float, terminal: float = None) -> None:
+        self.current = current
+        self.mask = mask
+        self.prior = prior
+        self.visits = 0
+        self.value_sum = 0.0
+        self.children: dict[int, PUCTNode] = {}
+        self.terminal = terminal
+
+
+class NNBot:
+    """
+    Connect4 bot searching with a policy / value network (PUCT like AlphaZero)
+        Same interface as Connect4Bot: make_move(board, active_icon) -> column
+
+        Several search threads share one tree (virtual loss keeps them on different paths),
+        their leaf evaluations are batched by a BatchedEvaluator.
+
+    Attributes:
+        net (PolicyValueNet):       Network (untrained if no weights file exists)
+        evaluator (BatchedEvaluator)
+        simulations (int):          Simulations per move
+        time_limit (float):         Optional max. seconds per move
+        threads (int):              Number of search threads
+    """
+
+    def __init__(self, weights: str = DEFAULT_WEIGHTS, simulations: int = 400, time_limit: float = None,
+                 threads: int = 8, c_puct: float = 1.5, batch_size: int = None) -> None:
+        """
+        Parameters:
+            weights (str):          Path of the weights (see train_nn.py)
+            simulations (int):      Simulations per move
+            time_limit (float):     Optional max. seconds per move
+            threads (int):          Number of search threads
+            c_puct (float):         Exploration constant
+            batch_size (int):       Max. batch of the evaluator (default: number of threads)
+        """
+        if weights and os.path.exists(weights):
+            self.net = PolicyValueNet.load(weights)
+        else:
+            print(f"No weights found at {weights} -> using an untrained network")
+            self.net = PolicyValueNet()
+
+        self.simulations = simulations
+        self.time_limit = time_limit
+        self.threads = threads
+        self.c_puct = c_puct
+        self.evaluator = BatchedEvaluator(self.net, batch_size or threads)
+
+        self.__lock = threading.Lock()
+
+    def make_move(self, board, active_icon: str) -> int:
+        """
+        makes a move based on a given board state
+
+        Parameters:
+            board (ndarray):        7x8 Numpy array filled with O, X and ' '
+            active_icon (str):      Active Player Icon
+        Returns:
+            column (int)       Selected Column Nr between 0 and 7
+        """
+        current, mask, _ = bb.from_board(board, active_icon)
+        moves = bb.legal_moves(mask)
+        if not moves:
+            return 0
+
+        # obvious moves: win now, else block the enemy's win
+        for col in moves:
+            if bb.is_winning_move(current, mask, col):
+                return col
+        for col in moves:
+            if bb.is_winning_move(current ^ mask, mask, col):
+                return col
+
+        visits = self.search(current, mask)
+        return int(np.argmax(visits))
+
+    def search(self, current: int, mask: int, noise: float = 0.0) -> np.ndarray:
+        """
+        Search a position with all search threads
+
+        Parameters:
+            current (int):  Stones of the player to move
+            mask (int):     All stones
+            noise (float):  Share of Dirichlet noise on the root priors (for self-play)
+
+        Returns:
+            np.ndarray:     Visits of every column (8)
+        """
+        root = PUCTNode(current, mask, 1.0)
+        policy, _ = self.evaluator.evaluate(encode(current, mask))
+        self.__expand(root, policy)
+
+        if noise and root.children:
+            dirichlet = np.random.dirichlet([0.3] * len(root.children))
+            for child, eta in zip(root.children.values(), dirichlet):
+                child.prior = (1 - noise) * child.prior + noise * eta
+
+        deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        remaining = [self.simulations]
+
+        def worker() -> None:
+            while deadline is None or time.monotonic() < deadline:
+                with self.__lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                self.__simulate(root)
+
+        threads = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        visits = np.zeros(bb.WIDTH)
+        for col, child in root.children.items():
+            visits[col] = child.visits
+        return visits
+
+    def __expand(self, node: PUCTNode, policy: np.ndarray) -> None:
+        """
+        Create the children of a node with the priors of the network (only legal moves)
+        """
+        moves = bb.legal_moves(node.mask)
+        total = sum(policy[col] for col in moves) or 1.0
+
+        children = {}
+        for col in moves:
+            terminal = None
+            if bb.is_winning_move(node.current, node.mask, col):
+                terminal = 1.0
+            current, mask = bb.play(node.current, node.mask, col)
+            if terminal is None and mask == bb.BOARD_MASK:
+                terminal = 0.0
+            children[col] = PUCTNode(current, mask, policy[col] / total, terminal)
+        node.children = children
+
+    def __select(self, node: PUCTNode) -> PUCTNode:
+        """
+        Child with the highest PUCT score
+        """
+        sqrt_visits = math.sqrt(node.visits + 1)
+        best, best_score = None, -math.inf
+        for child in node.children.values():
+            q = child.value_sum / child.visits if child.visits else 0.0
+            score = q + self.c_puct * child.prior * sqrt_visits / (1 + child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
+
+    def __simulate(self, root: PUCTNode) -> None:
+        """
+        One simulation: select a leaf, evaluate it (batched) and back up the value
+        """
+        # Selection (with virtual loss: count the visit and assume a loss until backed up)
+        with self.__lock:
+            node = root
+            path = [root]
+            while node.children and node.terminal is None:
+                node = self.__select(node)
+                path.append(node)
+            for visited in path:
+                visited.visits += 1
+                visited.value_sum -= 1.0
+
+        # Evaluation (value for the player who moved into the leaf)
+        if node.terminal is not None:
+            value = node.terminal
+        else:
+            policy, leaf_value = self.evaluator.evaluate(encode(node.current, node.mask))
+            value = -leaf_value
+            with self.__lock:
+                if not node.children:
+                    self.__expand(node, policy)
+
+        # Backup (undo virtual loss)
+        with self.__lock:
+            for visited in reversed(path):
+                visited.value_sum += value + 1.0
+                value = -value
+
+
+if __name__ == "__main__":
+
+    bot = NNBot()
+
+    board = [[" "] * bb.WIDTH for _ in range(bb.HEIGHT)]
+    start = time.perf_counter()
+    col = bot.make_move(board, active_icon="X")
+    elapsed = time.perf_counter() - start
+
+    print(f"NNBot chose column {col} in {elapsed:.2f} s")
+    print(f"{bot.evaluator.evaluations} evaluations in {bot.evaluator.batches} batches "
+          f"(avg. batch {bot.evaluator.evaluations / bot.evaluator.batches:.1f})")
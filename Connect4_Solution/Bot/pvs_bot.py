@@ -0,0 +1,450 @@
+import math
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable
+
+from Bot import bitboard as bb
+
+
+WIN = 1000                      # score of a win at ply 0 (a win at ply n is WIN - n)
+MATE_BOUND = WIN - 100          # scores above are wins / losses, not heuristic values
+INFINITY = 10 * WIN
+
+EXACT, LOWER, UPPER = 0, 1, 2   # kinds of scores in the transposition table
+NO_MOVE = 15
+
+# the two center columns (bonus for coins there)
+CENTER_MASK = bb.COLUMN[bb.WIDTH // 2 - 1] | bb.COLUMN[bb.WIDTH // 2]
+
+SearchResult = namedtuple("SearchResult", ("move", "score", "depth", "nodes"))
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside the search when the time is up or the search was stopped
+    """
+
+
+class TranspositionTable:
+    """
+    Hash table of searched positions, optionally in shared memory for several processes
+        Entries are two 64 bit words (key ^ data, data). Concurrent writes of different
+        processes are not locked: a torn entry fails the key check and counts as a miss.
+
+    Attributes:
+        entries (int):  Number of entries
+        name (str):     Name of the shared memory (None if not shared)
+    """
+
+    def __init__(self, size_mb: int = 64, shared: bool = False, name: str = None) -> None:
+        """
+        Parameters:
+            size_mb (int):  Size in MB (ignored when attaching to an existing table)
+            shared (bool):  Create the table in shared memory
+            name (str):     Attach to an existing shared table
+        """
+        self.__shm: SharedMemory = None
+        self.name: str = None
+
+        if name is not None:
+            self.__shm = SharedMemory(name=name)
+            buffer = self.__shm.buf
+        elif shared:
+            self.__shm = SharedMemory(create=True, size=size_mb * 2**20)
+            buffer = self.__shm.buf
+        else:
+            buffer = memoryview(bytearray(size_mb * 2**20))
+
+        if self.__shm is not None:
+            self.name = self.__shm.name
+
+        self.__table = buffer.cast("Q")
+        self.entries = len(self.__table) // 2
+
+    def probe(self, key: int) -> int:
+        """
+        Return the data stored for a key (None if not found)
+        """
+        index = 2 * (key % self.entries)
+        data = self.__table[index + 1]
+        if self.__table[index] ^ data == key:
+            return data
+        return None
+
+    def store(self, key: int, data: int) -> None:
+        """
+        Store data for a key (always replaces the old entry)
+        """
+        index = 2 * (key % self.entries)
+        self.__table[index] = key ^ data
+        self.__table[index + 1] = data
+
+    def close(self, unlink: bool = False) -> None:
+        """
+        Release the table (unlink: also delete the shared memory, only by its creator)
+        """
+        self.__table.release()
+        if self.__shm is not None:
+            self.__shm.close()
+            if unlink:
+                self.__shm.unlink()
+
+
+class Searcher:
+    """
+    Principal variation search (negamax with alpha-beta and null windows) with iterative deepening
+        - transposition table (can be shared between processes -> Lazy SMP)
+        - immediate wins / forced moves are detected with bitboards
+        - at the depth limit a heuristic evaluates open threats and the center
+
+    Attributes:
+        table (TranspositionTable):     Table of searched positions
+        helper (int):                   Id of the helper (changes the move order for Lazy SMP)
+        nodes (int):                    Nodes searched by the last search
+    """
+
+    def __init__(self, table: TranspositionTable, helper: int = 0) -> None:
+        self.table = table
+        self.nodes = 0
+        self.set_helper(helper)
+
+        self.__deadline: float = None
+        self.__stop = None
+
+    def set_helper(self, helper: int) -> None:
+        """
+        Helpers search the moves in a slightly different order than the main thread
+        """
+        self.helper = helper
+        edges = bb.CENTER_ORDER[2:]
+        shift = helper % len(edges)
+        self.__order = bb.CENTER_ORDER[:2] + edges[shift:] + edges[:shift]
+
+    def iterative_deepening(self, current: int, mask: int, deadline: float = None, max_depth: int = None,
+                            stop=None, on_depth: Callable[[SearchResult], None] = None) -> SearchResult:
+        """
+        Search with increasing depth until the deadline, max_depth or stop
+
+        Parameters:
+            current (int):          Stones of the player to move
+            mask (int):             All stones
+            deadline (float):       Optional time.monotonic() when to stop
+            max_depth (int):        Optional max. depth (default: until the board is full)
+            stop (Event):           Optional event to abort the search
+            on_depth (callable):    Optional callback with the result of every finished depth
+
+        Returns:
+            SearchResult:   Result of the deepest finished depth (depth 0 if none finished)
+        """
+        self.nodes = 0
+        self.__deadline = deadline
+        self.__stop = stop
+
+        empty = bb.CELLS - mask.bit_count()
+        max_depth = min(max_depth or empty, empty)
+
+        moves = bb.legal_moves(mask)
+        result = SearchResult(moves[0] if moves else None, 0, 0, 0)
+
+        # helpers start at a different depth (Lazy SMP)
+        depth = 1 + self.helper % 2
+        while depth <= max_depth:
+            try:
+                move, score = self.__root(current, mask, depth)
+            except SearchAborted:
+                break
+            result = SearchResult(move, score, depth, self.nodes)
+            if on_depth is not None:
+                on_depth(result)
+            if abs(score) > MATE_BOUND:
+                break                           # game theoretic result -> deeper is not needed
+            depth += 1
+
+        return result._replace(nodes=self.nodes)
+
+    def __check_stop(self) -> None:
+        if self.__deadline is not None and time.monotonic() >= self.__deadline:
+            raise SearchAborted()
+        if self.__stop is not None and self.__stop.is_set():
+            raise SearchAborted()
+
+    def __root(self, current: int, mask: int, depth: int) -> tuple[int, int]:
+        """
+        Search all moves of the root (best move from the table first)
+        """
+        moves = [col for col in self.__order if not mask & bb.TOP[col]]
+        for col in moves:
+            if bb.is_winning_move(current, mask, col):
+                return col, WIN - 1
+
+        data = self.table.probe(current + mask)
+        if data is not None and (data >> 26) & 0xF in moves:
+            moves.remove((data >> 26) & 0xF)
+            moves.insert(0, (data >> 26) & 0xF)
+
+        alpha, beta = -INFINITY, INFINITY
+        best_move = moves[0]
+        for i, col in enumerate(moves):
+            child_current, child_mask = current ^ mask, mask | (mask + bb.BOTTOM[col])
+            if i == 0:
+                score = -self.__negamax(child_current, child_mask, depth - 1, -beta, -alpha, 1)
+            else:
+                score = -self.__negamax(child_current, child_mask, depth - 1, -alpha - 1, -alpha, 1)
+                if alpha < score < beta:
+                    score = -self.__negamax(child_current, child_mask, depth - 1, -beta, -alpha, 1)
+            if score > alpha:
+                alpha, best_move = score, col
+
+        self.table.store(current + mask, self.__pack(depth, EXACT, alpha, 0, best_move))
+        return best_move, alpha
+
+    def __negamax(self, current: int, mask: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        Score of a position for the player to move (principal variation search)
+        """
+        self.nodes += 1
+        if not self.nodes & 1023:
+            self.__check_stop()
+
+        possible = bb.possible(mask)
+        if not possible:
+            return 0                                    # board full -> draw
+        if bb.winning_cells(current, mask) & possible:
+            return WIN - ply                            # win with the next move
+
+        # enemy threats: block a single one, two can't be blocked
+        opponent = current ^ mask
+        threats = bb.winning_cells(opponent, mask)
+        candidates = possible & threats
+        if candidates:
+            if candidates & (candidates - 1):
+                return -(WIN - ply - 1)
+        else:
+            candidates = possible
+        candidates &= ~(threats >> 1)                   # never play below an enemy threat
+        if not candidates:
+            return -(WIN - ply - 1)
+
+        if depth <= 0:
+            return self.__evaluate(current, opponent, mask, threats)
+
+        # transposition table
+        key = current + mask
+        alpha_original = alpha
+        table_move = NO_MOVE
+        data = self.table.probe(key)
+        if data is not None:
+            table_depth, flag, score, table_move = self.__unpack(data, ply)
+            if table_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        moves = [col for col in self.__order if candidates & bb.COLUMN[col]]
+        if table_move in moves:
+            moves.remove(table_move)
+            moves.insert(0, table_move)
+
+        best_score, best_move = -INFINITY, moves[0]
+        for i, col in enumerate(moves):
+            child_current, child_mask = opponent, mask | (mask + bb.BOTTOM[col])
+            if i == 0:
+                score = -self.__negamax(child_current, child_mask, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                score = -self.__negamax(child_current, child_mask, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self.__negamax(child_current, child_mask, depth - 1, -beta, -alpha, ply + 1)
+            if score > best_score:
+                best_score, best_move = score, col
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score <= alpha_original:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table.store(key, self.__pack(depth, flag, best_score, ply, best_move))
+        return best_score
+
+    @staticmethod
+    def __evaluate(current: int, opponent: int, mask: int, threats: int) -> int:
+        """
+        Heuristic score for the player to move: open threats and coins in the center
+        """
+        own_threats = bb.winning_cells(current, mask).bit_count()
+        center = (current & CENTER_MASK).bit_count() - (opponent & CENTER_MASK).bit_count()
+        return 4 * (own_threats - threats.bit_count()) + center
+
+    @staticmethod
+    def __pack(depth: int, flag: int, score: int, ply: int, move: int) -> int:
+        """
+        Pack a table entry into 64 bit (win / loss scores are stored relative to the position)
+        """
+        if score > MATE_BOUND:
+            score += ply
+        elif score < -MATE_BOUND:
+            score -= ply
+        return depth | flag << 8 | (score + 32768) << 10 | move << 26
+
+    @staticmethod
+    def __unpack(data: int, ply: int) -> tuple[int, int, int, int]:
+        """
+        Unpack a table entry: (depth, flag, score, move)
+        """
+        score = ((data >> 10) & 0xFFFF) - 32768
+        if score > MATE_BOUND:
+            score -= ply
+        elif score < -MATE_BOUND:
+            score += ply
+        return data & 0xFF, (data >> 8) & 0x3, score, (data >> 26) & 0xF
+
+
+# searcher and stop event of a worker process
+_worker_searcher: Searcher = None
+_worker_stop = None
+
+
+def _init_worker(table_name: str, stop) -> None:
+    """
+    Attach a worker process to the shared transposition table
+    """
+    global _worker_searcher, _worker_stop
+    _worker_searcher = Searcher(TranspositionTable(name=table_name))
+    _worker_stop = stop
+
+
+def _search_worker(current: int, mask: int, helper: int, time_limit: float, max_depth: int) -> SearchResult:
+    """
+    Search in a worker process, the first worker to finish stops all others
+    """
+    _worker_searcher.set_helper(helper)
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    result = _worker_searcher.iterative_deepening(current, mask, deadline, max_depth, _worker_stop)
+    _worker_stop.set()
+    return result
+
+
+class PVSBot:
+    """
+    Connect4 bot using a principal variation search (alpha-beta) with iterative deepening
+        Same interface as Connect4Bot: make_move(board, active_icon) -> column
+
+        With more than one worker, all processes search the same position and share one
+        transposition table in shared memory (Lazy SMP). The deepest finished result is used.
+
+    Attributes:
+        time_limit (float):     Seconds per move (None: until max_depth)
+        max_depth (int):        Optional max. search depth
+        workers (int):          Number of processes searching in parallel
+        last_result (SearchResult)
+        last_nodes_per_second (float)
+    """
+
+    def __init__(self, time_limit: float = 1.0, max_depth: int = None, workers: int = None,
+                 table_size_mb: int = 64) -> None:
+        """
+        Parameters:
+            time_limit (float):     Seconds per move (None: until max_depth)
+            max_depth (int):        Optional max. search depth
+            workers (int):          Number of processes (default: number of CPU cores)
+            table_size_mb (int):    Size of the transposition table
+        """
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.workers = workers or os.cpu_count() or 1
+        self.last_result: SearchResult = None
+        self.last_nodes_per_second = 0.0
+
+        print(f"creating PVSBot with {self.workers} worker(s)")
+
+        if self.workers == 1:
+            self.__table = TranspositionTable(table_size_mb)
+            self.__searcher = Searcher(self.__table)
+            self.__pool = None
+        else:
+            self.__table = TranspositionTable(table_size_mb, shared=True)
+            self.__stop = multiprocessing.Event()
+            self.__pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                              initargs=(self.__table.name, self.__stop))
+
+    def make_move(self, board, active_icon: str) -> int:
+        """
+        makes a move based on a given board state
+
+        Parameters:
+            board (ndarray):        7x8 Numpy array filled with O, X and ' '
+            active_icon (str):      Active Player Icon
+        Returns:
+            column (int)       Selected Column Nr between 0 and 7
+        """
+        current, mask, _ = bb.from_board(board, active_icon)
+        if not bb.legal_moves(mask):
+            return 0
+        return self.analyze(current, mask).move
+
+    def analyze(self, current: int, mask: int) -> SearchResult:
+        """
+        Search a position (bitboard) with all workers
+
+        Returns:
+            SearchResult:   Deepest finished result (nodes: sum of all workers)
+        """
+        start = time.perf_counter()
+
+        if self.__pool is None:
+            deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+            result = self.__searcher.iterative_deepening(current, mask, deadline, self.max_depth)
+        else:
+            self.__stop.clear()
+            futures = [self.__pool.submit(_search_worker, current, mask, helper, self.time_limit, self.max_depth)
+                       for helper in range(self.workers)]
+            results = [future.result() for future in futures]
+
+            # deepest result (the main worker wins ties)
+            result = max(results, key=lambda r: r.depth)
+            result = result._replace(nodes=sum(r.nodes for r in results))
+
+        elapsed = time.perf_counter() - start
+        self.last_result = result
+        self.last_nodes_per_second = result.nodes / elapsed if elapsed > 0 else math.inf
+        return result
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and free (unlink) the transposition table, can be called more than once
+        """
+        if self.__table is None:
+            return
+        if self.__pool is not None:
+            self.__pool.shutdown()
+        self.__table.close(unlink=self.__pool is not None)
+        self.__table = None
+
+    def __enter__(self) -> "PVSBot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+
+    with PVSBot(time_limit=2.0) as bot:
+        board = [[" "] * bb.WIDTH for _ in range(bb.HEIGHT)]
+        col = bot.make_move(board, active_icon="X")
+        result = bot.last_result
+        print(f"PVSBot chose column {col} (depth {result.depth}, score {result.score}, "
+              f"{result.nodes} nodes, {bot.last_nodes_per_second:,.0f} nodes/s)")
@@ -0,0 +1,103 @@
+import argparse
+import contextlib
+import os
+import time
+import uuid
+
+import numpy as np
+
+from game import Connect4
+from Bot import bitboard as bb
+from Bot.nn_bot import DEFAULT_WEIGHTS, NNBot, encode
+
+
+def play_game(bot: NNBot, temperature_moves: int = 8, noise: float = 0.25) -> tuple[list, str]:
+    """
+    Play one game of the bot against itself on a Connect4 instance
+
+    Parameters:
+        bot (NNBot):                Bot to search the moves
+        temperature_moves (int):    First moves are sampled by their visits (more variety)
+        noise (float):              Share of Dirichlet noise on the root priors
+
+    Returns:
+        tuple:  (list of (features, visit distribution, icon of the player to move), winner or False)
+    """
+    game = Connect4()
+    players = {}
+    for _ in range(2):
+        player_id = uuid.uuid4()
+        players[game.register_player(player_id)] = player_id
+
+    samples = []
+    while True:
+        active_icon, active_id, winner, turn_number = game.get_status()
+        if winner or turn_number >= bb.CELLS:
+            return samples, winner
+
+        current, mask, _ = bb.from_board(game.get_board(), active_icon)
+        visits = bot.search(current, mask, noise=noise)
+        policy = visits / visits.sum()
+
+        if turn_number < temperature_moves:
+            col = int(np.random.choice(bb.WIDTH, p=policy))
+        else:
+            col = int(np.argmax(visits))
+
+        samples.append((encode(current, mask), policy, active_icon))
+        game.check_move(col, active_id)
+
+
+def generate(bot: NNBot, games: int) -> dict[str, np.ndarray]:
+    """
+    Generate training data by self-play
+
+    Parameters:
+        bot (NNBot):    Bot to play with
+        games (int):    Number of games
+
+    Returns:
+        dict:   'x' features (N x 112), 'policy' (N x 8), 'value' game result for the player to move (N)
+    """
+    features, policies, values = [], [], []
+
+    for i in range(games):
+        start = time.perf_counter()
+
+        # Connect4 prints every move -> silence it
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            samples, winner = play_game(bot)
+
+        for x, policy, icon in samples:
+            features.append(x)
+            policies.append(policy)
+            values.append(0.0 if not winner else (1.0 if icon == winner else -1.0))
+
+        print(f"game {i + 1}/{games}: {len(samples)} moves, winner {winner or '-'} "
+              f"({time.perf_counter() - start:.1f} s)")
+
+    return {
+        "x": np.array(features, dtype=np.float32),
+        "policy": np.array(policies, dtype=np.float32),
+        "value": np.array(values, dtype=np.float32),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate self-play training data for the NNBot")
+    parser.add_argument("--games", type=int, default=100, help="Number of games")
+    parser.add_argument("--simulations", type=int, default=200, help="Simulations per move")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS, help="Weights of the network to play with")
+    parser.add_argument("--out", default="selfplay.npz", help="Output file")
+    args = parser.parse_args()
+
+    bot = NNBot(weights=args.weights, simulations=args.simulations)
+    data = generate(bot, args.games)
+
+    # append to existing data
+    if os.path.exists(args.out):
+        with np.load(args.out) as old:
+            data = {name: np.concatenate((old[name], data[name])) for name in data}
+
+    np.savez_compressed(args.out, **data)
+    print(f"saved {len(data['value'])} positions to {args.out}")
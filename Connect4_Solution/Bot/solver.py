@@ -0,0 +1,455 @@
+"""
+Perfect-play solver for Connect4 (8 columns x 7 rows)
+
+Scores are from the view of the player to move:
+    0       draw
+    > 0     the player to move wins, (CELLS + 1 - moves) // 2 when winning with the next move
+            -> the sooner the win, the higher the score
+    < 0     the player to move loses (same scale)
+
+A weak solve only tells win (1), draw (0) or loss (-1) and is much faster.
+
+    python -m Bot.solver 3443                   # columns played so far (0...7)
+    python -m Bot.solver 3443 --analyze         # score of every column
+    python -m Bot.solver --file positions.txt   # regression test: "<moves> <expected score>" per line
+    python -m Bot.solver --brute-force 50       # compare with a full search on random endgames
+"""
+import argparse
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from Bot import bitboard as bb
+
+
+# user cache directory, not the source tree (the server only caches if given a file)
+DEFAULT_CACHE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache")),
+                             "connect4", "solver_cache.db")
+
+
+class SolverBudgetExceeded(Exception):
+    """
+    Raised when a solve needs more nodes or time than allowed
+    """
+
+
+def mirror(stones: int) -> int:
+    """
+    Mirror a bitboard left <-> right
+    """
+    result = 0
+    for col in range(bb.WIDTH):
+        result |= ((stones >> (col * bb.H1)) & bb.COLUMN[0]) << ((bb.WIDTH - 1 - col) * bb.H1)
+    return result
+
+
+def position_key(current: int, mask: int) -> int:
+    """
+    Unique key of a position (the same for the mirrored position)
+    """
+    return min(current + mask, mirror(current) + mirror(mask))
+
+
+def parse_moves(moves: str) -> tuple[int, int]:
+    """
+    Play a sequence of columns ("3443") from the empty board
+
+    Returns:
+        tuple:  (current, mask)
+
+    Raises:
+        ValueError:     Illegal move (full column, or the game is already won)
+    """
+    current, mask = 0, 0
+    for i, char in enumerate(moves):
+        col = int(char)
+        if not 0 <= col < bb.WIDTH or not bb.can_play(mask, col):
+            raise ValueError(f"illegal move {char!r} at position {i}")
+        if bb.is_winning_move(current, mask, col):
+            raise ValueError(f"move {i} ({col}) wins the game, nothing left to solve")
+        current, mask = bb.play(current, mask, col)
+    return current, mask
+
+
+class SolverCache:
+    """
+    Disk-backed store of solved positions (SQLite), shared by all runs
+
+    Attributes:
+        path (str):     Database file
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE) -> None:
+        self.path = path
+        self.__lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.__connection = sqlite3.connect(path, check_same_thread=False)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS solved ("
+            " key INTEGER PRIMARY KEY,"         # position key (as signed 64 bit)
+            " score INTEGER NOT NULL,"
+            " exact INTEGER NOT NULL)"          # 0: weak solve (only the sign is known)
+        )
+        self.__connection.commit()
+
+    @staticmethod
+    def __signed(key: int) -> int:
+        return key - (1 << 64) if key >= 1 << 63 else key
+
+    def get(self, key: int) -> tuple[int, bool]:
+        """
+        Return (score, exact) of a solved position (None if unknown)
+        """
+        with self.__lock:
+            row = self.__connection.execute("SELECT score, exact FROM solved WHERE key = ?",
+                                            (self.__signed(key),)).fetchone()
+        return None if row is None else (row[0], bool(row[1]))
+
+    def put(self, key: int, score: int, exact: bool) -> None:
+        """
+        Store a solved position (a weak result never replaces an exact one)
+        """
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT INTO solved (key, score, exact) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET score = excluded.score, exact = excluded.exact "
+                "WHERE excluded.exact >= solved.exact",
+                (self.__signed(key), score, int(exact)))
+            self.__connection.commit()
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM solved").fetchone()[0]
+
+    def close(self) -> None:
+        self.__connection.close()
+
+
+class Solver:
+    """
+    Negamax solver with alpha-beta pruning and null-window search on bitboards
+        - only moves which don't lose immediately are searched (forced blocks are detected)
+        - moves creating the most threats are searched first
+        - upper bounds of searched positions are kept in memory (transposition table)
+        - solved positions are stored in a SolverCache on disk (optional)
+
+    Not thread safe: use one solver per thread (they can share the cache).
+
+    Attributes:
+        cache (SolverCache):    Disk cache of solved positions (None: no cache)
+        nodes (int):            Nodes searched by the last solve / analyze
+    """
+
+    def __init__(self, cache: SolverCache = None, table_size: int = 2_000_000) -> None:
+        """
+        Parameters:
+            cache (SolverCache):    Optional disk cache of solved positions
+            table_size (int):       Max. entries of the in-memory table (cleared when full)
+        """
+        self.cache = cache
+        self.nodes = 0
+        self.__table: dict[int, int] = {}
+        self.__table_size = table_size
+        self.__node_limit: int = None
+        self.__deadline: float = None
+
+    def solve(self, current: int, mask: int, weak: bool = False,
+              node_limit: int = None, time_limit: float = None) -> int:
+        """
+        Game theoretic score of a position
+
+        Parameters:
+            current (int):      Stones of the player to move
+            mask (int):         All stones
+            weak (bool):        Only win (1) / draw (0) / loss (-1)
+            node_limit (int):   Optional max. number of nodes
+            time_limit (float): Optional max. seconds
+
+        Returns:
+            int:    Score for the player to move
+
+        Raises:
+            SolverBudgetExceeded:   Not solved within the limits
+        """
+        self.nodes = 0
+        self.__node_limit = node_limit
+        self.__deadline = None if time_limit is None else time.monotonic() + time_limit
+        return self.__solve(current, mask, weak)
+
+    def analyze(self, current: int, mask: int, weak: bool = False,
+                node_limit: int = None, time_limit: float = None) -> list[int]:
+        """
+        Score of every column for the player to move (the limits are for all columns together)
+
+        Returns:
+            list:   Score per column (None: full column or not solved within the limits)
+        """
+        self.nodes = 0
+        self.__node_limit = node_limit
+        self.__deadline = None if time_limit is None else time.monotonic() + time_limit
+
+        moves = mask.bit_count()
+        scores = [None] * bb.WIDTH
+        # center columns first: the best moves are solved if the budget runs out
+        for col in bb.CENTER_ORDER:
+            if not bb.can_play(mask, col):
+                continue
+            if bb.is_winning_move(current, mask, col):
+                scores[col] = 1 if weak else (bb.CELLS + 1 - moves) // 2
+                continue
+            try:
+                scores[col] = -self.__solve(*bb.play(current, mask, col), weak)
+            except SolverBudgetExceeded:
+                break
+        return scores
+
+    def __solve(self, current: int, mask: int, weak: bool) -> int:
+        moves = mask.bit_count()
+        if bb.winning_cells(current, mask) & bb.possible(mask):
+            score = (bb.CELLS + 1 - moves) // 2
+            return 1 if weak else score
+
+        key = position_key(current, mask)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None and (cached[1] or weak):
+                score, _ = cached
+                return (score > 0) - (score < 0) if weak else score
+
+        # null-window search: narrow [min, max] until the exact score is known
+        low, high = -((bb.CELLS - moves) // 2), (bb.CELLS + 1 - moves) // 2
+        if weak:
+            low, high = -1, 1
+        while low < high:
+            middle = low + (high - low) // 2
+            if middle <= 0 and int(low / 2) < middle:
+                middle = int(low / 2)
+            elif middle >= 0 and int(high / 2) > middle:
+                middle = int(high / 2)
+            score = self.__negamax(current, mask, middle, middle + 1)
+            if weak:
+                # fail-soft: the score may lie outside [-1, 1], only its side of the window counts
+                score = max(-1, min(1, score))
+            if score <= middle:
+                high = score
+            else:
+                low = score
+
+        if self.cache is not None:
+            self.cache.put(key, low, not weak)
+        return low
+
+    def __negamax(self, current: int, mask: int, alpha: int, beta: int) -> int:
+        """
+        Score of a position within [alpha, beta] (the player to move can't win immediately)
+        """
+        self.nodes += 1
+        if not self.nodes & 4095:
+            if self.__node_limit is not None and self.nodes >= self.__node_limit:
+                raise SolverBudgetExceeded()
+            if self.__deadline is not None and time.monotonic() >= self.__deadline:
+                raise SolverBudgetExceeded()
+
+        moves = mask.bit_count()
+        opponent = current ^ mask
+
+        # moves which don't lose immediately
+        possible = bb.possible(mask)
+        threats = bb.winning_cells(opponent, mask)
+        forced = possible & threats
+        if forced:
+            if forced & (forced - 1):
+                return -((bb.CELLS - moves) // 2)       # two threats -> lost
+            possible = forced
+        candidates = possible & ~(threats >> 1)
+        if not candidates:
+            return -((bb.CELLS - moves) // 2)
+        if moves >= bb.CELLS - 2:
+            return 0                                    # draw: no one can win anymore
+
+        # the enemy can't win before his second move from now
+        low = -((bb.CELLS - 2 - moves) // 2)
+        if alpha < low:
+            alpha = low
+            if alpha >= beta:
+                return alpha
+
+        # we can't win with the next move
+        high = (bb.CELLS - 1 - moves) // 2
+        key = current + mask
+        bound = self.__table.get(key)
+        if bound is not None:
+            high = min(high, bound)
+        if beta > high:
+            beta = high
+            if alpha >= beta:
+                return beta
+
+        # moves with the most own threats first (center first on ties)
+        ordered = []
+        for col in bb.CENTER_ORDER:
+            move = candidates & bb.COLUMN[col]
+            if move:
+                threat_count = bb.winning_cells(current | move, mask).bit_count()
+                ordered.append((-threat_count, len(ordered), move))
+        ordered.sort()
+
+        for _, _, move in ordered:
+            score = -self.__negamax(opponent, mask | move, -beta, -alpha)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+
+        if len(self.__table) >= self.__table_size:
+            self.__table.clear()
+        self.__table[key] = alpha                       # upper bound of the score
+        return alpha
+
+
+def brute_force(current: int, mask: int, memo: dict = None) -> int:
+    """
+    Score of a position by a full minimax search without pruning (only for endgames, reference for the solver)
+    """
+    memo = {} if memo is None else memo
+    key = current + mask
+    if key not in memo:
+        moves = mask.bit_count()
+        best = None
+        for col in range(bb.WIDTH):
+            if not bb.can_play(mask, col):
+                continue
+            if bb.is_winning_move(current, mask, col):
+                score = (bb.CELLS + 1 - moves) // 2
+            else:
+                score = -brute_force(*bb.play(current, mask, col), memo)
+            best = score if best is None else max(best, score)
+        memo[key] = 0 if best is None else best     # full board: draw
+    return memo[key]
+
+
+def random_endgame(rng: random.Random, empty: int) -> tuple[str, int, int]:
+    """
+    Random position with the given number of empty cells which is not decided yet
+
+    Returns:
+        tuple:  (moves, current, mask)
+    """
+    while True:
+        moves, current, mask = "", 0, 0
+        while mask.bit_count() < bb.CELLS - empty:
+            col = rng.choice(bb.legal_moves(mask))
+            if bb.is_winning_move(current, mask, col):
+                break
+            current, mask = bb.play(current, mask, col)
+            moves += str(col)
+        else:
+            return moves, current, mask
+
+
+def check_brute_force(solver: Solver, positions: int, empty: int = 12, seed: int = 0) -> int:
+    """
+    Compare solve / analyze (exact and weak) with brute_force on random endgames
+
+    Returns:
+        int:    Number of positions with a wrong result (printed)
+    """
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(positions):
+        moves, current, mask = random_endgame(rng, empty)
+        memo = {}
+        expected = brute_force(current, mask, memo)
+        columns = []
+        for col in range(bb.WIDTH):
+            if not bb.can_play(mask, col):
+                columns.append(None)
+            elif bb.is_winning_move(current, mask, col):
+                columns.append((bb.CELLS + 1 - mask.bit_count()) // 2)
+            else:
+                columns.append(-brute_force(*bb.play(current, mask, col), memo))
+        signs = [None if score is None else (score > 0) - (score < 0) for score in columns]
+
+        results = {
+            "solve": (solver.solve(current, mask), expected),
+            "solve weak": (solver.solve(current, mask, weak=True), (expected > 0) - (expected < 0)),
+            "analyze": (solver.analyze(current, mask), columns),
+            "analyze weak": (solver.analyze(current, mask, weak=True), signs),
+        }
+        wrong = [f"{name}: {result} (expected {reference})" for name, (result, reference) in results.items()
+                 if result != reference]
+        if wrong:
+            failures += 1
+            print(f"{moves}: FAILED " + ", ".join(wrong))
+    print(f"{positions - failures} of {positions} positions ok ({empty} empty cells)")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve Connect4 positions (perfect play)")
+    parser.add_argument("moves", nargs="?", default="", help="Columns played from the empty board, e.g. 3443")
+    parser.add_argument("--weak", action="store_true", help="Only win / draw / loss")
+    parser.add_argument("--analyze", action="store_true", help="Score of every column")
+    parser.add_argument("--file", help="Regression test: one '<moves> [expected score]' per line")
+    parser.add_argument("--brute-force", type=int, metavar="N",
+                        help="Regression test: compare with a full search on N random endgames")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Cache of solved positions ('' to disable)")
+    parser.add_argument("--nodes", type=int, help="Max. nodes per position")
+    parser.add_argument("--time", type=float, help="Max. seconds per position")
+    args = parser.parse_args()
+
+    if args.brute_force:
+        # without cache: the results of the solver itself are checked
+        failures = check_brute_force(Solver(), args.brute_force)
+        if failures:
+            raise SystemExit(f"{failures} position(s) failed")
+        return
+
+    cache = SolverCache(args.cache) if args.cache else None
+    solver = Solver(cache)
+
+    if args.file:
+        positions = []
+        with open(args.file) as file:
+            for line in file:
+                if line.strip():
+                    moves, *expected = line.split()
+                    positions.append((moves, int(expected[0]) if expected else None))
+    else:
+        positions = [(args.moves, None)]
+
+    failures = 0
+    for moves, expected in positions:
+        try:
+            current, mask = parse_moves(moves)
+        except ValueError as e:
+            parser.error(f"{moves}: {e}")
+        start = time.perf_counter()
+        try:
+            if args.analyze:
+                result = solver.analyze(current, mask, args.weak, args.nodes, args.time)
+            else:
+                result = solver.solve(current, mask, args.weak, args.nodes, args.time)
+        except SolverBudgetExceeded:
+            result = "not solved"
+        elapsed = time.perf_counter() - start
+
+        status = ""
+        if expected is not None:
+            if args.weak and isinstance(result, int):
+                expected = (expected > 0) - (expected < 0)
+            status = "ok" if result == expected else f"FAILED (expected {expected})"
+            failures += result != expected
+        print(f"{moves or '-'}: {result} ({solver.nodes} nodes, {elapsed:.2f} s) {status}")
+
+    if cache is not None:
+        print(f"{len(cache)} positions in {cache.path}")
+        cache.close()
+    if failures:
+        raise SystemExit(f"{failures} position(s) failed")
+
+
+if __name__ == "__main__":
+    main()
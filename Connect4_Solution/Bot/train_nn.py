@@ -0,0 +1,75 @@
+import argparse
+import os
+
+import numpy as np
+
+from Bot.nn_bot import DEFAULT_WEIGHTS, PolicyValueNet, mirror
+
+
+def train(net: PolicyValueNet, data: dict, epochs: int = 10, batch_size: int = 256,
+          learning_rate: float = 1e-3, l2: float = 1e-4, seed: int = 0) -> None:
+    """
+    Train the network with Adam on self-play data (mirrored positions are added)
+
+    Parameters:
+        net (PolicyValueNet):   Network to train (updated in place)
+        data (dict):            'x', 'policy' and 'value' (see selfplay.py)
+        epochs (int):           Passes over the data
+        batch_size (int):       Positions per update
+        learning_rate (float):  Step size of Adam
+        l2 (float):             Weight decay
+        seed (int):             Seed of the shuffling
+    """
+    x_mirrored, policy_mirrored = mirror(data["x"], data["policy"])
+    x = np.concatenate((data["x"], x_mirrored))
+    policy = np.concatenate((data["policy"], policy_mirrored))
+    value = np.concatenate((data["value"], data["value"]))
+
+    rng = np.random.default_rng(seed)
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    m = {name: np.zeros_like(param) for name, param in net.params.items()}
+    v = {name: np.zeros_like(param) for name, param in net.params.items()}
+    step = 0
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(x))
+        losses = []
+
+        for start in range(0, len(x), batch_size):
+            batch = order[start:start + batch_size]
+            loss, grads = net.loss_and_gradients(x[batch], policy[batch], value[batch], l2)
+            losses.append(loss)
+
+            step += 1
+            for name, grad in grads.items():
+                m[name] = beta1 * m[name] + (1 - beta1) * grad
+                v[name] = beta2 * v[name] + (1 - beta2) * grad ** 2
+                m_hat = m[name] / (1 - beta1 ** step)
+                v_hat = v[name] / (1 - beta2 ** step)
+                net.params[name] -= (learning_rate * m_hat / (np.sqrt(v_hat) + eps)).astype(np.float32)
+
+        print(f"epoch {epoch + 1}/{epochs}: loss {np.mean(losses):.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the NNBot network on self-play data")
+    parser.add_argument("--data", default="selfplay.npz", help="Self-play data (see selfplay.py)")
+    parser.add_argument("--weights", default=DEFAULT_WEIGHTS, help="Weights to continue from and to save to")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    if os.path.exists(args.weights):
+        net = PolicyValueNet.load(args.weights)
+        print(f"continue training of {args.weights}")
+    else:
+        net = PolicyValueNet()
+
+    with np.load(args.data) as npz:
+        data = {name: npz[name] for name in npz.files}
+    print(f"training on {len(data['value'])} positions (+ mirrored)")
+
+    train(net, data, args.epochs, args.batch_size, args.learning_rate)
+    net.save(args.weights)
+    print(f"saved weights to {args.weights}")
@@ -0,0 +1,109 @@
+import json
+import threading
+from typing import Iterator
+
+
+class BoardBroadcaster:
+    """
+    Fan-out of board states to spectators (Server-Sent Events)
+        Every new board state is serialized exactly ONCE (in publish) and the
+        very same bytes are handed to all subscribers.
+
+    Backpressure:
+        Subscribers do not have their own queue. Each one only remembers the
+        last version it has sent. A slow consumer therefore simply skips the
+        intermediate states and receives the newest frame once it is ready
+        again -> memory per subscriber stays constant.
+
+    Attributes:
+        frame (bytes):          Latest serialized SSE frame
+        version (int):          Increased with every published frame
+        subscribers (int):      Number of currently connected subscribers
+        max_subscribers (int):  Upper limit of concurrent subscribers
+        keepalive (float):      Seconds until a keepalive comment is sent
+    """
+
+    def __init__(self, max_subscribers: int = 5000, keepalive: float = 15.0) -> None:
+        self.frame: bytes = b""
+        self.version: int = 0
+        self.finished: bool = False
+
+        self.subscribers: int = 0
+        self.max_subscribers = max_subscribers
+        self.keepalive = keepalive
+
+        self.__condition = threading.Condition()
+
+    def publish(self, board: list, active_icon: str, winner: str, turn_number: int) -> None:
+        """
+        Serialize a new board state (once) and wake up all subscribers
+
+        Parameters:
+            board (list):           Board as nested list (see board.tolist())
+            active_icon (str):      Icon of the active player
+            winner (str):           Icon of the winner (or False)
+            turn_number (int):      Current turn number
+        """
+        payload = json.dumps({
+            'board': board,
+            'active_icon': active_icon,
+            'winner': winner,
+            'turn_number': turn_number
+        }, separators=(",", ":"))
+
+        # one complete SSE frame -> written as is to every subscriber
+        frame = f"id: {turn_number}\nevent: board\ndata: {payload}\n\n".encode()
+
+        with self.__condition:
+            self.frame = frame
+            self.version += 1
+            self.finished = bool(winner)
+            self.__condition.notify_all()
+
+    def try_subscribe(self) -> bool:
+        """
+        Reserve a subscriber slot
+
+        Returns:
+            bool:   False if the maximum number of subscribers is reached
+        """
+        with self.__condition:
+            if self.subscribers >= self.max_subscribers:
+                return False
+            self.subscribers += 1
+            return True
+
+    def unsubscribe(self) -> None:
+        """
+        Release a subscriber slot (called when the connection is closed)
+        """
+        with self.__condition:
+            self.subscribers -= 1
+
+    def stream(self) -> Iterator[bytes]:
+        """
+        Generator of SSE frames for ONE subscriber (slot reserved with try_subscribe)
+            - yields the current frame immediately
+            - then every newer frame (older ones are skipped if the client is slow)
+            - ends after the frame containing the winner was sent
+
+        Yields:
+            bytes:  Serialized SSE frame (or keepalive comment)
+        """
+        seen_version = 0
+        while True:
+            with self.__condition:
+                has_new = self.__condition.wait_for(lambda: self.version != seen_version,
+                                                    timeout=self.keepalive)
+                if has_new:
+                    seen_version = self.version
+                    frame = self.frame
+                    finished = self.finished
+                else:
+                    frame = b": keepalive\n\n"
+                    finished = False
+
+            yield frame
+
+            if finished:
+                break
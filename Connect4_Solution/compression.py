@@ -0,0 +1,159 @@
+import functools
+import gzip
+import hashlib
+import mimetypes
+import os
+from collections import namedtuple
+
+from flask import Response
+
+
+MIN_SIZE = 256                      # smaller bodies are sent uncompressed
+LONG_CACHE = "public, max-age=31536000, immutable"      # for file names with a content hash
+
+# a static file: content hash and body per encoding (None: uncompressed)
+Asset = namedtuple("Asset", ("name", "hashed_name", "etag", "mimetype", "bodies"))
+
+
+@functools.lru_cache(maxsize=None)
+def _brotli():
+    """
+    Brotli module if installed (optional, gzip is always available)
+    """
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        return None
+
+
+def choose_encoding(accept_encodings) -> str:
+    """
+    Best encoding the client accepts ('br', 'gzip' or None)
+
+    Parameters:
+        accept_encodings:   request.accept_encodings (Accept-Encoding header)
+    """
+    if accept_encodings['br'] and _brotli() is not None:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    """
+    Compress a body with 'gzip' or 'br' (level 1...9)
+    """
+    if encoding == 'br':
+        return _brotli().compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class StaticAssets:
+    """
+    Static files, read and compressed once at startup
+        Every file is also available under a name with its content hash
+        (swagger.json -> swagger.3f2a9c1b.json), which can be cached forever.
+        The plain name is revalidated with the ETag (cheap 304 responses).
+
+    Attributes:
+        assets (dict[str, Asset]):  Files by name and by hashed name
+        max_age (int):              Seconds the plain names may be cached
+    """
+
+    def __init__(self, folder: str, max_age: int = 0) -> None:
+        """
+        Parameters:
+            folder (str):       Directory of the files (not recursive)
+            max_age (int):      Seconds the plain names may be cached (0: always revalidate)
+        """
+        self.max_age = max_age
+        self.assets: dict[str, Asset] = {}
+
+        encodings = ['gzip'] + (['br'] if _brotli() is not None else [])
+        for name in sorted(os.listdir(folder)):
+            path = os.path.join(folder, name)
+            if not os.path.isfile(path):
+                continue
+
+            with open(path, "rb") as file:
+                data = file.read()
+
+            digest = hashlib.sha256(data).hexdigest()[:12]
+            stem, extension = os.path.splitext(name)
+            mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+            bodies = {None: data}
+            if len(data) >= MIN_SIZE:
+                for encoding in encodings:
+                    compressed = compress(data, encoding, level=9)
+                    if len(compressed) < len(data):
+                        bodies[encoding] = compressed
+
+            asset = Asset(name, f"{stem}.{digest}{extension}", digest, mimetype, bodies)
+            self.assets[asset.name] = asset
+            self.assets[asset.hashed_name] = asset
+
+    def url(self, prefix: str, name: str) -> str:
+        """
+        URL of a file with its content hash (e.g. for links in pages)
+        """
+        return f"{prefix}{self.assets[name].hashed_name}"
+
+    def response(self, name: str, request) -> Response:
+        """
+        Response for a file (precompressed if the client accepts it), None if unknown
+
+        Parameters:
+            name (str):     File name (plain or hashed)
+            request:        Flask request (Accept-Encoding, If-None-Match)
+        """
+        asset = self.assets.get(name)
+        if asset is None:
+            return None
+
+        if name == asset.hashed_name:
+            cache_control = LONG_CACHE
+        elif self.max_age:
+            cache_control = f"public, max-age={self.max_age}"
+        else:
+            cache_control = "no-cache"
+
+        if request.if_none_match.contains(asset.etag):
+            response = Response(status=304)
+        else:
+            encoding = choose_encoding(request.accept_encodings)
+            if encoding not in asset.bodies:
+                encoding = None
+            response = Response(asset.bodies[encoding], mimetype=asset.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+
+        response.headers['Cache-Control'] = cache_control
+        response.set_etag(asset.etag)
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+def compress_response(response: Response, request, min_size: int = MIN_SIZE) -> Response:
+    """
+    Compress a finished response if it is worth it
+        Not compressed: errors, streams (e.g. Server-Sent Events), files, small or already encoded bodies
+    """
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or response.mimetype == 'text/event-stream'):
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
@@ -1,5 +1,6 @@
 from game import Connect4
 from player import Player
+from hardware import SenseBackend, create_sense
 
 
 class Coordinator_Local:
@@ -18,7 +19,7 @@ class Coordinator_Local:
         player2 (Player):   Local Instance of a Player (Raspi or Normal)
     """
 
-    def __init__(self, on_raspi: bool, bot:bool=False) -> None:
+    def __init__(self, on_raspi: bool, bot:bool=False, sense:SenseBackend=None) -> None:
         """
         Initialize the Coordinator_Local.
 
@@ -27,6 +28,10 @@ class Coordinator_Local:
                              If True, initializes a Raspberry Pi player; otherwise, initializes standard players.
         
             bot (bool):     Whether this player is a bot or not
+                            (True: ChatGPT bot, or a bot instance, e.g. MCTSBot())
+
+            sense (SenseBackend):   Optional LED matrix / joystick (e.g. FakeSenseHat),
+                                    default: SenseHat if available, else the emulator
         
         """
         self.game = Connect4()
@@ -35,9 +40,8 @@ class Coordinator_Local:
         # Initialize 2 players based on the platform
         if on_raspi:
             from player_raspi_local import Player_Raspi_Local
-            from sense_hat import SenseHat
             
-            self.sense = SenseHat() # same sense hat for both players
+            self.sense = sense or create_sense() # same sense hat for both players
 
             self.player_1 = Player_Raspi_Local(game=self.game, sense=self.sense)
             self.player_2 = Player_Raspi_Local(game=self.game, sense=self.sense) 
@@ -49,7 +53,7 @@ class Coordinator_Local:
 
             if bot:
                 from player_bot_local import Bot_Local
-                self.player_2 = Bot_Local(game = self.game)
+                self.player_2 = Bot_Local(game = self.game, bot = None if bot is True else bot)
             else:
                 self.player_2 = Player_Local(game=self.game)
 
@@ -65,39 +69,43 @@ class Coordinator_Local:
         self.player_2.register_in_game()
         players: list[Player] = [self.player_1, self.player_2]
 
-        while True:
-            # Get the current game status
-            active_icon, active_uuid, winner, turn_number = self.game.get_status()
+        # bots keep worker processes / shared memory -> released when the game is over
+        try:
+            while True:
+                # Get the current game status
+                active_icon, active_uuid, winner, turn_number = self.game.get_status()
 
-            # If a new turn has occurred, visualize the board
-            if turn_number > self.turn_number:
-                self.turn_number += 1
-                players[0].visualize()  # Visualize for any player
+                # If a new turn has occurred, visualize the board
+                if turn_number > self.turn_number:
+                    self.turn_number += 1
+                    players[0].visualize()  # Visualize for any player
             
-            # Check if there's a winner
-            if winner:
-                print(f"Player {winner} won the game after {turn_number} turns")
+                # Check if there's a winner
+                if winner:
+                    print(f"Player {winner} won the game after {turn_number} turns")
 
-                for player in players:
-                    if player.icon == winner:
-                        player.celebrate_win()
+                    for player in players:
+                        if player.icon == winner:
+                            player.celebrate_win()
 
-                break  # Exit the game loop
+                    break  # Exit the game loop
             
-            # Make a move for the active player
-            for player in players:            
-                if player.id == active_uuid:
-                    print(f"Move of [{active_icon}]")
-
-                    while True:
-                        col = player.make_move()
-                        made_move = self.game.check_move(col, player.id)
-
-                        if made_move:
-                            break
-                        else:
-                            print("Move was illegal. Please try again.")
-
+                # Make a move for the active player
+                for player in players:            
+                    if player.id == active_uuid:
+                        print(f"Move of [{active_icon}]")
+
+                        while True:
+                            col = player.make_move()
+                            made_move = self.game.check_move(col, player.id)
+
+                            if made_move:
+                                break
+                            else:
+                                print("Move was illegal. Please try again.")
+        finally:
+            for player in players:
+                player.close()
 
 
 if __name__ == "__main__":
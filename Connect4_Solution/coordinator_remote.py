@@ -1,5 +1,7 @@
 from time import sleep
 
+from hardware import SenseBackend, create_sense
+
 
 class Coordinator_Remote:
     """ 
@@ -14,10 +16,11 @@ class Coordinator_Remote:
     Attributes:
         api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
         player (Player):    Local Instance of ONE remote Player (Raspi or Normal)
-        sense (SenseHat):   Optional Local Instance of a SenseHat (if on Raspi)
+        sense (SenseBackend):   Optional Local Instance of a SenseHat or emulator (if on Raspi)
     """
 
-    def __init__(self, api_url: str, on_raspi: bool, bot:bool = False) -> None:
+    def __init__(self, api_url: str, on_raspi: bool, bot:bool = False, sense:SenseBackend = None,
+                 minimal:bool = False) -> None:
         """
         Initialize the Coordinator_Remote.
 
@@ -25,24 +28,37 @@ class Coordinator_Remote:
             api_url (str):      Address of Server, including Port Bsp: http://10.147.17.27:5000
             on_raspi (bool):    Indicates whether the game is running on a Raspberry Pi.
                                 If True, initializes a Raspberry Pi player; otherwise, a regular player.
+            bot (bool):         Whether this player is a bot or not
+                                (True: ChatGPT bot, or a bot instance, e.g. MCTSBot())
+            sense (SenseBackend):   Optional LED matrix / joystick (e.g. FakeSenseHat),
+                                    default: SenseHat if available, else the emulator
+            minimal (bool):     CLI / bot player without requests and NumPy (standard library only, fast startup)
         """
         self.api_url = api_url
 
         # Import the appropriate player class based on the platform
         if on_raspi:
             from player_raspi_remote import Player_Raspi_Remote
-            from sense_hat import SenseHat
 
             # Initialize the SenseHat and Raspberry Pi player
-            self.sense = SenseHat()
+            self.sense = sense or create_sense()
             self.player = Player_Raspi_Remote(api_url=api_url, sense=self.sense)
         else:
         
         # bot not yet on raspi
             if bot:
                 print(f"selected BOT")
-                from player_bot_cli import Bot_Remote
-                self.player = Bot_Remote(api_url=api_url)
+                if minimal:
+                    from player_bot_minimal import Bot_Remote_Minimal as Bot_Remote
+                else:
+                    from player_bot_cli import Bot_Remote
+                self.player = Bot_Remote(api_url=api_url, bot=None if bot is True else bot)
+
+            elif minimal:
+                from player_remote_minimal import Player_Remote_Minimal
+
+                # Initialize a remote player using only the standard library
+                self.player = Player_Remote_Minimal(api_url=api_url)
 
             else:
                 from player_remote import Player_Remote
@@ -79,36 +95,41 @@ class Coordinator_Remote:
 
         self.wait_for_second_player()  # Wait until the second player is connected
 
-        while True:
-
-            # Get the current game status
-            _, active_uuid, winner, turn_number = self.player.get_game_status()
-
-            # Update the turn number and visualize the board if it's a new turn
-            if self.turn_number < turn_number:
-                self.turn_number += 1
-                self.player.visualize()
+        # bots keep worker processes / shared memory -> released when the game is over
+        try:
+            while True:
+
+                # Get the current game status
+                _, active_uuid, winner, turn_number = self.player.get_game_status()
+
+                # Update the turn number and visualize the board if it's a new turn
+                if self.turn_number < turn_number:
+                    self.turn_number += 1
+                    self.player.visualize()
+
+                # Check if there's a winner
+                if winner:
+                    print(f"Player {winner} won the game")
+
+                    if winner == self.player.icon:
+                        # celebrate player win if you are the winner
+                        self.player.celebrate_win()
+
+                    break  # Exit the game loop
+
+                # Make moves for the player if it's their turn
+                if self.player.is_my_turn(active_uuid):
+                    made_move = False
+                    while not made_move:
+                        made_move = self.player.make_move()
+                        if not made_move:
+                            print("Move was illegal. Please try again.")
+                else:
+                    print("Waiting for the other player to make a move.")
+                    sleep(1)    # sleep a bit if not your turn
+        finally:
+            self.player.close()
 
-            # Check if there's a winner
-            if winner:
-                print(f"Player {winner} won the game")
-
-                if winner == self.player.icon:
-                    # celebrate player win if you are the winner
-                    self.player.celebrate_win()
-
-                break  # Exit the game loop
-
-            # Make moves for the player if it's their turn
-            if self.player.is_my_turn(active_uuid):
-                made_move = False
-                while not made_move:
-                    made_move = self.player.make_move()
-                    if not made_move:
-                        print("Move was illegal. Please try again.")
-            else:
-                print("Waiting for the other player to make a move.")
-                sleep(1)    # sleep a bit if not your turn
 
 if __name__ == "__main__":
     api_url = "http://localhost:5000"  # Connect 4 API server URL
@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from collections import namedtuple
+from typing import Iterable
+
+from hardware import SenseBackend
+
+
+# same structure as the events of sense_hat.stick
+InputEvent = namedtuple('InputEvent', ('timestamp', 'direction', 'action'))
+
+
+class FakeStick:
+    """
+    Stand-in for the SenseHat joystick (sense.stick)
+        Events are injected with press() / push() (e.g. from a test or another thread)
+    """
+
+    def __init__(self) -> None:
+        self.__events: queue.Queue = queue.Queue()
+
+    def push(self, direction: str, action: str = 'pressed') -> None:
+        """
+        Inject a single joystick event
+
+        Parameters:
+            direction (str):    'up', 'down', 'left', 'right' or 'middle'
+            action (str):       'pressed', 'released' or 'held'
+        """
+        self.__events.put(InputEvent(time.time(), direction, action))
+
+    def press(self, direction: str) -> None:
+        """
+        Inject a complete button press (pressed + released)
+
+        Parameters:
+            direction (str):    'up', 'down', 'left', 'right' or 'middle'
+        """
+        self.push(direction, 'pressed')
+        self.push(direction, 'released')
+
+    def play(self, script: Iterable[str], delay: float = 0.0) -> None:
+        """
+        Replay a script of button presses (e.g. ['right', 'right', 'middle'])
+
+        Parameters:
+            script (Iterable[str]):     Directions to press one after the other
+            delay (float):              Seconds between two presses
+                                        (0 -> all events are queued immediately)
+        """
+        if delay <= 0:
+            for direction in script:
+                self.press(direction)
+            return
+
+        def replay() -> None:
+            for direction in script:
+                time.sleep(delay)
+                self.press(direction)
+
+        threading.Thread(target=replay, name="joystick-script", daemon=True).start()
+
+    def get_events(self) -> list[InputEvent]:
+        """
+        Return all events since the last call (like sense.stick.get_events)
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.__events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def wait_for_event(self, emptybuffer: bool = False) -> InputEvent:
+        """
+        Block until the next event arrives (like sense.stick.wait_for_event)
+
+        Parameters:
+            emptybuffer (bool):     Drop all pending events first
+        """
+        if emptybuffer:
+            self.get_events()
+        return self.__events.get()
+
+
+class FakeSenseHat(SenseBackend):
+    """
+    In-memory SenseHat emulator to run, test and load test the Raspi players without a Raspberry Pi
+        Only implements the LED matrix and joystick methods used by the players.
+
+    Attributes:
+        stick (FakeStick):      Joystick, inject events with stick.press(...) or stick.play(...)
+        pixels (list):          Current 64 pixels (row by row)
+        frames (list):          Recorded (timestamp, 64 pixels) after every change (if record_frames)
+        frame_writes (int):     Number of set_pixels / clear calls
+        pixel_writes (int):     Number of set_pixel calls
+    """
+
+    def __init__(self, script: Iterable[str] = None, record_frames: bool = False) -> None:
+        """
+        Parameters:
+            script (Iterable[str]):     Optional joystick presses to replay (see FakeStick.play)
+            record_frames (bool):       Record every shown frame in self.frames
+        """
+        self.stick = FakeStick()
+        self.pixels: list[tuple] = [(0, 0, 0)] * 64
+
+        self.record_frames = record_frames
+        self.frames: list[tuple[float, list]] = []
+
+        self.frame_writes: int = 0
+        self.pixel_writes: int = 0
+
+        if script is not None:
+            self.stick.play(script)
+
+    def __record(self) -> None:
+        if self.record_frames:
+            self.frames.append((time.time(), list(self.pixels)))
+
+    def set_pixels(self, pixel_list: list) -> None:
+        if len(pixel_list) != 64:
+            raise ValueError('Pixel lists must have 64 elements')
+        self.pixels = [tuple(pixel) for pixel in pixel_list]
+        self.frame_writes += 1
+        self.__record()
+
+    def set_pixel(self, x: int, y: int, *args) -> None:
+        if not (0 <= x < 8 and 0 <= y < 8):
+            raise ValueError('X and Y position must be between 0 and 7')
+        pixel = args[0] if len(args) == 1 else args
+        self.pixels[y * 8 + x] = tuple(pixel)
+        self.pixel_writes += 1
+        self.__record()
+
+    def get_pixels(self) -> list[tuple]:
+        return list(self.pixels)
+
+    def get_pixel(self, x: int, y: int) -> tuple:
+        return self.pixels[y * 8 + x]
+
+    def clear(self, *args) -> None:
+        color = (0, 0, 0)
+        if len(args) == 1:
+            color = args[0]
+        elif len(args) == 3:
+            color = args
+        self.pixels = [tuple(color)] * 64
+        self.frame_writes += 1
+        self.__record()
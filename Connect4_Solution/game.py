@@ -1,13 +1,27 @@
 import uuid
+import time
 import random
+import threading
 
 import numpy as np
 
 
+# Zobrist keys: one random 64 bit number per (icon, row, column) and one for "O to move"
+#   fixed seed -> the keys are the same in every process (e.g. for persisted caches)
+_zobrist_random = random.Random(0xC4)
+ZOBRIST_KEYS = {icon: [[_zobrist_random.getrandbits(64) for col in range(8)] for row in range(7)]
+                for icon in ("X", "O")}
+ZOBRIST_O_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
 class Connect4:
     
     
-    def __init__(self) -> None:
+    def __init__(self, start_icon:str = None) -> None:
+        """
+        Parameters:
+            start_icon (str):   Icon of the starting player (None -> random, e.g. fixed for replays)
+        """
         self.rows = 7
         self.columns = 8
         self.__board = np.empty(shape = (self.rows,self.columns), dtype="str")  # 8 columns by 7 rows filled with None (for SenseHat)
@@ -38,6 +52,19 @@ class Connect4:
         # start at Turn 0
         self.__turn_number = 0
 
+        # history (for export / replay): start player, moves as (column, icon, timestamp)
+        self.start_icon = start_icon
+        self.__moves:list[tuple[int,str,float]] = []
+        self.created_at = time.time()
+        self.finished_at:float = None
+
+        # Zobrist hash of the board and of its mirror image (updated in check_move)
+        self.__hash = 0
+        self.__mirror_hash = 0
+
+        # moves and registrations vs. get_position (board and keys of the same position, e.g. for the server)
+        self.__lock = threading.Lock()
+
     """
     Methods to be exposed to the API later on
     """
@@ -50,6 +77,44 @@ class Connect4:
         """
         return self.__active_icon, self.__active_id, self.__winner, self.__turn_number
 
+    def get_position_key(self, canonical:bool = False) -> int:
+        """
+        Get a 64 bit key of the position (board and player to move), e.g. for caches
+
+        Parameters:
+            canonical (bool):   If True, a position and its mirror image (left <-> right) get the same key
+
+        Returns:
+            int:    Zobrist key of the position
+        """
+        board_hash = self.__hash
+        if canonical:
+            board_hash = min(self.__hash, self.__mirror_hash)
+
+        if self.__active_icon == "O":
+            board_hash ^= ZOBRIST_O_TO_MOVE
+        return board_hash
+
+    def get_position(self) -> tuple:
+        """
+        Snapshot of the current position (taken at once, a move in between can't mix two positions)
+
+        Returns:
+            tuple:  (active_icon, winner, turn_number, board (copy), position key, canonical position key)
+        """
+        with self.__lock:
+            return (self.__active_icon, self.__winner, self.__turn_number, self.__board.copy(),
+                    self.get_position_key(), self.get_position_key(canonical=True))
+
+    def get_moves(self) -> list[tuple[int,str,float]]:
+        """
+        Get all moves played so far
+
+        Returns:
+            list:   (column, icon, timestamp) per move
+        """
+        return list(self.__moves)
+
     def register_player(self, player_id:uuid.UUID)->str:
         """ 
         Register a player
@@ -63,21 +128,23 @@ class Connect4:
 
         print(f"Player {player_id} just registered")
         
-        # checks (when to do nothing)
-        if len(self.players) >= 2 or (player_id in list(self.players.values())):
-            return None
+        with self.__lock:
+            # checks (when to do nothing)
+            if len(self.players) >= 2 or (player_id in list(self.players.values())):
+                return None
                 
-        # passed checks -> assign ICON
-        icon = self.__available_icons[len(self.players)]
-        self.players[icon] = player_id
+            # passed checks -> assign ICON
+            icon = self.__available_icons[len(self.players)]
+            self.players[icon] = player_id
         
-        # when 2nd player enters: -> random start player
-        if len(self.players) == 2:
-            start_icon = random.choice(self.__available_icons)
-            self.__active_id = self.players[start_icon]
-            self.__active_icon = start_icon
+            # when 2nd player enters: -> random start player
+            if len(self.players) == 2:
+                start_icon = self.start_icon or random.choice(self.__available_icons)
+                self.start_icon = start_icon
+                self.__active_id = self.players[start_icon]
+                self.__active_icon = start_icon
 
-        return icon
+            return icon
 
 
     def get_board(self)-> np.ndarray:
@@ -98,24 +165,30 @@ class Connect4:
             col (int):      Selected Column of Coin Drop
             player (str):   Player Icon (X or O)
         """
-        if self.__legal_move(column, player_Id):
+        with self.__lock:
+            if self.__legal_move(column, player_Id):
             
-            # find lowest column
-            lowest_row = None
-            for row in range(0,self.rows):                      # go "down" row by row (row 0 is at the top)
-                if self.__board[row, column] == " ":            # last entry with nothing (at the bottom) 
-                    lowest_row = row
+                # find lowest column
+                lowest_row = None
+                for row in range(0,self.rows):                      # go "down" row by row (row 0 is at the top)
+                    if self.__board[row, column] == " ":            # last entry with nothing (at the bottom) 
+                        lowest_row = row
     
            
-            # write in player move to board
-            self.__board[lowest_row,column] = self.__active_icon
+                # write in player move to board
+                self.__board[lowest_row,column] = self.__active_icon
+                self.__moves.append((column, self.__active_icon, time.time()))
+
+                # update the position keys (incremental: only the new coin)
+                self.__hash ^= ZOBRIST_KEYS[self.__active_icon][lowest_row][column]
+                self.__mirror_hash ^= ZOBRIST_KEYS[self.__active_icon][lowest_row][self.columns - 1 - column]
             
-            # update the status of the game
-            self.__update_status()
+                # update the status of the game
+                self.__update_status()
 
-            return True
+                return True
         
-        return False
+            return False
         
     """ 
     Internal Method (for Game Logic)
@@ -134,6 +207,8 @@ class Connect4:
 
         # detect win and write __winner
         self.__detect_win()
+        if self.__winner or self.__turn_number >= self.rows * self.columns:
+            self.finished_at = time.time()
         
         # toggle active player
         self.__active_icon = "O" if self.__active_icon == "X" else "X"
@@ -0,0 +1,336 @@
+"""
+Export / import of played games
+
+Formats (both are written and read as a stream -> constant memory for any number of games):
+    NDJSON:     one JSON object per game and line
+    columnar:   zip archive of row groups, every row group holds one NumPy array per column
+                (moves are stored flat with offsets per game, like list arrays in Arrow / Parquet)
+
+    python game_export.py convert games.ndjson games.zip    # NDJSON <-> columnar (by file extension)
+    python game_export.py verify games.ndjson               # replay all games on Connect4 instances
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+import numpy as np
+
+from game import Connect4
+
+
+# columns of the columnar format (one value per game)
+GAME_COLUMNS = {
+    "game_id": "U36",
+    "player_x": "U36",
+    "player_o": "U36",
+    "start_icon": "U1",
+    "winner": "U1",             # '' -> no winner
+    "turn_number": np.int16,
+    "created_at": np.float64,
+    "finished_at": np.float64,  # NaN -> not finished
+}
+
+
+def game_record(game: Connect4) -> dict:
+    """
+    Snapshot of a game as a plain dict (JSON serializable)
+
+    Returns:
+        dict:   game_id, players, start_icon, moves, move_times, winner, turn_number, created_at, finished_at
+    """
+    _, _, winner, turn_number = game.get_status()
+    moves = game.get_moves()
+    return {
+        "game_id": str(game.game_id),
+        "players": {icon: str(player_id) for icon, player_id in game.players.items()},
+        "start_icon": game.start_icon,
+        "moves": [col for col, _, _ in moves],
+        "move_times": [timestamp for _, _, timestamp in moves],
+        "winner": winner or None,
+        "turn_number": turn_number,
+        "created_at": game.created_at,
+        "finished_at": game.finished_at,
+    }
+
+
+def write_ndjson(records: Iterable[dict], out: IO[str]) -> int:
+    """
+    Write games as NDJSON (one line per game)
+
+    Returns:
+        int:    Number of games written
+    """
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, separators=(",", ":")))
+        out.write("\n")
+        count += 1
+    return count
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Read games from NDJSON lines (e.g. an open file)
+    """
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+class ColumnarWriter:
+    """
+    Writes games in the columnar format, one row group at a time
+
+    Attributes:
+        row_group_size (int):   Games per row group (= games kept in memory)
+        games (int):            Number of games written
+    """
+
+    def __init__(self, file, row_group_size: int = 4096) -> None:
+        """
+        Parameters:
+            file (str | IO):        Path or binary file object
+            row_group_size (int):   Games per row group
+        """
+        self.row_group_size = row_group_size
+        self.games = 0
+
+        self.__zip = zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED)
+        self.__rows: list[dict] = []
+        self.__groups = 0
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def add(self, record: dict) -> None:
+        self.__rows.append(record)
+        self.games += 1
+        if len(self.__rows) >= self.row_group_size:
+            self.__flush()
+
+    def close(self) -> None:
+        self.__flush()
+        self.__zip.close()
+
+    def __flush(self) -> None:
+        if not self.__rows:
+            return
+
+        rows = self.__rows
+        columns = {
+            "game_id": [r["game_id"] for r in rows],
+            "player_x": [r["players"].get("X", "") for r in rows],
+            "player_o": [r["players"].get("O", "") for r in rows],
+            "start_icon": [r["start_icon"] or "" for r in rows],
+            "winner": [r["winner"] or "" for r in rows],
+            "turn_number": [r["turn_number"] for r in rows],
+            "created_at": [r["created_at"] for r in rows],
+            "finished_at": [np.nan if r["finished_at"] is None else r["finished_at"] for r in rows],
+        }
+        arrays = {name: np.array(values, dtype=GAME_COLUMNS[name]) for name, values in columns.items()}
+
+        # moves of all games in one flat array, game i: moves[offsets[i]:offsets[i + 1]]
+        arrays["move_offsets"] = np.cumsum([0] + [len(r["moves"]) for r in rows], dtype=np.int64)
+        arrays["moves"] = np.fromiter((col for r in rows for col in r["moves"]), dtype=np.int8)
+        arrays["move_times"] = np.fromiter((t for r in rows for t in r["move_times"]), dtype=np.float64)
+
+        for name, array in arrays.items():
+            with self.__zip.open(f"{self.__groups:05d}/{name}.npy", "w") as member:
+                np.save(member, array)
+
+        self.__groups += 1
+        self.__rows = []
+
+
+def iter_columnar(file) -> Iterator[dict]:
+    """
+    Read games from the columnar format (one row group in memory at a time)
+
+    Parameters:
+        file (str | IO):    Path or binary file object
+    """
+    with zipfile.ZipFile(file) as archive:
+        groups = sorted({name.split("/")[0] for name in archive.namelist()})
+        for group in groups:
+            arrays = {}
+            for name in list(GAME_COLUMNS) + ["move_offsets", "moves", "move_times"]:
+                with archive.open(f"{group}/{name}.npy") as member:
+                    arrays[name] = np.load(io.BytesIO(member.read()))
+
+            offsets = arrays["move_offsets"]
+            for i in range(len(arrays["game_id"])):
+                start, end = offsets[i], offsets[i + 1]
+                players = {icon: str(arrays[column][i]) for icon, column in (("X", "player_x"), ("O", "player_o"))
+                           if arrays[column][i]}
+                finished_at = float(arrays["finished_at"][i])
+                yield {
+                    "game_id": str(arrays["game_id"][i]),
+                    "players": players,
+                    "start_icon": str(arrays["start_icon"][i]) or None,
+                    "moves": arrays["moves"][start:end].tolist(),
+                    "move_times": arrays["move_times"][start:end].tolist(),
+                    "winner": str(arrays["winner"][i]) or None,
+                    "turn_number": int(arrays["turn_number"][i]),
+                    "created_at": float(arrays["created_at"][i]),
+                    "finished_at": None if np.isnan(finished_at) else finished_at,
+                }
+
+
+def read_games(path: str) -> Iterator[dict]:
+    """
+    Read games from a file in either format (detected by content)
+    """
+    if zipfile.is_zipfile(path):
+        yield from iter_columnar(path)
+    else:
+        with open(path) as file:
+            yield from iter_ndjson(file)
+
+
+def write_games(records: Iterable[dict], path: str) -> int:
+    """
+    Write games to a file (columnar for .zip, NDJSON otherwise)
+
+    Returns:
+        int:    Number of games written
+    """
+    if path.endswith(".zip"):
+        with ColumnarWriter(path) as writer:
+            for record in records:
+                writer.add(record)
+        return writer.games
+
+    with open(path, "w") as file:
+        return write_ndjson(records, file)
+
+
+def replay(record: dict) -> Connect4:
+    """
+    Replay an exported game on a new Connect4 instance
+
+    Returns:
+        Connect4:   Game after all moves
+
+    Raises:
+        ValueError:     A move is illegal or the result differs from the record
+    """
+    game = Connect4(start_icon=record["start_icon"])
+    missing = [icon for icon in ("X", "O") if icon not in record["players"]]
+    if missing:
+        raise ValueError(f"game {record['game_id']}: players {', '.join(missing)} missing (game not started)")
+    for icon in ("X", "O"):
+        game.register_player(uuid.UUID(record["players"][icon]))
+
+    for i, col in enumerate(record["moves"]):
+        _, active_id, _, _ = game.get_status()
+        if not game.check_move(col, active_id):
+            raise ValueError(f"game {record['game_id']}: illegal move {i} (column {col})")
+
+    _, _, winner, turn_number = game.get_status()
+    if (winner or None) != record["winner"] or turn_number != record["turn_number"]:
+        raise ValueError(f"game {record['game_id']}: replay ends with winner {winner or None} "
+                         f"after {turn_number} turns, expected {record['winner']} after {record['turn_number']}")
+    return game
+
+
+def _verify_batch(records: list[dict]) -> list[str]:
+    """
+    Replay a batch of games (in a worker process), return the errors
+    """
+    errors = []
+    # Connect4 prints every move -> silence it
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for record in records:
+            try:
+                replay(record)
+            except (ValueError, KeyError) as e:
+                errors.append(str(e))
+    return errors
+
+
+def verify(records: Iterable[dict], workers: int = None, batch_size: int = 500) -> tuple[int, list[str]]:
+    """
+    Replay games in parallel processes (only a few batches are in flight -> constant memory)
+
+    Returns:
+        tuple:  (number of games, errors)
+    """
+    workers = workers or os.cpu_count() or 1
+    records = iter(records)
+    games, errors, pending = 0, [], []
+
+    with ProcessPoolExecutor(workers) as pool:
+        while True:
+            batch = list(islice(records, batch_size))
+            if batch:
+                games += len(batch)
+                pending.append(pool.submit(_verify_batch, batch))
+            if pending and (not batch or len(pending) >= 2 * workers):
+                errors.extend(pending.pop(0).result())
+            if not batch and not pending:
+                return games, errors
+
+
+class GameArchive:
+    """
+    Append-only NDJSON file of finished games (kept on disk, not in memory)
+
+    Attributes:
+        path (str):     Archive file
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.__lock = threading.Lock()
+
+    def append(self, record: dict) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.__lock, open(self.path, "a") as file:
+            file.write(line)
+
+    def __iter__(self) -> Iterator[dict]:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as file:
+            yield from iter_ndjson(file)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert and verify exported Connect4 games")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="Convert between NDJSON and columnar (.zip)")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    check = commands.add_parser("verify", help="Replay all games and compare the results")
+    check.add_argument("source")
+    check.add_argument("--workers", type=int, help="Processes (default: number of CPU cores)")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        count = write_games(read_games(args.source), args.target)
+        print(f"converted {count} games to {args.target}")
+    else:
+        start = time.perf_counter()
+        games, errors = verify(read_games(args.source), args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"replayed {games} games in {elapsed:.1f} s ({games / elapsed:.0f} games/s), {len(errors)} error(s)")
+        for error in errors[:10]:
+            print(error)
+        if errors:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import os
+from abc import ABC, abstractmethod
+
+
+class SenseBackend(ABC):
+    """
+    Abstract LED matrix (8x8) and joystick as used by the Raspi players
+        - SenseHatBackend:  real SenseHat on the Raspberry Pi
+        - FakeSenseHat:     in-memory emulator (see fake_sense_hat.py)
+
+    Attributes:
+        stick:  Joystick with get_events() and wait_for_event()
+    """
+
+    stick = None
+
+    @abstractmethod
+    def set_pixels(self, pixel_list: list) -> None:
+        """
+        Set all 64 pixels (row by row)
+        """
+        raise NotImplementedError("Subclasses must implement 'set_pixels'")
+
+    @abstractmethod
+    def set_pixel(self, x: int, y: int, *args) -> None:
+        """
+        Set a single pixel
+        """
+        raise NotImplementedError("Subclasses must implement 'set_pixel'")
+
+    @abstractmethod
+    def get_pixels(self) -> list:
+        """
+        Return all 64 pixels (row by row)
+        """
+        raise NotImplementedError("Subclasses must implement 'get_pixels'")
+
+    @abstractmethod
+    def clear(self, *args) -> None:
+        """
+        Set all pixels to one color (default: off)
+        """
+        raise NotImplementedError("Subclasses must implement 'clear'")
+
+
+class SenseHatBackend(SenseBackend):
+    """
+    Real SenseHat (only importable on the Raspberry Pi)
+    """
+
+    def __init__(self) -> None:
+        from sense_hat import SenseHat      # imported here -> other backends work without sense_hat
+
+        self.__sense = SenseHat()
+        self.stick = self.__sense.stick
+
+    def set_pixels(self, pixel_list: list) -> None:
+        self.__sense.set_pixels(pixel_list)
+
+    def set_pixel(self, x: int, y: int, *args) -> None:
+        self.__sense.set_pixel(x, y, *args)
+
+    def get_pixels(self) -> list:
+        return self.__sense.get_pixels()
+
+    def clear(self, *args) -> None:
+        self.__sense.clear(*args)
+
+
+def create_sense(backend: str = None) -> SenseBackend:
+    """
+    Create a LED matrix / joystick backend
+
+    Parameters:
+        backend (str):  'sensehat', 'emulator' or 'auto' (default: environment variable
+                        CONNECT4_SENSE_BACKEND or 'auto')
+                        'auto' uses the SenseHat if available, else the emulator
+
+    Returns:
+        SenseBackend:   The created backend
+    """
+    backend = backend or os.environ.get("CONNECT4_SENSE_BACKEND", "auto")
+
+    if backend == "sensehat":
+        return SenseHatBackend()
+
+    if backend == "auto":
+        try:
+            return SenseHatBackend()
+        except ImportError:
+            print("No SenseHat available -> using the emulator")
+
+    elif backend != "emulator":
+        raise ValueError(f"Unknown SenseHat backend '{backend}'")
+
+    from fake_sense_hat import FakeSenseHat
+    return FakeSenseHat()
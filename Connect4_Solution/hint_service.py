@@ -0,0 +1,162 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Hashable
+
+from Bot.pvs_bot import SearchResult, Searcher, TranspositionTable
+
+
+class HintJob:
+    """
+    Background analysis of one position
+
+    Attributes:
+        version (Hashable):     State version of the analyzed position
+        result (SearchResult):  Deepest finished result so far (None if no depth is finished yet)
+        finished (bool):        Search ended (time up, cancelled or fully searched)
+        cancelled (Event):      Set to stop the search
+    """
+
+    def __init__(self, version: Hashable, current: int, mask: int) -> None:
+        self.version = version
+        self.current = current
+        self.mask = mask
+        self.result: SearchResult = None
+        self.finished = False
+        self.cancelled = threading.Event()
+
+        self.__condition = threading.Condition()
+
+    def update(self, result: SearchResult) -> None:
+        """
+        Store the result of a finished depth and wake up waiting requests
+        """
+        with self.__condition:
+            self.result = result
+            self.__condition.notify_all()
+
+    def finish(self) -> None:
+        with self.__condition:
+            self.finished = True
+            self.__condition.notify_all()
+
+    def wait(self, timeout: float) -> SearchResult:
+        """
+        Return the deepest result, wait at most timeout seconds if there is none yet
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.result is not None or self.finished, timeout)
+            return self.result
+
+
+class HintService:
+    """
+    Analyzes game positions in the background so hints can be answered at once
+        A new position of a game replaces (cancels) the analysis of its old position.
+        Requests never wait for the search: they get the deepest finished result,
+        at most 'latency' seconds are waited if no depth has finished yet.
+
+    Attributes:
+        latency (float):        Max. seconds a hint request waits for a first result
+        max_time (float):       Max. seconds a position is analyzed
+        max_games (int):        Number of games analyzed (oldest are evicted and cancelled)
+    """
+
+    def __init__(self, workers: int = 2, latency: float = 0.05, max_time: float = 30.0,
+                 max_games: int = 100, table_size_mb: int = 16) -> None:
+        """
+        Parameters:
+            workers (int):          Threads searching in parallel
+            latency (float):        Max. seconds a hint request waits for a first result
+            max_time (float):       Max. seconds a position is analyzed
+            max_games (int):        Number of games analyzed (oldest are evicted and cancelled)
+            table_size_mb (int):    Transposition table shared by all searches
+        """
+        self.latency = latency
+        self.max_time = max_time
+        self.max_games = max_games
+
+        self.__table = TranspositionTable(table_size_mb)
+        self.__pool = ThreadPoolExecutor(workers, thread_name_prefix="connect4-hint")
+        self.__jobs: OrderedDict = OrderedDict()        # game -> HintJob
+        self.__lock = threading.Lock()
+
+    def analyze(self, game: Hashable, version: Hashable, current: int, mask: int) -> None:
+        """
+        Start the analysis of a new position of a game (the old one is cancelled)
+
+        Parameters:
+            game (Hashable):        Game key (e.g. game_id)
+            version (Hashable):     State version of the position
+            current (int):          Stones of the player to move (bitboard)
+            mask (int):             All stones (bitboard)
+        """
+        job = HintJob(version, current, mask)
+
+        with self.__lock:
+            old = self.__jobs.pop(game, None)
+            if old is not None:
+                old.cancelled.set()
+            self.__jobs[game] = job
+
+            # evict the least recently started games
+            while len(self.__jobs) > self.max_games:
+                _, evicted = self.__jobs.popitem(last=False)
+                evicted.cancelled.set()
+
+        self.__pool.submit(self.__search, job)
+
+    def cancel(self, game: Hashable) -> None:
+        """
+        Stop the analysis of a game (e.g. when it is over)
+        """
+        with self.__lock:
+            job = self.__jobs.pop(game, None)
+        if job is not None:
+            job.cancelled.set()
+
+    def hint(self, game: Hashable, version: Hashable, latency: float = None) -> tuple[SearchResult, bool]:
+        """
+        Deepest result for the current position of a game
+
+        Parameters:
+            game (Hashable):        Game key
+            version (Hashable):     Expected state version (older analyses are ignored)
+            latency (float):        Max. seconds to wait if no depth is finished yet (default: self.latency)
+
+        Returns:
+            tuple:  (SearchResult or None, search finished)
+        """
+        with self.__lock:
+            job = self.__jobs.get(game)
+        if job is None or job.version != version:
+            return None, False
+
+        # min() passes nan through -> a nan latency falls back to self.latency
+        if latency is None or math.isnan(latency):
+            latency = self.latency
+        result = job.wait(max(0.0, min(latency, self.latency)))
+        return result, job.finished
+
+    def close(self) -> None:
+        """
+        Cancel all analyses, stop the threads and free the transposition table
+        """
+        with self.__lock:
+            for job in self.__jobs.values():
+                job.cancelled.set()
+            self.__jobs.clear()
+        self.__pool.shutdown(wait=True)
+        self.__table.close()
+
+    def __search(self, job: HintJob) -> None:
+        try:
+            if job.cancelled.is_set():
+                return          # replaced before a thread was free
+            searcher = Searcher(self.__table)
+            searcher.iterative_deepening(job.current, job.mask, time.monotonic() + self.max_time,
+                                         stop=job.cancelled, on_depth=job.update)
+        finally:
+            job.finish()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+
+# entry points: name -> statement importing everything the entry point needs before it can play
+ENTRY_POINTS = {
+    "server": "from server import Connect4Server",
+    "coordinator_local": "from coordinator_local import Coordinator_Local; import player_local",
+    "coordinator_remote (CLI)": "from coordinator_remote import Coordinator_Remote; import player_remote",
+    "coordinator_remote (minimal)": "from coordinator_remote import Coordinator_Remote; import player_remote_minimal",
+    "coordinator_remote (raspi)": "from coordinator_remote import Coordinator_Remote; import player_raspi_remote",
+    "bot worker (ChatGPT bot module)": "import player_bot_cli; import Bot.chatgpt_bot",
+    "bot worker (MCTSBot)": "import player_bot_cli; from Bot.mcts_bot import MCTSBot",
+    "bot worker (minimal, MCTSBot)": "import player_bot_minimal; from Bot.mcts_bot import MCTSBot",
+    "bot worker (minimal, PVSBot)": "import player_bot_minimal; from Bot.pvs_bot import PVSBot",
+}
+
+
+def measure(statement: str, repeat: int = 5) -> tuple[float, float, list[tuple[str, int]]]:
+    """
+    Measure the import cost of a statement in fresh interpreters (python -X importtime)
+
+    Parameters:
+        statement (str):    Python statement to run
+        repeat (int):       Runs (the fastest is reported)
+
+    Returns:
+        tuple:  (seconds until exit, seconds of all imports, [(package, microseconds)] slowest first)
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=directory,
+                                 capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if process.returncode != 0:
+            raise RuntimeError(process.stderr.strip().splitlines()[-1])
+
+        # lines: "import time: <self us> | <cumulative us> | <indented module name>"
+        #   nested imports are listed before the module importing them
+        modules = []
+        packages = {}
+        nested = []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if name[1:].startswith(" "):
+                nested.append((name.strip().split(".")[0], int(cumulative)))
+                continue
+
+            # top level import: the entry point (or the interpreter startup, e.g. site)
+            modules.append((name.strip(), int(cumulative)))
+            if name.strip() not in ("site", "encodings"):
+                # outermost import of every package (e.g. numpy instead of numpy.core)
+                for package, us in nested:
+                    packages[package] = max(packages.get(package, 0), us)
+            nested = []
+
+        for module, _ in modules:
+            packages.pop(module.split(".")[0], None)
+
+        total = sum(us for _, us in modules) / 1e6
+        if best is None or wall < best[0]:
+            best = (wall, total, sorted(packages.items(), key=lambda m: m[1], reverse=True))
+
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time of every entry point (python -X importtime)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per entry point (fastest is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest imported packages to show")
+    args = parser.parse_args()
+
+    print(f"{'entry point':<34}{'startup [ms]':>14}{'imports [ms]':>14}   slowest imports")
+    for name, statement in ENTRY_POINTS.items():
+        try:
+            wall, total, modules = measure(statement, args.repeat)
+        except RuntimeError as e:
+            print(f"{name:<34}{'failed':>14}   {e}")
+            continue
+
+        slowest = ", ".join(f"{module} {us / 1000:.0f}" for module, us in modules[:args.top])
+        print(f"{name:<34}{wall * 1000:>14.0f}{total * 1000:>14.0f}   {slowest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from typing import Callable
+
+
+BLINK_INTERVAL = 0.25       # seconds between two toggles of the selection LED
+
+# one reader per SenseHat (two local players share the same SenseHat)
+_joysticks: dict = {}
+
+
+class JoystickInput:
+    """
+    Event driven joystick input
+        A daemon thread blocks in sense.stick.wait_for_event() and puts every
+        event into a queue -> no polling, an event is handled as soon as it arrives.
+
+    Attributes:
+        sense (SenseHat):       SenseHat (or FakeSenseHat) to read the joystick of
+        events (queue.Queue):   Joystick events not handled yet
+    """
+
+    def __init__(self, sense) -> None:
+        self.sense = sense
+        self.events: queue.Queue = queue.Queue()
+
+        self.__thread = threading.Thread(target=self.__read_events, name="joystick", daemon=True)
+        self.__thread.start()
+
+    def __read_events(self) -> None:
+        """
+        Input thread: forward every joystick event into the queue
+        """
+        while True:
+            self.events.put(self.sense.stick.wait_for_event())
+
+    def get(self, timeout: float):
+        """
+        Wait for the next joystick event
+
+        Parameters:
+            timeout (float):    Max. seconds to wait
+
+        Returns:
+            InputEvent:     Next event or None if the timeout passed
+        """
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+def get_joystick(sense) -> JoystickInput:
+    """
+    Return the (shared) JoystickInput of a SenseHat
+
+    Parameters:
+        sense (SenseHat):   SenseHat (or FakeSenseHat)
+    """
+    if id(sense) not in _joysticks:
+        _joysticks[id(sense)] = JoystickInput(sense)
+    return _joysticks[id(sense)]
+
+
+def select_column(joystick: JoystickInput, show_choice: Callable[[int, bool], None],
+                  width: int = 8, blink_interval: float = BLINK_INTERVAL) -> int:
+    """
+    Let the player select a column with the joystick (left / right, middle to select)
+        Waits for events (no polling), the LED only blinks every blink_interval.
+
+    Parameters:
+        joystick (JoystickInput):   Input of the SenseHat
+        show_choice (callable):     show_choice(column, toggle_on) to visualize the choice
+        width (int):                Number of columns
+        blink_interval (float):     Seconds between two toggles of the selection LED
+
+    Returns:
+        col (int):  Selected column (0...width-1)
+    """
+    col = 0  # Start column at 0
+    toggle_on = True
+
+    show_choice(col, toggle_on)
+    next_blink = time.monotonic() + blink_interval
+
+    while True:
+        event = joystick.get(timeout=max(0.0, next_blink - time.monotonic()))
+
+        if event is None:
+            # blink timer -> toggle LED
+            toggle_on = not toggle_on
+            next_blink = time.monotonic() + blink_interval
+
+        elif event.action == 'pressed':
+            if event.direction == 'left':
+                col = (col - 1) % width     # Move left, wrap around if needed
+            elif event.direction == 'right':
+                col = (col + 1) % width     # Move right, wrap around if needed
+            elif event.direction == 'middle':
+                return col                  # Select the current column
+            else:
+                continue
+
+            # show the new selection immediately
+            toggle_on = True
+            next_blink = time.monotonic() + blink_interval
+
+        else:
+            continue        # 'released' / 'held' -> nothing to show
+
+        show_choice(col, toggle_on)
+
+
+if __name__ == "__main__":
+    # Benchmark on a normal PC: input latency and LED updates with a FakeSenseHat
+    from fake_sense_hat import FakeSenseHat
+    from led_renderer import LEDRenderer
+
+    sense = FakeSenseHat()
+    renderer = LEDRenderer(sense, "X", (255, 0, 0), (0, 0, 255))
+    renderer.draw_board([[" "] * 8 for _ in range(7)], turn_number=0)
+
+    def show_choice(col: int, toggle_on: bool) -> None:
+        renderer.draw_cursor(col, toggle_on)
+
+    joystick = get_joystick(sense)
+    latencies = []
+    rounds = 50
+
+    for _ in range(rounds):
+        def press_later() -> None:
+            time.sleep(0.02)
+            sense.stick.press('right')
+            pressed_at.append(time.perf_counter())
+            sense.stick.press('middle')
+
+        pressed_at = []
+        threading.Thread(target=press_later).start()
+        select_column(joystick, show_choice)
+        latencies.append(time.perf_counter() - pressed_at[0])
+
+    latencies.sort()
+    print(f"{rounds} selections")
+    print(f"input latency median: {latencies[len(latencies) // 2] * 1000:.3f} ms, max: {latencies[-1] * 1000:.3f} ms")
+    print(f"LED writes: {sense.frame_writes} frames, {sense.pixel_writes} single pixels")
+
+    # idle: count LED updates while waiting for input for 2 seconds
+    sense.pixel_writes = 0
+    threading.Timer(2.0, sense.stick.press, args=('middle',)).start()
+    select_column(joystick, show_choice)
+    print(f"LED pixel writes during 2s idle blinking: {sense.pixel_writes}")
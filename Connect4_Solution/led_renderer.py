@@ -0,0 +1,103 @@
+EMPTY_COLOR = (0, 0, 0)            # Black for empty spaces
+
+# which renderer drew the frame currently shown on a SenseHat (key: id of SenseHat)
+#   -> two local players share one SenseHat, each with their own colors
+_frame_owner: dict = {}
+
+
+class LEDRenderer:
+    """
+    Renders the Connect4 board on the 8x8 LED matrix of a SenseHat
+        - top row:      selection of the player (blinking cursor)
+        - rows 1...7:   8 x 7 board
+
+    The full frame is only built and sent (set_pixels) when the turn number changes.
+    The blinking cursor only updates single pixels (set_pixel).
+
+    Attributes:
+        sense (SenseHat):       SenseHat (or emulator) to draw on
+        icon (str):             Own icon ('X' or 'O')
+        color (tuple):          Own color (also used for the cursor)
+        enemy_color (tuple):    Color of the enemy
+        turn_number (int):      Turn of the currently cached frame (None if nothing drawn yet)
+    """
+
+    def __init__(self, sense, icon: str, color: tuple, enemy_color: tuple, width: int = 8) -> None:
+        self.sense = sense
+        self.icon = icon
+        self.color = tuple(color)
+        self.enemy_color = tuple(enemy_color)
+        self.width = width
+
+        # cell value -> LED color (everything else, e.g. " ", is empty)
+        enemy_icon = "X" if icon == "O" else "O"
+        self.__cell_colors = {icon: self.color, enemy_icon: self.enemy_color}
+
+        self.turn_number: int = None
+        self.__cursor_column: int = None        # column of the cursor pixel which is on
+
+    def needs_update(self, turn_number: int) -> bool:
+        """
+        Check if the board has to be rendered again
+
+        Parameters:
+            turn_number (int):  Current turn number of the game
+
+        Returns:
+            bool:   True if the shown frame is outdated (or drawn by someone else)
+        """
+        return turn_number != self.turn_number or _frame_owner.get(id(self.sense)) is not self
+
+    def draw_board(self, board, turn_number: int) -> None:
+        """
+        Render the board (only if the turn number changed)
+
+        Parameters:
+            board (np.ndarray):     7 x 8 board with 'X', 'O' and ' '
+            turn_number (int):      Turn number the board belongs to
+        """
+        if not self.needs_update(turn_number):
+            return
+
+        # first row is empty (used for the cursor), then 8 by 7 board
+        frame = [EMPTY_COLOR] * self.width
+        for row in board:
+            frame.extend(self.__cell_colors.get(cell, EMPTY_COLOR) for cell in row)
+
+        self.sense.set_pixels(frame)
+
+        self.turn_number = turn_number
+        self.__cursor_column = None
+        _frame_owner[id(self.sense)] = self
+
+    def draw_cursor(self, column: int, toggle_on: bool) -> None:
+        """
+        Show / hide the selection cursor in the top row (single pixel updates)
+
+        Parameters:
+            column (int):       Selected column
+            toggle_on (bool):   LED on if True
+        """
+        if not 0 <= column < self.width:
+            return
+
+        target = column if toggle_on else None
+        if target == self.__cursor_column:
+            return                                  # nothing changed -> no LED update
+
+        # switch off old cursor pixel
+        if self.__cursor_column is not None:
+            self.sense.set_pixel(self.__cursor_column, 0, EMPTY_COLOR)
+
+        # switch on new cursor pixel
+        if target is not None:
+            self.sense.set_pixel(target, 0, self.color)
+
+        self.__cursor_column = target
+
+    def invalidate(self) -> None:
+        """
+        Forget the cached frame (e.g. after the LED matrix was cleared)
+        """
+        self.turn_number = None
+        self.__cursor_column = None
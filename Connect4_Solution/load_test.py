@@ -0,0 +1,265 @@
+import argparse
+import contextlib
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from itertools import cycle, islice
+
+import requests
+
+from game_export import read_games
+from server import Connect4Server
+
+
+ROUTES = ('/connect4/register', '/connect4/status', '/connect4/board', '/connect4/check_move')
+
+
+class RouteStats:
+    """
+    Latencies and errors per route of one client (merged after the run -> no locking)
+
+    Attributes:
+        latencies (dict[str, list[float]]):     Seconds per successful request
+        errors (dict[str, int]):                Failed requests (HTTP error or exception)
+        rate_limited (dict[str, int]):          Requests answered with 429
+    """
+
+    def __init__(self) -> None:
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.rate_limited = defaultdict(int)
+
+    def merge(self, other: "RouteStats") -> None:
+        for route in ROUTES:
+            self.latencies[route].extend(other.latencies[route])
+            self.errors[route] += other.errors[route]
+            self.rate_limited[route] += other.rate_limited[route]
+
+
+class LoadClient:
+    """
+    Virtual client using the API exactly as Player_Remote does
+        register -> poll status -> on a new turn get the board -> check_move when it is its turn
+
+    Attributes:
+        api_url (str):          Server of the game
+        id (UUID):              Player ID
+        moves (list[int]):      Columns to replay (index: turn number), random legal columns after that
+        poll_interval (float):  Seconds between two status requests while waiting
+        stats (RouteStats)
+    """
+
+    def __init__(self, api_url: str, moves: list[int], poll_interval: float, deadline: float,
+                 seed: int, keep_alive: bool = False) -> None:
+        self.api_url = api_url
+        self.id = uuid.uuid4()
+        self.moves = moves
+        self.poll_interval = poll_interval
+        self.deadline = deadline
+        self.stats = RouteStats()
+        self.finished = False
+
+        self.__rng = random.Random(seed)
+        self.__http = requests.Session() if keep_alive else requests
+
+    def request(self, method: str, route: str, **kwargs) -> requests.Response:
+        """
+        Timed request (None if it failed)
+        """
+        start = time.perf_counter()
+        try:
+            response = self.__http.request(method, f'{self.api_url}{route}', timeout=10, **kwargs)
+        except requests.RequestException:
+            self.stats.errors[route] += 1
+            return None
+        elapsed = time.perf_counter() - start
+
+        if response.status_code == 429:
+            self.stats.rate_limited[route] += 1
+        elif response.status_code >= 400:
+            self.stats.errors[route] += 1
+        else:
+            self.stats.latencies[route].append(elapsed)
+        return response
+
+    def run(self) -> None:
+        response = self.request('POST', '/connect4/register', json={'player_id': str(self.id)})
+        if response is None or response.status_code != 200:
+            return
+
+        turn_number = -1
+        board = None
+        while time.monotonic() < self.deadline:
+            response = self.request('GET', '/connect4/status')
+            if response is None or response.status_code != 200:
+                time.sleep(self.poll_interval)
+                continue
+            status = response.json()
+
+            if status['winner'] or status['turn_number'] >= 56:
+                self.finished = True
+                return
+
+            # new turn -> get the board (as the players visualize it)
+            if status['turn_number'] > turn_number:
+                turn_number = status['turn_number']
+                response = self.request('GET', '/connect4/board')
+                board = response.json()['board'] if response is not None and response.status_code == 200 else None
+
+            if status['active_id'] != str(self.id):
+                time.sleep(self.poll_interval)
+                continue
+
+            column = self.choose_column(turn_number, board)
+            self.request('POST', '/connect4/check_move', json={'column': column, 'player_id': str(self.id)})
+
+    def choose_column(self, turn_number: int, board: list) -> int:
+        """
+        Recorded move of this turn, else a random column which is not full
+        """
+        if turn_number < len(self.moves):
+            return self.moves[turn_number]
+        if board is None:
+            return self.__rng.randrange(8)
+        return self.__rng.choice([col for col in range(8) if board[0][col] == ' '])
+
+
+class Spectator:
+    """
+    Polls status and board at a fixed interval (e.g. dashboards)
+    """
+
+    def __init__(self, client: LoadClient, players: list[LoadClient]) -> None:
+        self.client = client
+        self.players = players
+
+    def run(self) -> None:
+        while time.monotonic() < self.client.deadline and not all(p.finished for p in self.players):
+            self.client.request('GET', '/connect4/status')
+            self.client.request('GET', '/connect4/board')
+            time.sleep(self.client.poll_interval)
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def synthetic_games():
+    """
+    Endless random games (random columns are chosen by the clients)
+    """
+    while True:
+        yield {'moves': []}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test of Connect4Server: replays games with many clients")
+    parser.add_argument("--games", type=int, default=20, help="Concurrent games (one local server each)")
+    parser.add_argument("--url", nargs="*", help="Fresh servers to test instead of local ones (one game each)")
+    parser.add_argument("--replay", help="Exported games to replay (NDJSON or columnar, see game_export.py)")
+    parser.add_argument("--spectators", type=int, default=0, help="Clients polling status and board per game")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between two polls of a client")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Rate limit of the local servers (default: off)")
+    parser.add_argument("--keep-alive", action="store_true", help="Reuse connections (Player_Remote does not)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Max. seconds to run")
+    parser.add_argument("--base-port", type=int, default=7000, help="Port of the first local server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Exit with an error above this rate (0...1)")
+    parser.add_argument("--max-p95", type=float, default=None, help="Exit with an error if a route's p95 is above (ms)")
+    args = parser.parse_args()
+
+    game_count = len(args.url) if args.url else args.games
+    recorded = None
+    if args.replay:
+        # at most one recorded game per client game, cycled if the file has fewer
+        recorded = list(islice(read_games(args.replay), game_count))
+        if not recorded:
+            parser.error(f"no games in {args.replay}")
+        games = cycle(recorded)
+    else:
+        games = synthetic_games()
+    servers = []
+
+    # the servers and the game print a lot -> silence them during the run
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if args.url:
+            urls = args.url
+        else:
+            urls = []
+            for i in range(args.games):
+                server = Connect4Server(rate_limit=args.rate_limit, hint_workers=0, archive_path=None, solver_cache=None)
+                servers.append(server.run_in_background(port=args.base_port + i))
+                urls.append(f"http://127.0.0.1:{args.base_port + i}")
+
+        deadline = time.monotonic() + args.duration
+        players, workers = [], []
+        for i, url in enumerate(urls):
+            record = next(games)
+            game_players = [LoadClient(url, record['moves'], args.poll_interval, deadline, args.seed * 100000 + 2 * i + p,
+                                       args.keep_alive) for p in range(2)]
+            players.extend(game_players)
+            workers.extend(client.run for client in game_players)
+
+            for s in range(args.spectators):
+                spectator = LoadClient(url, [], args.poll_interval, deadline, 0, args.keep_alive)
+                players.append(spectator)
+                workers.append(Spectator(spectator, game_players).run)
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=work, daemon=True) for work in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        elapsed = time.perf_counter() - start
+
+    for server in servers:
+        server.shutdown()
+
+    # Report
+    stats = RouteStats()
+    for client in players:
+        stats.merge(client.stats)
+    finished = sum(client.finished for client in players) // 2
+
+    replayed = f", replaying {len(recorded)} recorded game(s)" if recorded is not None else ""
+    print(f"{len(urls)} games ({finished} finished{replayed}), {len(workers)} clients, {elapsed:.1f} s")
+    print(f"{'route':<22}{'requests':>10}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>9}{'429':>7}")
+
+    failed = False
+    total_requests = total_errors = 0
+    for route in ROUTES:
+        latencies = stats.latencies[route]
+        errors = stats.errors[route]
+        requests_sent = len(latencies) + errors + stats.rate_limited[route]
+        total_requests += requests_sent
+        total_errors += errors
+        if not requests_sent:
+            continue
+
+        p50, p95, p99 = (percentile(latencies, p) * 1000 if latencies else float('nan') for p in (50, 95, 99))
+        print(f"{route:<22}{requests_sent:>10}{requests_sent / elapsed:>9.1f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}"
+              f"{errors / requests_sent:>9.1%}{stats.rate_limited[route]:>7}")
+
+        if args.max_p95 is not None and p95 > args.max_p95:
+            print(f"FAILED: p95 of {route} is {p95:.1f} ms (max. {args.max_p95} ms)")
+            failed = True
+
+    error_rate = total_errors / total_requests if total_requests else 0.0
+    print(f"{'total':<22}{total_requests:>10}{total_requests / elapsed:>9.1f}{'':>27}{error_rate:>9.1%}")
+    if args.max_error_rate is not None and error_rate > args.max_error_rate:
+        print(f"FAILED: error rate {error_rate:.1%} (max. {args.max_error_rate:.1%})")
+        failed = True
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
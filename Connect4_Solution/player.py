@@ -89,4 +89,15 @@ class Player(ABC):
         Raises:
             NotImplementedError: If the method is not implemented in a subclass.
         """
-        raise NotImplementedError("Subclasses must implement 'celebrate_win'")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement 'celebrate_win'")
+
+    def close(self) -> None:
+        """
+        Release resources of the player (e.g. worker processes of a bot), nothing by default
+        """
+
+    def __enter__(self) -> "Player":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
\ No newline at end of file
@@ -1,7 +1,5 @@
 from player_remote import Player_Remote
 
-from Bot.chatgpt_bot import Connect4Bot
-
 
 class Bot_Remote(Player_Remote):
 
@@ -12,18 +10,23 @@ class Bot_Remote(Player_Remote):
 
         Parameters:
             api_url (str): The base URL of the Connect 4 API server (e.g., http://localhost:5000).
+            bot:           Optional bot with make_move(board, active_icon) -> column
+                           (e.g. MCTSBot), default: Connect4Bot (ChatGPT)
         
         Raises:
             ValueError: If 'api_url' is not provided in kwargs.
         """
         super().__init__(**kwargs)
 
-        self.bot = Connect4Bot()
+        self.bot = kwargs.get("bot")
+        if self.bot is None:
+            from Bot.chatgpt_bot import Connect4Bot
+            self.bot = Connect4Bot()
 
     
     def make_move(self) -> bool:
         """ 
-        Make a move using the ChatGPT Bot
+        Make a move using the Bot
         """
         try:
             
@@ -31,9 +34,9 @@ class Bot_Remote(Player_Remote):
             while not move_made:
                 
                 board = self.get_board()
-                print(f"Asking ChatGPT for next move")
+                print(f"Asking {type(self.bot).__name__} for next move")
                 col = self.bot.make_move(board=board, active_icon=self.icon)
-                print(f"ChatGPT chose column {col}")
+                print(f"{type(self.bot).__name__} chose column {col}")
 
                 move_made = super().make_move(col)
             
@@ -46,4 +49,11 @@ class Bot_Remote(Player_Remote):
         super().register_in_game()
 
         print(f"Bot has Icon {self.icon}")
-         
\ No newline at end of file
+
+    def close(self) -> None:
+        """
+        Release the bot (e.g. worker processes and shared memory of PVSBot / MCTSBot)
+        """
+        close = getattr(self.bot, "close", None)
+        if close is not None:
+            close()
@@ -1,7 +1,5 @@
 from player_local import Player_Local
 
-from Bot.chatgpt_bot import Connect4Bot
-
 
 class Bot_Local(Player_Local):
 
@@ -11,18 +9,23 @@ class Bot_Local(Player_Local):
 
         Parameters:
             game: (Connect4)        Connect4 instance
+            bot:                    Optional bot with make_move(board, active_icon) -> column
+                                    (e.g. MCTSBot), default: Connect4Bot (ChatGPT)
         
         Raises:
             ValueError: If 'game' is not provided in kwargs.
         """
         super().__init__(**kwargs)
 
-        self.bot = Connect4Bot()
+        self.bot = kwargs.get("bot")
+        if self.bot is None:
+            from Bot.chatgpt_bot import Connect4Bot
+            self.bot = Connect4Bot()
 
     
     def make_move(self) -> int:
         """ 
-        Make a move using the ChatGPT Bot
+        Make a move using the Bot
         """
         tries = 1
         while True:
@@ -32,5 +35,12 @@ class Bot_Local(Player_Local):
                 return col
             except:
                 tries+= 1
-                print(f"Error while Prompting ChatGPT ... trying again (Try {tries})")
-                
\ No newline at end of file
+                print(f"Error while asking the Bot ... trying again (Try {tries})")
+
+    def close(self) -> None:
+        """
+        Release the bot (e.g. worker processes and shared memory of PVSBot / MCTSBot)
+        """
+        close = getattr(self.bot, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,59 @@
+from player_remote_minimal import Player_Remote_Minimal
+
+
+class Bot_Remote_Minimal(Player_Remote_Minimal):
+    """
+    Remote BOT player with minimal dependencies (standard library client, see Player_Remote_Minimal)
+        -> fast startup for short-lived bot workers
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Initialize the a BOT player to play with the provided API URL.
+
+        Parameters:
+            api_url (str): The base URL of the Connect 4 API server (e.g., http://localhost:5000).
+            bot:           Optional bot with make_move(board, active_icon) -> column
+                           (e.g. MCTSBot), default: Connect4Bot (ChatGPT)
+
+        Raises:
+            ValueError: If 'api_url' is not provided in kwargs.
+        """
+        super().__init__(**kwargs)
+
+        self.bot = kwargs.get("bot")
+        if self.bot is None:
+            from Bot.chatgpt_bot import Connect4Bot
+            self.bot = Connect4Bot()
+
+    def make_move(self) -> bool:
+        """
+        Make a move using the Bot
+        """
+        try:
+            move_made = False
+            while not move_made:
+
+                board = self.get_board()
+                print(f"Asking {type(self.bot).__name__} for next move")
+                col = self.bot.make_move(board=board, active_icon=self.icon)
+                print(f"{type(self.bot).__name__} chose column {col}")
+
+                move_made = super().make_move(col)
+
+            return True
+        except:
+            return False
+
+    def register_in_game(self):
+        super().register_in_game()
+
+        print(f"Bot has Icon {self.icon}")
+
+    def close(self) -> None:
+        """
+        Release the bot (e.g. worker processes and shared memory of PVSBot / MCTSBot)
+        """
+        close = getattr(self.bot, "close", None)
+        if close is not None:
+            close()
@@ -1,8 +1,7 @@
-import time
-
-from sense_hat import SenseHat
-
 from player_local import Player_Local
+from hardware import SenseBackend
+from led_renderer import LEDRenderer
+from joystick_input import JoystickInput, get_joystick, select_column
 
 
 class Player_Raspi_Local(Player_Local):
@@ -18,7 +17,7 @@ class Player_Raspi_Local(Player_Local):
 
         Parameters:
             game (Connect4): Game instance.
-            sense (SenseHat): Shared SenseHat instance for all players.
+            sense (SenseBackend): Shared SenseHat (or emulator) for all players.
         
         Raises:
             ValueError: If 'sense' is not provided in kwargs.
@@ -28,15 +27,19 @@ class Player_Raspi_Local(Player_Local):
 
         # Extract the SenseHat instance from kwargs
         try:
-            self.sense: SenseHat = kwargs["sense"]
+            self.sense: SenseBackend = kwargs["sense"]
         except KeyError:
-            raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseHat instance) attribute")
+            raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseBackend instance) attribute")
 
 
         self.sense.clear()          # Clear LED matrix on init
 
         self.color:tuple = None         # set in register_in_game
         self.enemy_color:tuple = None    # set in register_in_game
+        self.renderer:LEDRenderer = None # set in register_in_game
+
+        # joystick events are read by an input thread (shared per SenseHat)
+        self.joystick:JoystickInput = get_joystick(self.sense)
 
     # override register in game
     def register_in_game(self):
@@ -56,52 +59,25 @@ class Player_Raspi_Local(Player_Local):
             self.enemy_color = player_X_color
             print(f"You [{self.icon}] are blue")
 
+        self.renderer = LEDRenderer(self.sense, self.icon, self.color, self.enemy_color, self.board_width)
+
     
     def visualize_choice(self, selected_column:int=None, toggle_on:bool = False)->None:
         """ 
         Visualize the choice and the board on the sense-hat
+            The board is only rendered again if the turn changed,
+            the choice only toggles the LED in the top row.
 
         Parameters:
             selected_column (int):  Optional Which is the currently selected column
             toggle_on (bool):       Optional, to toggle selection LED (LED on if True)
         """
-        # list of icons
-        board = self.game.get_board()
-
-        # Colors for the LED matrix
-        empty_color = [0, 0, 0]             # Black for empty spaces
-        # selection_color = [255, 255, 0]   # Yellow for selected column
-        selection_color = self.color        # own color but blinking
+        turn_number = self.game.get_status()[3]
+        self.renderer.draw_board(self.game.get_board(), turn_number)
 
-        # identify own and enemy icon
-        enemy_icon = "X" if self.icon == "O" else "O"
-
-        # board to visualize (64 x 3 list)
-        led_matrix = []
-
-        # First add row row of empty spaces (to be filled with choice)
-        led_matrix.extend([empty_color] * 8)
-
-
-        # Now add 8 by 7 board state
-        for row in board:
-            for cell in row:
-                if cell == "":                      # empty cell
-                    led_matrix.append(empty_color)
-                elif cell == enemy_icon:            # enemy cell
-                    led_matrix.append(self.enemy_color)  
-                elif cell == self.icon:             # own cell
-                    led_matrix.append(self.color)    
-
-        
-        # if on (during blinking)
-        if toggle_on:
-            # Highlight the selected column in the top row with yellow
-            if 0 <= selected_column < self.board_width:
-                led_matrix[selected_column] = selection_color  # Top row is the first 8 pixels
-
-        # Display the current game board on the Sense HAT LED matrix
-        self.sense.set_pixels(led_matrix)
+        # if a column is selected -> blink it
+        if selected_column is not None:
+            self.renderer.draw_cursor(selected_column, toggle_on)
 
 
     def visualize(self) -> None:
@@ -116,6 +92,16 @@ class Player_Raspi_Local(Player_Local):
         # visualize on CLI
         super().visualize()
 
+    def show_choice(self, column:int, toggle_on:bool) -> None:
+        """
+        Show the currently selected column (callback for select_column)
+
+        Parameters:
+            column (int):       Currently selected column
+            toggle_on (bool):   Selection LED on if True
+        """
+        self.visualize_choice(selected_column=column, toggle_on=toggle_on)
+
     def make_move(self) -> int:
         """
         Override make_move for Raspberry Pi input using the Sense HAT joystick.
@@ -124,30 +110,8 @@ class Player_Raspi_Local(Player_Local):
         Returns:
             col (int):  Selected column (0...7)
         """
-        col = 0  # Start column at 0
-        selected = False
-        toggle_on = True   # toggle state of select LED
-
-        while not selected:
-            
-            toggle_on = not toggle_on     # Toggle LED
-            
-            
-            time.sleep(0.1)
-
-            # Wait for joystick input
-            for event in self.sense.stick.get_events():
-                if event.action == 'pressed':
-                    if event.direction == 'left':
-                        col = (col - 1) % self.board_width  # Move left, wrap around if needed
-                    elif event.direction == 'right':
-                        col = (col + 1) % self.board_width  # Move right, wrap around if needed
-                    elif event.direction == 'middle':
-                        selected = True  # Select the current column
-                        break
-            
-            # Display current selection on the LED matrix (flashing column indicator)
-            self.visualize_choice(selected_column=col, toggle_on = toggle_on)
+        # event driven selection (LED blinks on its own timer)
+        col = select_column(self.joystick, self.show_choice, self.board_width)
 
         # return selected column (like normal move)
         return col
@@ -159,6 +123,7 @@ class Player_Raspi_Local(Player_Local):
         """
         # set sense screen to own color
         self.sense.clear(self.color)
+        self.renderer.invalidate()
         # also do CLI celebration
         super().celebrate_win()
 
@@ -1,8 +1,7 @@
-import time
-
-from sense_hat import SenseHat
-
 from player_remote import Player_Remote
+from hardware import SenseBackend
+from led_renderer import LEDRenderer
+from joystick_input import JoystickInput, get_joystick, select_column
 
 class Player_Raspi_Remote(Player_Remote):
     """
@@ -20,7 +19,7 @@ class Player_Raspi_Remote(Player_Remote):
 
         Parameters:
             api_url (str): Target API URL to connect to.
-            sense (SenseHat): SenseHat instance for LED matrix and joystick input.
+            sense (SenseBackend): SenseHat (or emulator) for LED matrix and joystick input.
 
         Raises:
             ValueError: If 'sense' is not provided in kwargs.
@@ -30,15 +29,19 @@ class Player_Raspi_Remote(Player_Remote):
         
         # Extract the SenseHat instance from kwargs
         try:
-            self.sense: SenseHat = kwargs["sense"]
+            self.sense: SenseBackend = kwargs["sense"]
         except KeyError:
-            raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseHat instance) attribute")
+            raise ValueError(f"{type(self).__name__} requires a 'sense' (SenseBackend instance) attribute")
 
         # Clear LED matrix on initialization
         self.sense.clear()
 
         self.color:tuple = None         # set in register_in_game
         self.enemy_color:tuple = None    # set in register_in_game
+        self.renderer:LEDRenderer = None # set in register_in_game
+
+        # joystick events are read by an input thread (shared per SenseHat)
+        self.joystick:JoystickInput = get_joystick(self.sense)
         
         self.icon = None  # Set later by register()
 
@@ -64,48 +67,26 @@ class Player_Raspi_Remote(Player_Remote):
             self.enemy_color = player_X_color
             print(f"You [{self.icon}] are blue")
 
+        self.renderer = LEDRenderer(self.sense, self.icon, self.color, self.enemy_color, self.board_width)
+
     def visualize_choice(self, selected_column: int = None, toggle_on:bool = False):
         """
         Visualization logic using Sense HAT's LED matrix for the Connect 4 board.
         Maps the 8x7 Connect 4 board to the 8x8 LED matrix.
         
-        If a selected_column is provided, it will highlight the column in the top row
-        with a yellow pixel to show the player's current selection.
+        Without a selected_column the board is refreshed (status API call,
+        board API call only if the turn changed).
+        With a selected_column only the cursor LED in the top row is toggled (no API call).
         """
-        board = self.get_board()        # from parent (make API call)
-
-        # Colors for the LED matrix
-        empty_color = [0, 0, 0]          # Black for empty space
-        #selection_color = [255,255,0]    # Yellow Color is blinkings
-        selection_color = self.color     # Own Color is blinking
-        
-        # identify own and enemy icon
-        enemy_icon = "X" if self.icon == "O" else "O"
-
-        # Create the LED matrix array based on the board state
-        led_matrix = []
-
-        # Add an first row of empty spaces to fill the LED matrix
-        led_matrix.extend([empty_color] * self.board_width)
-
-        # now add 8 by 7 board
-        for row in board:
-            for cell in row:
-                if cell == "":
-                    led_matrix.append(empty_color)
-                elif cell == enemy_icon:
-                    led_matrix.append(self.enemy_color)     
-                elif cell == self.icon:
-                    led_matrix.append(self.color)           
+        if selected_column is None or self.renderer.turn_number is None:
+            _, _, _, turn_number = self.get_game_status()      # from parent (make API call)
 
-        # if on (during blinking)
-        if toggle_on:
-            # Highlight the selected column in the top row with yellow
-            if 0 <= selected_column < self.board_width:
-                led_matrix[selected_column] = selection_color  # Top row is the first 8 pixels
+            if self.renderer.needs_update(turn_number):
+                self.renderer.draw_board(self.get_board(), turn_number)
 
-        # Display the current game board on the Sense HAT LED matrix
-        self.sense.set_pixels(led_matrix)
+        # if a column is selected -> blink it
+        if selected_column is not None:
+            self.renderer.draw_cursor(selected_column, toggle_on)
 
 
     def visualize(self):
@@ -118,33 +99,26 @@ class Player_Raspi_Remote(Player_Remote):
 
     
 
+    def show_choice(self, column:int, toggle_on:bool) -> None:
+        """
+        Show the currently selected column (callback for select_column)
+
+        Parameters:
+            column (int):       Currently selected column
+            toggle_on (bool):   Selection LED on if True
+        """
+        self.visualize_choice(selected_column=column, toggle_on=toggle_on)
+
     def make_move(self) -> bool:
         """
         Override make_move for Raspberry Pi input using the Sense HAT joystick.
         Uses joystick to move left or right and select a column.
         """
-        col = 0  # Start column at 0
-        selected = False
-        toggle_on = True
-        
-        while not selected:
-
-            toggle_on = not toggle_on       # toggle LED
-            time.sleep(0.1)
-
-            # Wait for joystick input
-            for event in self.sense.stick.get_events():
-                if event.action == 'pressed':
-                    if event.direction == 'left':
-                        col = (col - 1) % self.board_width  # Move left, wrap around if needed
-                    elif event.direction == 'right':
-                        col = (col + 1) % self.board_width  # Move right, wrap around if needed
-                    elif event.direction == 'middle':
-                        selected = True  # Select the current column
-                        break
-        
-            # Display current selection on the LED matrix (flashing column indicator)
-            self.visualize_choice(selected_column=col, toggle_on = toggle_on)
+        # make sure the board of this turn is shown (the blinking does no API calls)
+        self.visualize_choice()
+
+        # event driven selection (LED blinks on its own timer)
+        col = select_column(self.joystick, self.show_choice, self.board_width)
 
         # use superclass to send the move
         super().make_move(col)
@@ -158,5 +132,6 @@ class Player_Raspi_Remote(Player_Remote):
         """
         # set sense screen to own color
         self.sense.clear(self.color)
+        self.renderer.invalidate()
         # also do CLI celebration
         super().celebrate_win()
@@ -1,9 +1,14 @@
 
+import time
+from typing import TYPE_CHECKING
+
 import requests
-import numpy as np
 
 from player import Player
 
+if TYPE_CHECKING:
+    import numpy as np
+
 class Player_Remote(Player):
     """ 
     Remote Player (uses API calls to interact with the Connect 4 server).
@@ -11,6 +16,8 @@ class Player_Remote(Player):
     Attributes:
         api_url (str): The base URL of the Connect 4 API server.
     """
+    # max. retries of a rate limited request (429) before the 429 response is returned
+    MAX_RETRIES = 10
 
     def __init__(self, **kwargs) -> None:
         """
@@ -33,6 +40,24 @@ class Player_Remote(Player):
 
         self.icon = None
 
+    def __get(self, route: str) -> requests.Response:
+        """
+        GET request to the server
+            Waits and tries again if the server limits the request rate (429), at most MAX_RETRIES times
+
+        Parameters:
+            route (str):    Route of the API (e.g. /connect4/status)
+
+        Returns:
+            requests.Response:  Response of the server (still 429 if all retries were limited)
+        """
+        for _ in range(self.MAX_RETRIES):
+            response = requests.get(f'{self.api_url}{route}')
+            if response.status_code != 429:
+                return response
+            time.sleep(float(response.headers.get('Retry-After', 1)))
+        return requests.get(f'{self.api_url}{route}')
+
     def register_in_game(self):
         """
         Register the player in the game by making a POST request to the API.
@@ -57,7 +82,7 @@ class Player_Remote(Player):
             tuple: (active_icon, active_player, winner, turn_number)
         """
         try:
-            response = requests.get(f'{self.api_url}/connect4/status')
+            response = self.__get('/connect4/status')
             response_data: dict = response.json()
     
             # Ensure correct order for the returned tuple
@@ -87,7 +112,7 @@ class Player_Remote(Player):
         # If not given -> make call to get active ID
         if active_uuid is None:
             try:
-                response = requests.get(f'{self.api_url}/connect4/status')
+                response = self.__get('/connect4/status')
                 response_data = response.json()
                 active_uuid = response_data['active_id']
             
@@ -131,14 +156,16 @@ class Player_Remote(Player):
             return False
         
 
-    def get_board(self) -> np.ndarray:
+    def get_board(self) -> "np.ndarray":
         """
         Get the current board state from the server.
         
         Returns:
             np.ndarray: The current board state as a NumPy array, or None if retrieval fails.
         """
-        response = requests.get(f'{self.api_url}/connect4/board')
+        import numpy as np         # only needed for the board (not for the module import)
+
+        response = self.__get('/connect4/board')
         if response.status_code == 200:
             response_data = response.json()
             board: list[str] = response_data["board"]
@@ -151,7 +178,7 @@ class Player_Remote(Player):
         """
         Visualize the current board.
         """
-        board: np.ndarray = self.get_board()
+        board = self.get_board()
 
         # Visualize the board
         for row in range(board.shape[0]):
@@ -0,0 +1,167 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+from player import Player
+
+
+class Player_Remote_Minimal(Player):
+    """
+    Remote Player with minimal dependencies (standard library only)
+        Same API calls as Player_Remote, but uses urllib instead of requests
+        and a list of rows instead of a NumPy array for the board
+        -> fast startup, e.g. for short-lived bot workers or plain CLI play.
+
+    Attributes:
+        api_url (str):      The base URL of the Connect 4 API server.
+        timeout (float):    Seconds to wait for a response of the server
+    """
+    # max. retries of a rate limited request (429), like Player_Remote
+    MAX_RETRIES = 10
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Initialize the player with the provided API URL.
+
+        Parameters:
+            api_url (str): The base URL of the Connect 4 API server (e.g., http://localhost:5000).
+
+        Raises:
+            ValueError: If 'api_url' is not provided in kwargs.
+        """
+        super().__init__()
+
+        try:
+            self.api_url: str = kwargs["api_url"]
+        except KeyError:
+            raise ValueError(f"{type(self).__name__} requires an 'api_url' attribute")
+
+        self.timeout: float = kwargs.get("timeout", 10.0)
+        self.icon = None
+
+    def __request(self, route: str, payload: dict = None) -> tuple[int, dict]:
+        """
+        GET (or POST with a JSON payload) request to the server
+            Waits and tries again if the server limits the request rate (429), at most MAX_RETRIES times
+
+        Returns:
+            tuple:  (status code, JSON response), still 429 if all retries were limited
+        """
+        data = None if payload is None else json.dumps(payload).encode()
+        headers = {'Content-Type': 'application/json'} if payload is not None else {}
+
+        for retry in range(self.MAX_RETRIES + 1):
+            request = urllib.request.Request(f'{self.api_url}{route}', data=data, headers=headers)
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    return response.status, json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and retry < self.MAX_RETRIES:
+                    time.sleep(float(e.headers.get('Retry-After', 1)))
+                    continue
+                return e.code, json.loads(e.read() or b'{}')
+
+    def register_in_game(self):
+        """
+        Register the player in the game
+        """
+        try:
+            status, response_data = self.__request('/connect4/register', {'player_id': str(self.id)})
+
+            if status == 200:
+                self.icon = response_data['player_icon']
+                print(f"You are Player [{self.icon}]")
+            else:
+                print(f"Error registering player: {response_data.get('error', 'Unknown error')}")
+        except Exception as e:
+            print(f"Failed to connect to server: {e}")
+
+    def get_game_status(self) -> tuple:
+        """
+        Get the game's status.
+
+        Returns:
+            tuple: (active_icon, active_player, winner, turn_number)
+        """
+        try:
+            _, response_data = self.__request('/connect4/status')
+            return (response_data.get('active_icon'), response_data.get('active_id'),
+                    response_data.get('winner'), response_data.get('turn_number'))
+        except Exception as e:
+            print(f"Failed to check turn: {e}")
+            return (None, None, None, None)
+
+    def is_my_turn(self, active_uuid: str = None) -> bool:
+        """
+        Check if it's the player's turn
+
+        Parameters:
+            active_uuid (str)     Optional: UUID of active player, if given no API call is made
+
+        Returns:
+            bool: If player is the active player
+        """
+        if active_uuid is None:
+            _, active_uuid, _, _ = self.get_game_status()
+        return str(self.id) == active_uuid
+
+    def make_move(self, col: int = None) -> bool:
+        """
+        Ask the player to select a column and send a move request to the API.
+
+        Parameters:
+            col (int): Optional: Which column to be selected (used by child classes)
+
+        Returns:
+            bool: Success of move
+        """
+        try:
+            if col is None:
+                col = int(input(f"Player [{self.icon}], select a column: "))
+
+            status, response_data = self.__request('/connect4/check_move', {'column': col, 'player_id': str(self.id)})
+
+            if status == 200 and response_data.get('success', False):
+                print(f"Move successful! Player [{self.icon}] placed in column {col}")
+                return True
+            else:
+                print(f"Error: {response_data.get('error', 'Move failed')}")
+                return False
+        except ValueError:
+            print("Invalid input. Please enter a valid column number.")
+            return False
+        except Exception as e:
+            print(f"Failed to make a move: {e}")
+            return False
+
+    def get_board(self) -> list[list[str]]:
+        """
+        Get the current board state from the server.
+
+        Returns:
+            list: 7 rows of 8 cells ('X', 'O' or ' '), or None if retrieval fails.
+        """
+        status, response_data = self.__request('/connect4/board')
+        if status == 200:
+            return response_data["board"]
+
+        print(f"Error: Failed to retrieve board. Status Code: {status}")
+        return None
+
+    def visualize(self):
+        """
+        Visualize the current board.
+        """
+        board = self.get_board()
+
+        for row, cells in enumerate(board):
+            if row > 0:
+                print(" _ " * (len(cells) + 3))
+            print(f"| {' | '.join(cells)} |")
+
+    def celebrate_win(self) -> None:
+        """
+        Celebrate CLI Win of Remote player
+        """
+        print(f"I player [{self.icon}] won!")
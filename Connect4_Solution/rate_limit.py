@@ -0,0 +1,96 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiting per client
+        Every client gets a bucket with 'burst' tokens which refills with 'rate' tokens per second.
+        Each request takes one token, without a token the request is rejected.
+
+    Attributes:
+        rate (float):       Tokens added per second (= allowed requests per second)
+        burst (int):        Size of a bucket (= allowed requests at once)
+        max_clients (int):  Number of buckets kept (least recently used are dropped)
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, max_clients: int = 10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+
+        self.__buckets: OrderedDict = OrderedDict()     # client -> (tokens, last update)
+        self.__lock = threading.Lock()
+
+    def allow(self, client: Hashable) -> tuple[bool, float]:
+        """
+        Take a token from the bucket of a client
+
+        Parameters:
+            client (Hashable):  Client key (e.g. IP address)
+
+        Returns:
+            tuple:  (allowed, seconds until the next token is available)
+        """
+        now = time.monotonic()
+
+        with self.__lock:
+            tokens, last = self.__buckets.pop(client, (self.burst, now))
+
+            # refill since the last request
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            # (re-)insert as most recently used, drop the oldest clients
+            self.__buckets[client] = (tokens, now)
+            while len(self.__buckets) > self.max_clients:
+                self.__buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
+
+
+class ResponseCoalescer:
+    """
+    Shares one precomputed response body between identical reads
+        The body of a route is built once per state version. Concurrent requests
+        for the same route wait for this body instead of building it again.
+    """
+
+    def __init__(self) -> None:
+        self.__entries: dict = {}           # route -> (version, body)
+        self.__locks: dict = {}             # route -> Lock
+        self.__locks_lock = threading.Lock()
+
+    def get(self, route: str, version: Hashable, build: Callable[[], bytes]) -> bytes:
+        """
+        Return the body of a route for a state version (built only once)
+
+        Parameters:
+            route (str):            Name of the route
+            version (Hashable):     Version of the state the body depends on
+            build (callable):       Builds the body if it is not cached yet
+
+        Returns:
+            bytes:  Response body
+        """
+        entry = self.__entries.get(route)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        with self.__locks_lock:
+            lock = self.__locks.setdefault(route, threading.Lock())
+
+        with lock:
+            # maybe built by another request in the meantime
+            entry = self.__entries.get(route)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+
+            body = build()
+            self.__entries[route] = (version, body)
+            return body
@@ -1,13 +1,25 @@
+import os
+import json
+import math
 import uuid
+import tempfile
+import threading
+from collections import OrderedDict
 
 import socket                                               # to get own IP
-from flask import Flask, request, jsonify                   # for api
-from flask_swagger_ui import get_swaggerui_blueprint        # for swagger documentation
+from flask import Flask, Response, request, jsonify         # for api
 
 
 
 # local includes
 from game import Connect4
+from broadcast import BoardBroadcaster
+from rate_limit import RateLimiter, ResponseCoalescer
+from hint_service import HintService
+from game_export import ColumnarWriter, GameArchive, game_record
+from compression import MIN_SIZE, StaticAssets, choose_encoding, compress, compress_response
+from Bot import bitboard as bb
+from Bot.solver import Solver, SolverCache
 
 
 class Connect4Server:
@@ -16,23 +28,95 @@ class Connect4Server:
         Runs on Localhost
     
     Attributes
-        game (Connect4):    Local Instance of Connect4 Game (with all game rules)
-        app (Flask):        Web Server Instance
+        game (Connect4):                Local Instance of Connect4 Game (with all game rules)
+        app (Flask):                    Web Server Instance
+        broadcaster (BoardBroadcaster): Fan-out of board states to spectators
+        rate_limiter (RateLimiter):     Token buckets per client for the polling routes (None if disabled)
+        coalescer (ResponseCoalescer):  Shared response bodies of the polling routes
+        state_version (int):            Increased on every change of the game state
+        solver (Solver):                Perfect-play solver for /connect4/analyze (solved positions are cached on disk if enabled)
+        analyses (OrderedDict):         Complete /connect4/analyze results by canonical position key (Connect4.get_position_key)
+        hints (HintService):            Background analysis of the current position for /connect4/hint (None if disabled)
+        archive (GameArchive):          Finished games (NDJSON file) for /connect4/export (None if disabled)
+        static_assets (StaticAssets):   Files of static/, hashed and precompressed at startup
+        compress_min_size (int):        Responses from this size on are compressed (None -> no compression)
 
     """
-    def __init__(self):
+    # routes which are polled by the clients (rate limited and coalesced)
+    POLLING_ROUTES = ('/connect4/status', '/connect4/board')
+
+    # max. seconds one /connect4/analyze request may search
+    MAX_ANALYZE_TIME = 10.0
+    # complete analyses kept in memory (by position key, shared by all games)
+    ANALYSIS_CACHE_SIZE = 10000
+
+    def __init__(self, rate_limit:float = 5.0, burst:int = 10, solver_cache:str = None,
+                 hint_workers:int = 0, hint_latency:float = 0.05, archive_path:str = None,
+                 compress_min_size:int = MIN_SIZE):
         """
         Create a Connect4 Server on localhost (127.0.0.1)
         - Add SWAGGER UI Documentation
         - Expose API Methods
+
+        Parameters:
+            rate_limit (float):     Allowed polling requests per second and client (None -> no limit)
+            burst (int):            Allowed polling requests at once per client
+            solver_cache (str):     SQLite file of solved positions, e.g. Bot.solver.DEFAULT_CACHE (None -> not cached)
+            hint_workers (int):     Threads analyzing positions in the background, e.g. 2 (0 -> no hints)
+                                    (the search shares the GIL with the request handling -> slower responses)
+            hint_latency (float):   Max. seconds /connect4/hint waits for a first result
+            archive_path (str):     NDJSON file finished games are appended to, e.g. games.ndjson (None -> not archived)
+            compress_min_size (int):    Compress (gzip / brotli) responses from this size on (None -> off)
         """
 
         self.game = Connect4()  # Connect4 game instance
-        self.app = Flask(__name__)  # Flask app instance
+        self.app = Flask(__name__, static_folder=None)  # Flask app instance (static files: see below)
+
+        # static files are read, hashed and compressed once
+        self.static_assets = StaticAssets(os.path.join(os.path.dirname(__file__), 'static'))
+        self.compress_min_size = compress_min_size
+
+        # polling clients: limit per client, share responses of the same state
+        self.rate_limiter = RateLimiter(rate_limit, burst) if rate_limit else None
+        self.coalescer = ResponseCoalescer()
+        self.state_version = 0
+
+        # finished games are appended to the archive (exported by /connect4/export)
+        self.archive = GameArchive(archive_path) if archive_path else None
+        self.archived_game_id = None
+
+        # every new position is analyzed in the background (answers /connect4/hint at once)
+        self.hints = HintService(workers=hint_workers, latency=hint_latency) if hint_workers else None
+
+        # spectators get the (once serialized) board pushed on every change
+        self.broadcaster = BoardBroadcaster()
+        self.state_changed()
+
+        # one search at a time (the solver keeps its transposition table between requests)
+        self.solver = Solver(SolverCache(solver_cache) if solver_cache else None)
+        self.solver_lock = threading.Lock()
+        # (canonical position key, weak) -> scores of a complete analysis (mirrored positions share one entry)
+        self.analyses: OrderedDict = OrderedDict()
+
+        # Swagger UI Configuration (optional: only if flask-swagger-ui is installed)
+        self.setup_swagger()
+
+        # Define API routes within the constructor
+        self.setup_routes()
+
+    def setup_swagger(self):
+        """
+        Add the SWAGGER UI Documentation (imported here: not needed to serve the API)
+        """
+        try:
+            import flask_swagger_ui
+            from flask_swagger_ui import get_swaggerui_blueprint        # for swagger documentation
+        except ImportError:
+            print("flask-swagger-ui is not installed -> no Swagger UI")
+            return
 
-        # Swagger UI Configuration
         SWAGGER_URL = '/swagger/connect4/'
-        API_URL = '/static/swagger.json'  # This should point to your static swagger.json file
+        API_URL = self.static_assets.url('/static/', 'swagger.json')   # hashed name -> cached by the browsers
         
         swaggerui_blueprint = get_swaggerui_blueprint(
             SWAGGER_URL,
@@ -46,14 +130,49 @@ class Connect4Server:
         # Register the Swagger UI blueprint
         self.app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
 
+        # files of the Swagger UI (JavaScript, CSS): precompressed, cached for a day
+        swagger_assets = StaticAssets(os.path.join(os.path.dirname(flask_swagger_ui.__file__), 'dist'), max_age=86400)
 
-        # Define API routes within the constructor
-        self.setup_routes()
+        @self.app.before_request
+        def serve_swagger_assets():
+            if request.path.startswith(SWAGGER_URL):
+                return swagger_assets.response(request.path[len(SWAGGER_URL):], request)
+            return None
 
     def setup_routes(self):
         """
         Expose the following Methods
         """
+        # Rate limiting of the polling routes
+        @self.app.before_request
+        def limit_polling():
+            if self.rate_limiter is None or request.path not in self.POLLING_ROUTES:
+                return None
+
+            allowed, retry_after = self.rate_limiter.allow(request.remote_addr)
+            if allowed:
+                return None
+
+            response = jsonify({"error": "Too many requests"})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(math.ceil(retry_after))
+            return response
+
+        # Compression of the finished responses (not for streams)
+        @self.app.after_request
+        def compress(response):
+            if self.compress_min_size is None:
+                return response
+            return compress_response(response, request, self.compress_min_size)
+
+        # Static files (swagger.json)
+        @self.app.route('/static/<path:filename>', methods=['GET'])
+        def static_file(filename):
+            response = self.static_assets.response(filename, request)
+            if response is None:
+                return jsonify({"error": "Not found"}), 404
+            return response
+
         # Overall Description
         @self.app.route('/')
         def index():
@@ -62,13 +181,17 @@ class Connect4Server:
         # 1. Expose get_status method
         @self.app.route('/connect4/status', methods=['GET'])
         def get_status():
-            active_icon, active_id, winner, turn_number = self.game.get_status()
-            return jsonify({
-                'active_icon': active_icon,
-                'active_id': str(active_id) if active_id else None,
-                'winner': winner,
-                'turn_number':turn_number
-            })
+            def build() -> bytes:
+                active_icon, active_id, winner, turn_number = self.game.get_status()
+                return json.dumps({
+                    'active_icon': active_icon,
+                    'active_id': str(active_id) if active_id else None,
+                    'winner': winner,
+                    'turn_number':turn_number
+                }).encode()
+
+            # same state -> same (already built) body
+            return self.coalesced_response('status', build)
 
         # 2. Expose register_player method
         @self.app.route('/connect4/register', methods=['POST'])
@@ -83,6 +206,7 @@ class Connect4Server:
             if icon is None:
                 return jsonify({"error": "Game is full or player already registered"}), 400
 
+            self.state_changed()        # active player may have changed
             return jsonify({'player_icon': icon})
 
 
@@ -95,9 +219,13 @@ class Connect4Server:
             Returns:
                 dict    'board': list of len 56
             """
-            board = self.game.get_board()
-            board_list = board.tolist()  # Convert numpy array to a list for JSON serialization
-            return jsonify({'board': board_list})
+            def build() -> bytes:
+                board = self.game.get_board()
+                board_list = board.tolist()  # Convert numpy array to a list for JSON serialization
+                return json.dumps({'board': board_list}).encode()
+
+            # same state -> same (already built) body
+            return self.coalesced_response('board', build)
 
         # 4. Expose move method
         @self.app.route('/connect4/check_move', methods=['POST'])
@@ -112,8 +240,236 @@ class Connect4Server:
             if not result:
                 return jsonify({"error": "Illegal move"}), 400
 
+            self.state_changed()        # new turn
             return jsonify({'success': True})
 
+        # 5. Spectator channel (Server-Sent Events)
+        @self.app.route('/connect4/subscribe', methods=['GET'])
+        def subscribe():
+            """
+            Stream every new board state to a spectator
+
+            Returns:
+                text/event-stream   'board' events (same payload for all spectators)
+            """
+            if not self.broadcaster.try_subscribe():
+                return jsonify({"error": "Too many spectators"}), 503
+
+            response = Response(self.broadcaster.stream(), mimetype='text/event-stream')
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'        # no buffering behind nginx
+            response.call_on_close(self.broadcaster.unsubscribe)
+            return response
+
+        # 6. Game theoretic analysis of the current board
+        @self.app.route('/connect4/analyze', methods=['GET'])
+        def analyze():
+            """
+            Solve every column for the active player within a time / node budget
+
+            Query Parameters:
+                weak (bool):            Only win (1) / draw (0) / loss (-1)
+                time_limit (float):     Seconds to search (default 1, max. MAX_ANALYZE_TIME)
+                node_limit (int):       Optional max. number of nodes
+
+            Returns:
+                dict    'scores': score per column (null: full or not solved in time), 'best_column', ...
+            """
+            try:
+                weak = request.args.get('weak', 'false').lower() in ('1', 'true', 'yes')
+                time_limit = float(request.args.get('time_limit', 1.0))
+                node_limit = request.args.get('node_limit')
+                node_limit = int(node_limit) if node_limit is not None else None
+            except ValueError:
+                return jsonify({"error": "Invalid input"}), 400
+            # nan / inf would never reach the solver's deadline (the search holds the solver lock)
+            if not math.isfinite(time_limit) or time_limit <= 0:
+                return jsonify({"error": "time_limit must be a positive number"}), 400
+            if node_limit is not None and node_limit < 1:
+                return jsonify({"error": "node_limit must be at least 1"}), 400
+            time_limit = min(time_limit, self.MAX_ANALYZE_TIME)
+
+            # board and keys of the same position (a move in between would cache scores under the wrong key)
+            active_icon, winner, turn_number, board, position_key, key = self.game.get_position()
+            if active_icon is None:
+                return jsonify({"error": "Game has not started"}), 400
+            if winner or turn_number >= bb.CELLS:
+                return jsonify({"error": "Game is over"}), 400
+
+            current, mask, _ = bb.from_board(board, active_icon)
+            mirrored = key != position_key      # cached scores are stored for the canonical side
+
+            with self.solver_lock:
+                scores = self.analyses.get((key, weak))
+                if scores is not None:
+                    self.analyses.move_to_end((key, weak))
+                    scores = scores[::-1] if mirrored else list(scores)
+                    nodes, cached = 0, True
+                else:
+                    scores = self.solver.analyze(current, mask, weak, node_limit, time_limit)
+                    nodes, cached = self.solver.nodes, False
+
+            solved = [col for col in range(bb.WIDTH) if scores[col] is not None]
+            complete = len(solved) == len(bb.legal_moves(mask))
+            if complete and not cached:
+                # only complete results: partial ones depend on the time / node budget
+                with self.solver_lock:
+                    self.analyses[(key, weak)] = scores[::-1] if mirrored else scores
+                    if len(self.analyses) > self.ANALYSIS_CACHE_SIZE:
+                        self.analyses.popitem(last=False)
+
+            return jsonify({
+                'active_icon': active_icon,
+                'turn_number': turn_number,
+                'weak': weak,
+                'scores': scores,
+                'best_column': max(solved, key=lambda col: scores[col]) if solved else None,
+                'complete': complete,
+                'cached': cached,
+                'nodes': nodes
+            })
+
+        # 7. Best column for the active player (from the background analysis)
+        @self.app.route('/connect4/hint', methods=['GET'])
+        def hint():
+            """
+            Return the deepest result of the background analysis (never waits for the search)
+
+            Query Parameters:
+                max_wait (float):   Seconds to wait if no result is ready yet (capped by hint_latency)
+
+            Returns:
+                dict    'column' (null if no result yet), 'depth', 'score', 'final' (search finished)
+            """
+            if self.hints is None:
+                return jsonify({"error": "Hints are disabled"}), 503
+
+            try:
+                max_wait = request.args.get('max_wait')
+                max_wait = float(max_wait) if max_wait is not None else None
+            except ValueError:
+                return jsonify({"error": "Invalid input"}), 400
+            # nan would pass the latency cap and wait for the search
+            if max_wait is not None and not (math.isfinite(max_wait) and max_wait >= 0):
+                return jsonify({"error": "max_wait must be a number >= 0"}), 400
+
+            active_icon, _, winner, turn_number = self.game.get_status()
+            if active_icon is None:
+                return jsonify({"error": "Game has not started"}), 400
+            if winner or turn_number >= bb.CELLS:
+                return jsonify({"error": "Game is over"}), 400
+
+            result, final = self.hints.hint(self.game.game_id, self.state_version, max_wait)
+            return jsonify({
+                'active_icon': active_icon,
+                'turn_number': turn_number,
+                'column': result.move if result else None,
+                'depth': result.depth if result else 0,
+                'score': result.score if result else None,
+                'final': final
+            })
+
+        # 8. Export of all games (archive and running game)
+        @self.app.route('/connect4/export', methods=['GET'])
+        def export():
+            """
+            Stream all games (id, players, moves, winner, turn count, timestamps)
+
+            Query Parameters:
+                format (str):   'ndjson' (default, one game per line) or 'columnar' (zip of NumPy row groups)
+
+            Returns:
+                application/x-ndjson or application/zip
+            """
+            export_format = request.args.get('format', 'ndjson')
+            if export_format not in ('ndjson', 'columnar'):
+                return jsonify({"error": "Invalid format"}), 400
+
+            # snapshot of the running game now, archived games are read while streaming
+            # (only once both players are registered: a game without players can't be replayed)
+            current = None
+            if self.game.game_id != self.archived_game_id and len(self.game.players) == 2:
+                current = game_record(self.game)
+
+            def records():
+                if self.archive is not None:
+                    yield from self.archive
+                if current is not None:
+                    yield current
+
+            if export_format == 'ndjson':
+                lines = (json.dumps(record, separators=(",", ":")) + "\n" for record in records())
+                return Response(lines, mimetype='application/x-ndjson')
+
+            # zip needs a seekable file -> row groups go to a temporary file (not into memory)
+            file = tempfile.TemporaryFile()
+            with ColumnarWriter(file) as writer:
+                for record in records():
+                    writer.add(record)
+            file.seek(0)
+
+            def chunks():
+                with file:
+                    while chunk := file.read(64 * 1024):
+                        yield chunk
+
+            response = Response(chunks(), mimetype='application/zip')
+            response.headers['Content-Disposition'] = 'attachment; filename=games.zip'
+            return response
+
+    def coalesced_response(self, route:str, build) -> Response:
+        """
+        JSON response with the shared body of a route for the current state
+            The compressed body is also built only once per state and encoding.
+        """
+        version = (self.game.game_id, self.state_version)
+        body = self.coalescer.get(route, version, build)
+
+        response = Response(body, mimetype='application/json')
+        if self.compress_min_size is None or len(body) < self.compress_min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding:
+            response.set_data(self.coalescer.get(f'{route}.{encoding}', version, lambda: compress(body, encoding)))
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    def state_changed(self) -> None:
+        """
+        Called after every change of the game state
+            - invalidates the shared responses of the polling routes
+            - serializes the current game state ONCE and pushes it to all spectators
+            - appends a finished game to the archive
+            - starts the background analysis of the new position (cancelled when the game is over)
+        """
+        self.state_version += 1
+
+        active_icon, _, winner, turn_number = self.game.get_status()
+        self.broadcaster.publish(self.game.get_board().tolist(), active_icon, winner, turn_number)
+
+        if self.archive is not None and self.game.finished_at and self.archived_game_id != self.game.game_id:
+            self.archive.append(game_record(self.game))
+            self.archived_game_id = self.game.game_id
+
+        if self.hints is None:
+            return
+        if active_icon is None or winner or turn_number >= bb.CELLS:
+            self.hints.cancel(self.game.game_id)
+        else:
+            current, mask, _ = bb.from_board(self.game.get_board(), active_icon)
+            self.hints.analyze(self.game.game_id, self.state_version, current, mask)
+
+    def close(self) -> None:
+        """
+        Stop the background analysis (frees its transposition table) and close the solver cache
+        """
+        if self.hints is not None:
+            self.hints.close()
+        if self.solver.cache is not None:
+            self.solver.cache.close()
+
     def run(self, debug=True, host='0.0.0.0', port=5000):
         # Get and display the local IP address
         hostname = socket.gethostname()
@@ -123,9 +479,25 @@ class Connect4Server:
         # Start the Flask app
         self.app.run(debug=debug, host=host, port=port)
 
+    def run_in_background(self, host='127.0.0.1', port=5000):
+        """
+        Start the server in a daemon thread (e.g. for simulations and load tests)
+
+        Returns:
+            BaseWSGIServer:     Running server (stop with .shutdown())
+        """
+        from werkzeug.serving import make_server
+
+        server = make_server(host, port, self.app, threaded=True)
+        threading.Thread(target=server.serve_forever, name=f"connect4-server-{port}", daemon=True).start()
+        return server
+
 
 
 # If you want to run the server directly:
 if __name__ == '__main__':
     server = Connect4Server()  # Initialize the Connect4Server
-    server.run()               # Start the Flask app
\ No newline at end of file
+    try:
+        server.run()           # Start the Flask app
+    finally:
+        server.close()
\ No newline at end of file
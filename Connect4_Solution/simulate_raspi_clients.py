@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import logging
+import os
+import random
+import statistics
+import threading
+import time
+
+from coordinator_remote import Coordinator_Remote
+from fake_sense_hat import FakeSenseHat
+from server import Connect4Server
+
+
+def random_script(rng: random.Random, moves: int) -> list[str]:
+    """
+    Joystick script for a number of moves (move right a random number of times, then select)
+
+    Parameters:
+        rng (random.Random):    Random generator (seeded -> reproducible games)
+        moves (int):            Number of moves to script (incl. retries after illegal moves)
+
+    Returns:
+        list[str]:  Directions to press
+    """
+    script = []
+    for _ in range(moves):
+        script.extend(['right'] * rng.randrange(8))
+        script.append('middle')
+    return script
+
+
+class SimulatedClient:
+    """
+    One simulated Raspi client: Coordinator_Remote with an emulated SenseHat
+
+    Attributes:
+        sense (FakeSenseHat):           Emulator replaying a random joystick script
+        coordinator (Coordinator_Remote)
+        move_latencies (list[float]):   Seconds from "my turn" until the move was sent to the server
+        move_times (list[float]):       Shared list of the game: time of every move (both clients)
+        finished (bool):                Game ended with a winner
+        error (Exception):              Exception which stopped the client (if any)
+    """
+
+    def __init__(self, api_url: str, seed: int, move_times: list, moves: int = 60) -> None:
+        self.sense = FakeSenseHat(script=random_script(random.Random(seed), moves))
+        self.coordinator = Coordinator_Remote(api_url=api_url, on_raspi=True, sense=self.sense)
+
+        self.move_latencies: list[float] = []
+        self.move_times = move_times
+        self.finished = False
+        self.error: Exception = None
+
+        # measure every move of the player
+        make_move = self.coordinator.player.make_move
+
+        def timed_make_move() -> bool:
+            start = time.perf_counter()
+            result = make_move()
+            end = time.perf_counter()
+            self.move_latencies.append(end - start)
+            self.move_times.append(end)
+            return result
+
+        self.coordinator.player.make_move = timed_make_move
+
+    def run(self) -> None:
+        try:
+            self.coordinator.play()
+            self.finished = True
+        except Exception as e:
+            self.error = e
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate Raspi clients (SenseHat emulator) against Connect4Server")
+    parser.add_argument("--games", type=int, default=50, help="Number of games (2 clients and 1 server each)")
+    parser.add_argument("--base-port", type=int, default=6000, help="Port of the first server")
+    parser.add_argument("--duration", type=float, default=120.0, help="Max. seconds to run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the joystick scripts")
+    args = parser.parse_args()
+
+    clients: list[SimulatedClient] = []
+    game_move_times: list[list[float]] = []
+    servers = []
+
+    # players and servers print a lot -> silence them during the simulation
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for game in range(args.games):
+            port = args.base_port + game
+            # all simulated clients share one IP -> no rate limiting, no background analysis (CPU), no archive
+            server = Connect4Server(rate_limit=None, hint_workers=0, archive_path=None, solver_cache=None)
+            servers.append(server.run_in_background(port=port))
+
+            move_times = []
+            game_move_times.append(move_times)
+            for player in range(2):
+                clients.append(SimulatedClient(f"http://127.0.0.1:{port}", args.seed * 100000 + game * 2 + player, move_times))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=client.run, daemon=True) for client in clients]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(timeout=max(0.0, args.duration - (time.perf_counter() - start)))
+        elapsed = time.perf_counter() - start
+
+    for server in servers:
+        server.shutdown()
+
+    # Report
+    move_latencies = [latency for client in clients for latency in client.move_latencies]
+    turn_times = [b - a for times in game_move_times for a, b in zip(sorted(times), sorted(times)[1:])]
+    finished_games = sum(any(client.finished for client in clients[i:i + 2]) for i in range(0, len(clients), 2))
+    errors = [client.error for client in clients if client.error]
+
+    print(f"{len(clients)} simulated clients, {args.games} games, {elapsed:.1f} s")
+    print(f"finished games: {finished_games}/{args.games}, client errors: {len(errors)}")
+    if move_latencies:
+        print(f"moves: {len(move_latencies)} ({len(move_latencies) / elapsed:.1f} / s)")
+        print(f"move latency (joystick -> server) p50: {percentile(move_latencies, 50) * 1000:.1f} ms, "
+              f"p95: {percentile(move_latencies, 95) * 1000:.1f} ms, max: {max(move_latencies) * 1000:.1f} ms")
+    if turn_times:
+        print(f"turn latency (move -> next move) mean: {statistics.mean(turn_times):.2f} s, "
+              f"p95: {percentile(turn_times, 95):.2f} s")
+    for error in errors[:5]:
+        print(f"error: {error!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Bulk import / export of inventory, vendors and orderLookup as CSV
+
+    python bulk_csv.py import inventory_SW14.db inventory items.csv --rejects rejected.csv
+    python bulk_csv.py export inventory_SW14.db orderLookup orders.csv
+
+Import:
+    - the file is read as a stream and inserted with executemany in chunks, all in ONE transaction
+    - indexes and triggers of the table are dropped during the load and rebuilt once at the end
+      (also the derived tables: FTS name index, item_summary)
+    - rows violating the CHECK constraints (units >= 0, price > 0, category) or other constraints
+      are rejected and reported with their line number, all other rows are loaded
+Export:
+    - streamed in keyset pages (constant memory), header = column names (can be imported again)
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from itertools import islice
+from typing import IO, Callable, Iterable, Iterator
+
+from inventory_db import InventoryDB
+from migrations import ITEM_SUMMARY_FILL, has_table
+
+
+CHUNK_SIZE = 50000          # rows per executemany
+CATEGORIES = ("PC", "Resistor", "Other")     # CHECK of inventory.category (migration 1)
+
+# table -> (columns in CSV order, columns which must not be empty)
+TABLES = {
+    "inventory": (("itemID", "name", "category", "units"), ("name", "category", "units")),
+    "vendors": (("vendorID", "name", "url"), ("name",)),
+    "orderLookup": (("itemID", "vendorID", "orderNr", "price"), ("itemID", "vendorID", "orderNr", "price")),
+}
+
+# rebuild of the derived tables after a load (same content the triggers would have written row by row)
+REBUILD_FTS = "INSERT INTO inventory_fts(inventory_fts) VALUES ('rebuild')"
+REBUILD_SUMMARY = ["DELETE FROM item_summary", ITEM_SUMMARY_FILL]
+
+# result of an import: rows inserted, rows rejected, first rejects as (line, reason)
+LoadReport = namedtuple("LoadReport", ("inserted", "rejected", "rejects"))
+Row = namedtuple("Row", ("line", "values"))
+
+
+def parse_int(text: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"keine ganze Zahl: {text!r}")
+
+
+def parse_price(text: str) -> float:
+    try:
+        price = float(text)
+    except ValueError:
+        raise ValueError(f"keine Zahl: {text!r}")
+    if not price > 0:
+        raise ValueError(f"muss > 0 sein: {price}")
+    return price
+
+
+def parse_units(text: str) -> int:
+    units = parse_int(text)
+    if units < 0:
+        raise ValueError(f"muss >= 0 sein: {units}")
+    return units
+
+
+def parse_category(text: str) -> str:
+    if text not in CATEGORIES:
+        raise ValueError(f"muss {', '.join(CATEGORIES)} sein: {text!r}")
+    return text
+
+
+# column -> conversion and check (like the constraints of the schema), str: kept as text
+PARSERS = {"itemID": parse_int, "vendorID": parse_int, "units": parse_units, "price": parse_price,
+           "category": parse_category}
+
+
+def row_parser(table: str, header: list[str]) -> Callable[[list[str]], tuple]:
+    """
+    Converts the fields of a CSV row (in the order of the header) to the values of an INSERT
+
+    Returns:
+        Callable:   fields -> tuple in the column order of TABLES, raises ValueError with the reason
+
+    Raises:
+        ValueError:     The header has unknown or missing columns
+    """
+    columns, required = TABLES[table]
+    unknown = set(header) - set(columns)
+    missing = set(required) - set(header)
+    if unknown or missing:
+        raise ValueError(f"Spalten von {table}: {', '.join(columns)} (unbekannt: {sorted(unknown)}, fehlend: {sorted(missing)})")
+
+    # (position in the CSV row or None, column, conversion, required), prepared once per file
+    plan = [(header.index(column) if column in header else None, column, PARSERS.get(column, str), column in required)
+            for column in columns]
+
+    def parse(fields: list[str]) -> tuple:
+        values = []
+        for position, column, convert, needed in plan:
+            text = fields[position].strip() if position is not None and position < len(fields) else ""
+            if not text:
+                if needed:
+                    raise ValueError(f"{column} fehlt")
+                values.append(None)
+                continue
+            try:
+                values.append(convert(text))
+            except ValueError as e:
+                raise ValueError(f"{column} {e}")
+        return tuple(values)
+
+    return parse
+
+
+def read_rows(table: str, file: IO[str], reject: Callable[[int, str, dict], None]) -> Iterator[Row]:
+    """
+    Valid rows of a CSV file (invalid rows are passed to reject(line, reason, raw record))
+
+    Raises:
+        ValueError:     The header has unknown or missing columns
+    """
+    reader = csv.reader(file)
+    header = next(reader, [])
+    parse = row_parser(table, header)
+
+    for fields in reader:
+        if not fields:
+            continue
+        try:
+            yield Row(reader.line_num, parse(fields))
+        except ValueError as e:
+            reject(reader.line_num, str(e), dict(zip(header, fields)))
+
+
+def table_objects(db: sqlite3.Connection, table: str) -> list[tuple[str, str, str]]:
+    """
+    Indexes and triggers of a table (type, name, SQL), without the automatic ones
+    """
+    return db.execute("SELECT type, name, sql FROM sqlite_master "
+                      "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL", (table,)).fetchall()
+
+
+def bulk_load(db: sqlite3.Connection, table: str, rows: Iterable[Row], reject: Callable[[int, str, dict], None],
+              chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Insert rows in one transaction (indexes and triggers of the table are dropped and rebuilt)
+        A chunk which violates a constraint (e.g. a duplicate itemID) is inserted again row by row,
+        only the failing rows are rejected.
+
+    Parameters:
+        db (Connection):    Inventory database (no open transaction)
+        table (str):        Target table (see TABLES)
+        rows (Iterable):    Validated rows (see read_rows)
+        reject (Callable):  Called with (line, reason, raw record) for every rejected row
+
+    Returns:
+        int:    Number of inserted rows
+    """
+    columns, _ = TABLES[table]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    objects = table_objects(db, table)
+    inserted = 0
+    rows = iter(rows)
+
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        for kind, name, _ in objects:
+            db.execute(f"DROP {kind.upper()} {name}")
+
+        while chunk := list(islice(rows, chunk_size)):
+            db.execute("SAVEPOINT chunk")
+            try:
+                db.executemany(sql, (row.values for row in chunk))
+                inserted += len(chunk)
+            except sqlite3.IntegrityError:
+                db.execute("ROLLBACK TO chunk")
+                for row in chunk:
+                    try:
+                        db.execute(sql, row.values)
+                        inserted += 1
+                    except sqlite3.IntegrityError as e:
+                        reject(row.line, str(e), dict(zip(columns, row.values)))
+            db.execute("RELEASE chunk")
+
+        # every index is built once over all rows instead of being updated row by row
+        for _, _, create in objects:
+            db.execute(create)
+        if table == "inventory" and has_table(db, "inventory_fts"):
+            db.execute(REBUILD_FTS)
+        if table in ("inventory", "orderLookup") and has_table(db, "item_summary"):
+            for statement in REBUILD_SUMMARY:
+                db.execute(statement)
+        db.execute("ANALYZE")
+    except BaseException:
+        db.rollback()
+        raise
+    db.commit()
+    return inserted
+
+
+def import_csv(db: sqlite3.Connection, table: str, file: IO[str], chunk_size: int = CHUNK_SIZE,
+               rejects_out: IO[str] = None, keep_rejects: int = 100) -> LoadReport:
+    """
+    Import a CSV file into a table
+
+    Parameters:
+        rejects_out (IO):       Optional: all rejected rows are written here as CSV (line, reason, columns)
+        keep_rejects (int):     Rejects kept in the report
+
+    Returns:
+        LoadReport:     Inserted and rejected rows
+    """
+    columns, _ = TABLES[table]
+    writer = None
+    if rejects_out is not None:
+        writer = csv.writer(rejects_out)
+        writer.writerow(("line", "reason") + columns)
+
+    kept, rejected = [], 0
+
+    # rejects are streamed to the file, only the first ones are kept
+    def reject(line: int, reason: str, record: dict) -> None:
+        nonlocal rejected
+        rejected += 1
+        if writer is not None:
+            writer.writerow((line, reason) + tuple(record.get(column, "") for column in columns))
+        if len(kept) < keep_rejects:
+            kept.append((line, reason))
+
+    inserted = bulk_load(db, table, read_rows(table, file, reject), reject, chunk_size)
+    kept.sort()
+    return LoadReport(inserted, rejected, kept)
+
+
+def export_csv(db: sqlite3.Connection, table: str, out: IO[str], page_size: int = CHUNK_SIZE) -> int:
+    """
+    Write a table as CSV, page by page (keyset pagination on the rowid)
+
+    Returns:
+        int:    Number of rows written
+    """
+    columns, _ = TABLES[table]
+    sql = f"SELECT rowid, {', '.join(columns)} FROM {table} WHERE rowid > ? ORDER BY rowid LIMIT ?"
+    writer = csv.writer(out)
+    writer.writerow(columns)
+
+    count, after = 0, -1
+    while True:
+        rows = db.execute(sql, (after, page_size)).fetchmany(page_size)
+        if not rows:
+            return count
+        writer.writerows(row[1:] for row in rows)
+        count += len(rows)
+        after = rows[-1][0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import / export of the inventory tables as CSV")
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("import", help="Load a CSV file into a table")
+    load.add_argument("database")
+    load.add_argument("table", choices=TABLES)
+    load.add_argument("file")
+    load.add_argument("--rejects", help="Write all rejected rows to this CSV file")
+    load.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Rows per executemany")
+    dump = commands.add_parser("export", help="Write a table as CSV")
+    dump.add_argument("database")
+    dump.add_argument("table", choices=TABLES)
+    dump.add_argument("file", nargs="?", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    db = InventoryDB(args.database).db
+    start = time.perf_counter()
+
+    if args.command == "export":
+        if args.file:
+            with open(args.file, "w", newline="", encoding="utf-8") as out:
+                count = export_csv(db, args.table, out)
+        else:
+            count = export_csv(db, args.table, sys.stdout)
+        print(f"{count} Zeilen von {args.table} exportiert ({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+        return
+
+    with open(args.file, newline="", encoding="utf-8") as file:
+        rejects_out = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+        try:
+            report = import_csv(db, args.table, file, args.chunk_size, rejects_out)
+        except ValueError as e:
+            parser.error(str(e))
+        finally:
+            if rejects_out is not None:
+                rejects_out.close()
+
+    print(f"{report.inserted} Zeilen in {args.table} geladen, {report.rejected} abgelehnt "
+          f"({time.perf_counter() - start:.1f} s)")
+    for line, reason in report.rejects[:10]:
+        print(f"    Zeile {line}: {reason}")
+    if report.rejected > 10:
+        print(f"    ... ({'alle in ' + args.rejects if args.rejects else '--rejects schreibt alle in eine Datei'})")
+
+
+if __name__ == "__main__":
+    main()
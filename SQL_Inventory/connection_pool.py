@@ -0,0 +1,104 @@
+"""
+Connections for concurrent access to one inventory database (e.g. several scanning stations or an API server)
+
+    SQLite allows many readers but only one writer at a time (WAL mode: readers never wait for the writer).
+    ConnectionManager therefore keeps
+        a pool of reader connections, used by any number of threads in turn, and
+        a single writer connection, owned by one thread which runs all writes from a queue in order
+        -> writers of this process never compete for the lock, other processes wait (busy_timeout).
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable
+
+from inventory_db import BUSY_TIMEOUT, InventoryDB
+
+
+class ConnectionManager:
+    """
+    Reader pool and writer queue of a database file
+
+    Attributes:
+        db_path (str):      Database file (WAL mode, see inventory_db.configure_connection)
+        readers (int):      Number of reader connections
+    """
+
+    def __init__(self, db_path: str, readers: int = 4, busy_timeout: float = BUSY_TIMEOUT) -> None:
+        """
+        Parameters:
+            db_path (str):          Database file
+            readers (int):          Reader connections (= max. concurrent reads of this process)
+            busy_timeout (float):   Seconds to wait for locks held by other processes
+        """
+        self.db_path = db_path
+        self.readers = readers
+
+        # the writer connection is opened first: it migrates the schema and switches to WAL
+        self.__writer = InventoryDB(db_path, busy_timeout=busy_timeout, check_same_thread=False)
+        self.__pool = queue.Queue()
+        for _ in range(readers):
+            self.__pool.put(InventoryDB(db_path, busy_timeout=busy_timeout, check_same_thread=False))
+
+        self.__writes = queue.Queue()
+        self.__writer_thread = threading.Thread(target=self.__write_loop, daemon=True)
+        self.__writer_thread.start()
+
+    @contextmanager
+    def reader(self, timeout: float = None):
+        """
+        Borrow a reader connection for the block (waits if all are in use)
+
+        Yields:
+            InventoryDB:    Connection for reads only (writes go through write())
+        """
+        connection = self.__pool.get(timeout=timeout)
+        try:
+            yield connection
+        finally:
+            # a reader never keeps a transaction open (it would pin an old snapshot of the WAL)
+            connection.db.rollback()
+            self.__pool.put(connection)
+
+    def write(self, work: Callable[[InventoryDB], object]) -> Future:
+        """
+        Queue a write, all writes run one after the other on the writer connection
+
+        Parameters:
+            work (Callable):    Called with the writer InventoryDB, e.g. lambda db: db.add_units(item_id)
+                                (methods of InventoryDB commit themselves, others are committed afterwards)
+
+        Returns:
+            Future:     Result (or exception) of the work
+        """
+        future = Future()
+        self.__writes.put((work, future))
+        return future
+
+    def __write_loop(self) -> None:
+        while True:
+            work, future = self.__writes.get()
+            if work is None:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                result = work(self.__writer)
+                self.__writer.db.commit()
+            except BaseException as e:
+                self.__writer.db.rollback()
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def close(self) -> None:
+        """
+        Finish the queued writes and close all connections
+        """
+        self.__writes.put((None, None))
+        self.__writer_thread.join()
+        self.__writer.close()
+        for _ in range(self.readers):
+            self.__pool.get().close()
@@ -0,0 +1,155 @@
+"""
+Several scanning stations (processes) reading and writing the same inventory database
+
+    python contention_benchmark.py --processes 8 --seconds 10
+
+Modes:
+    legacy:     one connection per process with the default settings (rollback journal) as before
+    wal:        one connection per process in WAL mode with busy_timeout and synchronous=NORMAL
+    pool:       WAL, ConnectionManager per process (reader pool + writer queue) used by --threads threads
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from multiprocessing import Pool
+
+from connection_pool import ConnectionManager
+from inventory_db import InventoryDB
+
+
+MODES = ("legacy", "wal", "pool")
+WORDS = ["Raspberry", "Resistor", "Capacitor", "Arduino", "Cable", "Pico", "LED", "Sensor"]
+
+
+def create_database(path: str, items: int, seed: int) -> list[int]:
+    """
+    Copy of the schema with synthetic items and one order number per item (rollback journal)
+
+    Returns:
+        list:   All order numbers
+    """
+    rng = random.Random(seed)
+    InventoryDB(path, configure=False).close()
+
+    db = sqlite3.connect(path)
+    order_nrs = rng.sample(range(10_000_000, 99_999_999), items)
+    with db:
+        db.executemany("INSERT INTO inventory (name, category, units) VALUES (?, ?, ?)",
+                       ((f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}", rng.choice(["PC", "Resistor", "Other"]),
+                         rng.randrange(100)) for i in range(items)))
+        item_ids = [item_id for item_id, in db.execute("SELECT itemID FROM inventory")]
+        db.executemany("INSERT INTO orderLookup (itemID, vendorID, orderNr, price) VALUES (?, 1, ?, ?)",
+                       ((item_id, order_nr, rng.randrange(1, 10000) / 100) for item_id, order_nr in zip(item_ids, order_nrs)))
+    db.close()
+    return order_nrs
+
+
+def station(mode: str, path: str, seconds: float, write_ratio: float, threads: int, order_nrs: list[int],
+            seed: int) -> dict:
+    """
+    Scanning station: scans (lookup + UPDATE) and reads (name search) until the time is up
+
+    Returns:
+        dict:   Latencies of the reads and writes, failed operations ("database is locked")
+    """
+    stats = {"read": [], "write": [], "errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    if mode == "pool":
+        manager = ConnectionManager(path, readers=threads)
+        connection = None
+    else:
+        manager = None
+        connection = InventoryDB(path, configure=(mode == "wal"))
+
+    def work(rng: random.Random) -> None:
+        while time.monotonic() < deadline:
+            write = rng.random() < write_ratio
+            start = time.perf_counter()
+            try:
+                if write:
+                    order_nr = rng.choice(order_nrs)
+                    if manager:
+                        with manager.reader() as db:
+                            matches = db.scan_lookup(order_nr)
+                        manager.write(lambda db: db.add_units(matches[0].itemID)).result()
+                    else:
+                        connection.add_units(connection.scan_lookup(order_nr)[0].itemID)
+                else:
+                    if manager:
+                        with manager.reader() as db:
+                            db.search_items(rng.choice(WORDS))
+                    else:
+                        connection.search_items(rng.choice(WORDS))
+            except sqlite3.OperationalError:
+                with lock:
+                    stats["errors"] += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                stats["write" if write else "read"].append(elapsed)
+
+    if manager:
+        workers = [threading.Thread(target=work, args=(random.Random(seed * 1000 + i),)) for i in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    else:
+        # one connection per station, used by the process itself (as a DatabaseInterface does)
+        work(random.Random(seed * 1000))
+
+    (manager or connection).close()
+    return stats
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Contention of several processes on one inventory database")
+    parser.add_argument("--processes", type=int, default=4, help="Scanning stations")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per station (pool mode)")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration per mode")
+    parser.add_argument("--write-ratio", type=float, default=0.3, help="Share of scans (writes), the rest are searches")
+    parser.add_argument("--items", type=int, default=20000, help="Synthetic items in the database")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        template = os.path.join(directory, "template.db")
+        order_nrs = create_database(template, args.items, args.seed)
+
+        print(f"{args.processes} processes, {args.seconds} s per mode, {args.write_ratio:.0%} writes, {args.items} items")
+        print(f"{'mode':<8}{'reads/s':>10}{'writes/s':>10}{'read p95 ms':>13}{'write p95 ms':>14}{'errors':>8}")
+        for mode in args.modes:
+            path = os.path.join(directory, f"{mode}.db")
+            shutil.copy(template, path)
+
+            with Pool(args.processes) as pool:
+                results = pool.starmap(station, [(mode, path, args.seconds, args.write_ratio, args.threads, order_nrs,
+                                                  args.seed + i) for i in range(args.processes)])
+
+            reads = [t for stats in results for t in stats["read"]]
+            writes = [t for stats in results for t in stats["write"]]
+            errors = sum(stats["errors"] for stats in results)
+            print(f"{mode:<8}{len(reads) / args.seconds:>10.0f}{len(writes) / args.seconds:>10.0f}"
+                  f"{percentile(reads, 95) * 1000:>13.1f}{percentile(writes, 95) * 1000:>14.1f}{errors:>8}")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
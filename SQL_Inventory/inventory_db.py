@@ -0,0 +1,278 @@
+"""
+Data access layer of the inventory database
+
+    All SQL of the program is defined once as a named, parameterized statement.
+    SQLite parses and plans every statement once per connection and reuses it from the
+    statement cache, values are bound as parameters (never formatted into the SQL).
+    Rows are returned as named tuples (Item, Vendor, Order, ScanMatch).
+"""
+import json
+import sqlite3
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from inventory_search import PAGE_SIZE, search_items
+from migrations import has_table, migrate
+
+
+Item = namedtuple("Item", ("itemID", "name", "category", "units"))
+Vendor = namedtuple("Vendor", ("vendorID", "name", "url"))
+Order = namedtuple("Order", ("itemID", "vendorID", "orderNr", "price"))
+# an order option with its item and vendor (vendor: None if the vendor is unknown)
+ScanMatch = namedtuple("ScanMatch", ("itemID", "name", "units", "vendorID", "vendor", "orderNr", "price"))
+Stock = namedtuple("Stock", ("itemID", "units"))
+# row of the item_summary table (migration 3) with the name of the cheapest vendor
+Summary = namedtuple("Summary", ("itemID", "name", "units", "vendorID", "vendor", "price", "stock_value"))
+# result of a batch scan: itemID -> added units, orderNr -> scans, orderNr -> (scans, itemIDs)
+BatchResult = namedtuple("BatchResult", ("added", "unknown", "ambiguous"))
+
+# name -> (SQL with named parameters, row type or None for writes)
+STATEMENTS = {
+    "vendors": ("SELECT vendorID, name, url FROM vendors ORDER BY vendorID", Vendor),
+    # keyset pagination: the next page starts after the last key of the previous one (index lookup, no OFFSET)
+    "vendors_page": ("SELECT vendorID, name, url FROM vendors WHERE vendorID > :after ORDER BY vendorID LIMIT :limit",
+                     Vendor),
+    "items_page": ("""
+        SELECT itemID, name, category, units FROM inventory WHERE itemID > :after ORDER BY itemID LIMIT :limit""",
+                   Item),
+    "item": ("SELECT itemID, name, category, units FROM inventory WHERE itemID = :item_id", Item),
+    "orders_for_item": ("SELECT itemID, vendorID, orderNr, price FROM orderLookup WHERE itemID = :item_id", Order),
+    "orders_by_number": ("SELECT itemID, vendorID, orderNr, price FROM orderLookup WHERE orderNr = :order_nr", Order),
+    "scan_lookup": ("""
+        SELECT o.itemID, i.name, i.units, o.vendorID, v.name, o.orderNr, o.price
+        FROM orderLookup AS o
+            JOIN inventory AS i ON i.itemID = o.itemID
+            LEFT JOIN vendors AS v ON v.vendorID = o.vendorID
+        WHERE o.orderNr = :order_nr
+        ORDER BY o.itemID""", ScanMatch),
+    "add_units": ("""
+        UPDATE inventory SET units = units + :units WHERE itemID = :item_id
+        RETURNING itemID, name, category, units""", Item),
+    # purchasing report: precomputed by triggers, only read here
+    "summary_page": ("""
+        SELECT s.itemID, s.name, s.units, s.cheapest_vendorID, v.name, s.cheapest_price, s.stock_value
+        FROM item_summary AS s LEFT JOIN vendors AS v ON v.vendorID = s.cheapest_vendorID
+        WHERE s.itemID > :after ORDER BY s.itemID LIMIT :limit""", Summary),
+    "summary_item": ("""
+        SELECT s.itemID, s.name, s.units, s.cheapest_vendorID, v.name, s.cheapest_price, s.stock_value
+        FROM item_summary AS s LEFT JOIN vendors AS v ON v.vendorID = s.cheapest_vendorID
+        WHERE s.itemID = :item_id""", Summary),
+    "stock_value": ("SELECT total(stock_value) FROM item_summary", None),
+    # many items in one statement: the itemIDs are passed as one JSON array
+    "stock_levels": ("""
+        SELECT itemID, units FROM inventory WHERE itemID IN (SELECT value FROM json_each(:item_ids))""", Stock),
+    "add_units_batch": ("UPDATE inventory SET units = units + :units WHERE itemID = :item_id", None),
+}
+
+# prepared statements kept per connection: all named statements and the search variants fit easily
+CACHED_STATEMENTS = 64
+BUSY_TIMEOUT = 5.0          # seconds a statement waits for a lock of another connection before it fails
+
+
+def configure_connection(db: sqlite3.Connection, busy_timeout: float = BUSY_TIMEOUT) -> None:
+    """
+    Settings for several connections / processes on the same database file
+        WAL:                readers do not block the writer and the writer does not block readers
+        busy_timeout:       wait for a lock instead of failing with "database is locked"
+        synchronous NORMAL: no fsync per commit in WAL mode (a power loss may undo the last commits,
+                            the database stays consistent)
+    """
+    db.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+    # stored in the file -> only the first connection switches, fails on read-only files (keeps the old mode)
+    db.execute("PRAGMA journal_mode = WAL")
+    db.execute("PRAGMA synchronous = NORMAL")
+
+
+class InventoryDB:
+    """
+    Connection to an inventory database with named statements
+
+    Attributes:
+        db (Connection):        SQLite connection (schema migrated to the latest version)
+        search_index (bool):    FTS5 name search available (see inventory_search.py)
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = CACHED_STATEMENTS, busy_timeout: float = BUSY_TIMEOUT,
+                 check_same_thread: bool = True, configure: bool = True) -> None:
+        """
+        Parameters:
+            db_path (str):              Database file
+            cached_statements (int):    Size of the prepared statement cache of the connection
+            busy_timeout (float):       Seconds to wait for locks of other connections
+            check_same_thread (bool):   False: the connection may be handed between threads (see connection_pool.py)
+            configure (bool):           Switch to WAL etc. (see configure_connection), False only for comparisons
+        """
+        self.db = sqlite3.connect(db_path, timeout=busy_timeout, cached_statements=cached_statements,
+                                  check_same_thread=check_same_thread)
+        if configure:
+            configure_connection(self.db, busy_timeout)
+        migrate(self.db)
+        self.search_index = has_table(self.db, "inventory_fts")
+
+    def query(self, name: str, **parameters) -> list[tuple]:
+        """
+        Run a named SELECT statement (or a write with RETURNING)
+
+        Returns:
+            list:   Rows as named tuples of the statement's row type
+        """
+        sql, row_type = STATEMENTS[name]
+        return [row_type._make(row) for row in self.db.execute(sql, parameters)]
+
+    def query_one(self, name: str, **parameters) -> tuple:
+        """
+        First row of a named SELECT statement (None if there is none)
+        """
+        sql, row_type = STATEMENTS[name]
+        row = self.db.execute(sql, parameters).fetchone()
+        return None if row is None else row_type._make(row)
+
+    def execute(self, name: str, **parameters) -> int:
+        """
+        Run a named write statement (inside the current transaction, see transaction())
+
+        Returns:
+            int:    Number of changed rows
+        """
+        sql, _ = STATEMENTS[name]
+        return self.db.execute(sql, parameters).rowcount
+
+    @contextmanager
+    def transaction(self):
+        """
+        Commit all writes of the block, or roll them back if it raises
+        """
+        with self.db:
+            yield self
+
+    def vendors(self) -> list[Vendor]:
+        return self.query("vendors")
+
+    def item(self, item_id) -> Item:
+        return self.query_one("item", item_id=item_id)
+
+    def orders_for_item(self, item_id) -> list[Order]:
+        return self.query("orders_for_item", item_id=item_id)
+
+    def orders_by_number(self, order_nr) -> list[Order]:
+        return self.query("orders_by_number", order_nr=order_nr)
+
+    def summary(self, item_id) -> Summary:
+        """
+        Cheapest vendor, its price and the stock value of an item (None if the item does not exist)
+        """
+        return self.query_one("summary_item", item_id=item_id)
+
+    def stock_value(self) -> float:
+        """
+        Value of the whole stock (every item at the price of its cheapest vendor)
+        """
+        sql, _ = STATEMENTS["stock_value"]
+        return self.db.execute(sql).fetchone()[0]
+
+    def stock_levels(self, item_ids: list[int]) -> dict[int, int]:
+        """
+        Units in stock of many items with one query
+
+        Returns:
+            dict:   itemID -> units (unknown itemIDs are missing)
+        """
+        return dict(self.query("stock_levels", item_ids=json.dumps(list(item_ids))))
+
+    def scan_lookup(self, order_nr) -> list[ScanMatch]:
+        """
+        Items (with vendor and price) of an order number, one join instead of a query per table
+        """
+        return self.query("scan_lookup", order_nr=order_nr)
+
+    def add_units(self, item_id, units: int = 1) -> Item:
+        """
+        Add units to the stock of an item (own transaction)
+
+        Returns:
+            Item:   The item with its new stock (UPDATE ... RETURNING), None if it does not exist
+        """
+        with self.transaction():
+            # all rows are fetched before the commit -> the statement is finished
+            rows = self.query("add_units", item_id=item_id, units=units)
+        return rows[0] if rows else None
+
+    def batch_scan(self, order_numbers: Iterable[str]) -> BatchResult:
+        """
+        Add one unit per scanned order number, all scans in one transaction
+            The scans are counted per order number and per itemID first,
+            then every item is updated once (one executemany).
+            Unknown and ambiguous order numbers (several items) are not added.
+
+        Parameters:
+            order_numbers (Iterable[str]):  Scanned order numbers (e.g. lines of a file, consumed as a stream)
+        """
+        scans = Counter(nr.strip() for nr in order_numbers if nr.strip())
+
+        added = defaultdict(int)
+        unknown, ambiguous = {}, {}
+        # IMMEDIATE: take the write lock before the lookups -> no other writer in between
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for order_nr, count in scans.items():
+                item_ids = sorted({order.itemID for order in self.orders_by_number(order_nr)})
+                if not item_ids:
+                    unknown[order_nr] = count
+                elif len(item_ids) > 1:
+                    ambiguous[order_nr] = (count, item_ids)
+                else:
+                    added[item_ids[0]] += count
+
+            sql, _ = STATEMENTS["add_units_batch"]
+            self.db.executemany(sql, ({"item_id": item_id, "units": units} for item_id, units in added.items()))
+        except BaseException:
+            self.db.rollback()
+            raise
+        self.db.commit()
+        return BatchResult(dict(added), unknown, ambiguous)
+
+    def iter_pages(self, name: str, page_size: int = PAGE_SIZE, after: int = -1) -> Iterator[list[tuple]]:
+        """
+        All rows of a table, page by page (keyset pagination on the first column, e.g. itemID)
+            Every page is a short query of its own -> no read transaction stays open between pages
+
+        Parameters:
+            name (str):         Statement with :after and :limit ('items_page', 'vendors_page' or 'summary_page')
+            page_size (int):    Rows per page
+            after (int):        Start after this key
+        """
+        sql, row_type = STATEMENTS[name]
+        while True:
+            cursor = self.db.execute(sql, {"after": after, "limit": page_size})
+            rows = [row_type._make(row) for row in cursor.fetchmany(page_size)]
+            if not rows:
+                return
+            yield rows
+            after = rows[-1][0]
+
+    def iter_search_pages(self, text: str, page_size: int = PAGE_SIZE) -> Iterator[list[Item]]:
+        """
+        Search results page by page, best matches first (all items by itemID if the text is empty)
+        """
+        if not text.strip():
+            yield from self.iter_pages("items_page", page_size)
+            return
+
+        offset = 0
+        while True:
+            rows = self.search_items(text, page_size, offset)
+            if not rows:
+                return
+            yield rows
+            offset += page_size
+
+    def search_items(self, text: str, limit: int = PAGE_SIZE, offset: int = 0) -> list[Item]:
+        """
+        One page of the items whose name contains the text, best matches first
+        """
+        rows = search_items(self.db, text, limit, offset, fts=self.search_index)
+        return [Item._make(row) for row in rows]
+
+    def close(self) -> None:
+        self.db.close()
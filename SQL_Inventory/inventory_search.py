@@ -0,0 +1,60 @@
+"""
+Name search over inventory.name, done by SQLite instead of Python
+
+    FTS5 index (trigram tokenizer -> case-insensitive substring matches, ranked with bm25),
+    kept in sync with the inventory table by triggers (created by migration 4, see migrations.py).
+    Falls back to a parameterized LIKE if the SQLite build has no FTS5 / trigram tokenizer
+    or the search text is shorter than a trigram.
+"""
+import sqlite3
+
+
+PAGE_SIZE = 20          # rows per page of search results
+MIN_TRIGRAM = 3         # shorter search texts can not use the trigram index
+
+FTS_QUERY = """
+SELECT i.itemID, i.name, i.category, i.units
+FROM inventory_fts JOIN inventory AS i ON i.itemID = inventory_fts.rowid
+WHERE inventory_fts MATCH ?
+ORDER BY inventory_fts.rank, i.itemID
+LIMIT ? OFFSET ?
+"""
+
+# names starting with the text first, then the shortest (= closest) names
+LIKE_QUERY = r"""
+SELECT itemID, name, category, units
+FROM inventory
+WHERE name LIKE ? ESCAPE '\'
+ORDER BY instr(lower(name), lower(?)) != 1, length(name), itemID
+LIMIT ? OFFSET ?
+"""
+
+ALL_QUERY = "SELECT itemID, name, category, units FROM inventory ORDER BY itemID LIMIT ? OFFSET ?"
+
+
+def search_items(db: sqlite3.Connection, text: str, limit: int = PAGE_SIZE, offset: int = 0,
+                 fts: bool = True) -> list[tuple]:
+    """
+    One page of the items whose name contains the text (case-insensitive), best matches first
+
+    Parameters:
+        db (Connection):    Inventory database
+        text (str):         Part of the name, '' lists all items
+        limit (int):        Max. number of rows
+        offset (int):       Rows to skip (page * PAGE_SIZE)
+        fts (bool):         Use the FTS5 index (inventory_fts, see migrations.py)
+
+    Returns:
+        list:   (itemID, name, category, units) tuples
+    """
+    text = text.strip()
+    if not text:
+        return db.execute(ALL_QUERY, (limit, offset)).fetchall()
+
+    if fts and len(text) >= MIN_TRIGRAM:
+        # one quoted phrase -> the text is matched literally, no FTS5 query syntax
+        phrase = '"' + text.replace('"', '""') + '"'
+        return db.execute(FTS_QUERY, (phrase, limit, offset)).fetchall()
+
+    pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    return db.execute(LIKE_QUERY, (pattern, text, limit, offset)).fetchall()
@@ -0,0 +1,274 @@
+import json
+import socket                                               # to get own IP
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from flask import Flask, Response, request, jsonify         # for api
+
+from connection_pool import ConnectionManager
+
+
+class ReadCache:
+    """
+    Read-through cache of response bodies
+        Every commit on the database file (this server or any other process, e.g. a scanning station)
+        changes PRAGMA data_version of the watch connection -> all cached bodies are dropped.
+
+    Attributes:
+        max_entries (int):  Bodies kept (least recently used are dropped first)
+        hits (int):         Requests answered from the cache
+        misses (int):       Requests which queried the database
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.__watch = sqlite3.connect(db_path, check_same_thread=False)
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__version = None
+
+    def get(self, key, build) -> bytes:
+        """
+        Cached body of a key, built (outside the lock) if missing or outdated
+
+        Parameters:
+            key:                Hashable key, e.g. (route, parameters)
+            build (Callable):   Returns the body (bytes)
+        """
+        with self.__lock:
+            version = self.__watch.execute("PRAGMA data_version").fetchone()[0]
+            if version != self.__version:
+                self.__entries.clear()
+                self.__version = version
+            body = self.__entries.get(key)
+            if body is not None:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = build()
+        with self.__lock:
+            # only if no commit happened in between (else the body may already be outdated)
+            if version == self.__version:
+                self.__entries[key] = body
+                if len(self.__entries) > self.max_entries:
+                    self.__entries.popitem(last=False)
+        return body
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__version = None
+
+    def close(self) -> None:
+        self.__watch.close()
+
+
+class InventoryServer:
+    """
+    Inventory Server
+        REST API over an inventory database (the same file the DatabaseInterface uses)
+
+    Attributes
+        connections (ConnectionManager):    Reader pool and writer queue of the database
+        cache (ReadCache):                  Bodies of the read routes, dropped on every commit
+        app (Flask):                        Web Server Instance
+    """
+    # max. rows of one search page / itemIDs of one bulk stock request
+    MAX_PAGE_SIZE = 100
+    MAX_BULK_ITEMS = 10000
+    # max. units of one scan (larger values overflow the INTEGER column and would turn units into a REAL)
+    MAX_SCAN_UNITS = 100000
+
+    def __init__(self, db_path: str = "inventory_SW14.db", readers: int = 4, cache_entries: int = 1024):
+        """
+        Parameters:
+            db_path (str):          Database file (migrated to the latest schema, WAL mode)
+            readers (int):          Connections for concurrent reads
+            cache_entries (int):    Response bodies kept in the read cache
+        """
+        self.connections = ConnectionManager(db_path, readers=readers)
+        self.cache = ReadCache(db_path, cache_entries)
+        self.app = Flask(__name__)
+
+        self.setup_routes()
+
+    def setup_routes(self):
+        """
+        Expose the following Methods
+        """
+        # 1. All vendors
+        @self.app.route('/inventory/vendors', methods=['GET'])
+        def get_vendors():
+            def build() -> bytes:
+                with self.connections.reader() as db:
+                    vendors = db.vendors()
+                return json.dumps({'vendors': [vendor._asdict() for vendor in vendors]}).encode()
+
+            return self.cached_response(('vendors',), build)
+
+        # 2. Item search by name (ranked, paginated)
+        @self.app.route('/inventory/items', methods=['GET'])
+        def search_items():
+            text = request.args.get('q', '')
+            try:
+                limit = int(request.args.get('limit', 20))
+                offset = max(int(request.args.get('offset', 0)), 0)
+            except ValueError:
+                return jsonify({"error": "Invalid limit or offset"}), 400
+            # SQLite reads a negative LIMIT as "no limit"
+            if limit < 1:
+                return jsonify({"error": "Limit must be at least 1"}), 400
+            limit = min(limit, self.MAX_PAGE_SIZE)
+
+            def build() -> bytes:
+                with self.connections.reader() as db:
+                    items = db.search_items(text, limit, offset)
+                return json.dumps({'items': [item._asdict() for item in items]}).encode()
+
+            return self.cached_response(('items', text, limit, offset), build)
+
+        # 3. One item
+        @self.app.route('/inventory/items/<int:item_id>', methods=['GET'])
+        def get_item(item_id):
+            def build() -> bytes:
+                with self.connections.reader() as db:
+                    item = db.item(item_id)
+                return json.dumps(None if item is None else item._asdict()).encode()
+
+            return self.cached_response(('item', item_id), build, not_found="Unknown item")
+
+        # 4. Order lookup: order options of an item or items of an order number
+        @self.app.route('/inventory/orders', methods=['GET'])
+        def get_orders():
+            item_id = request.args.get('item_id')
+            order_nr = request.args.get('order_nr')
+            if (item_id is None) == (order_nr is None):
+                return jsonify({"error": "Either item_id or order_nr is required"}), 400
+
+            def build() -> bytes:
+                with self.connections.reader() as db:
+                    if item_id is not None:
+                        orders = db.orders_for_item(item_id)
+                    else:
+                        orders = db.scan_lookup(order_nr)
+                return json.dumps({'orders': [order._asdict() for order in orders]}).encode()
+
+            return self.cached_response(('orders', item_id, order_nr), build)
+
+        # 5. Purchasing report: cheapest vendor and stock value per item (keyset pages)
+        @self.app.route('/inventory/summary', methods=['GET'])
+        def get_summary():
+            try:
+                after = int(request.args.get('after', 0))
+                limit = int(request.args.get('limit', self.MAX_PAGE_SIZE))
+            except ValueError:
+                return jsonify({"error": "Invalid after or limit"}), 400
+            if limit < 1:
+                return jsonify({"error": "Limit must be at least 1"}), 400
+            limit = min(limit, self.MAX_PAGE_SIZE)
+
+            def build() -> bytes:
+                with self.connections.reader() as db:
+                    page = next(db.iter_pages('summary_page', limit, after), [])
+                    total = db.stock_value()
+                return json.dumps({'items': [row._asdict() for row in page], 'stock_value': total}).encode()
+
+            return self.cached_response(('summary', after, limit), build)
+
+        # 6. Bulk stock levels of many items in one request
+        @self.app.route('/inventory/stock', methods=['POST'])
+        def get_stock():
+            try:
+                item_ids = [int(item_id) for item_id in request.json['item_ids']]
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": "Invalid input, expected {'item_ids': [1, 2, ...]}"}), 400
+            if len(item_ids) > self.MAX_BULK_ITEMS:
+                return jsonify({"error": f"At most {self.MAX_BULK_ITEMS} itemIDs per request"}), 400
+
+            with self.connections.reader() as db:
+                stock = db.stock_levels(item_ids)
+            return jsonify({'stock': {str(item_id): units for item_id, units in stock.items()},
+                            'unknown': [item_id for item_id in item_ids if item_id not in stock]})
+
+        # 7. Scan an item (add units to the stock)
+        @self.app.route('/inventory/scan', methods=['POST'])
+        def scan_item():
+            try:
+                order_nr = str(request.json['order_nr'])
+                units = int(request.json.get('units', 1))
+                item_id = request.json.get('item_id')       # choice if several items have this order number
+                item_id = None if item_id is None else int(item_id)
+            except (KeyError, TypeError, ValueError):
+                return jsonify({"error": "Invalid input"}), 400
+            if not 1 <= units <= self.MAX_SCAN_UNITS:
+                return jsonify({"error": f"Units must be between 1 and {self.MAX_SCAN_UNITS}"}), 400
+
+            with self.connections.reader() as db:
+                matches = db.scan_lookup(order_nr)
+            if item_id is not None:
+                matches = [match for match in matches if match.itemID == item_id]
+
+            if not matches:
+                return jsonify({"error": "Unknown order number"}), 404
+            if len({match.itemID for match in matches}) > 1:
+                return jsonify({"error": "Several items have this order number, choose one with 'item_id'",
+                                "matches": [match._asdict() for match in matches]}), 409
+
+            try:
+                item = self.connections.write(lambda db: db.add_units(matches[0].itemID, units)).result()
+            except (sqlite3.Error, OverflowError) as e:
+                return jsonify({"error": f"Stock not updated: {e}"}), 422
+            self.cache.invalidate()
+            if item is None:
+                return jsonify({"error": "Unknown item"}), 404
+            return jsonify(item._asdict())
+
+    def cached_response(self, key, build, not_found: str = None):
+        """
+        JSON response with the cached body of a key (built by a database query if missing)
+
+        Parameters:
+            not_found (str):    Error of a 404 response if the body is null (None: null is a valid body)
+        """
+        body = self.cache.get(key, build)
+        if not_found is not None and body == b'null':
+            return jsonify({"error": not_found}), 404
+        return Response(body, mimetype='application/json')
+
+    def close(self) -> None:
+        self.connections.close()
+        self.cache.close()
+
+    def run(self, debug=True, host='0.0.0.0', port=5001):
+        # Get and display the local IP address
+        hostname = socket.gethostname()
+        local_ip = socket.gethostbyname(hostname)
+        print(f"Server is running on {local_ip}:{port}")
+
+        # Start the Flask app (no reloader: it would open the database twice)
+        self.app.run(debug=debug, host=host, port=port, use_reloader=False)
+
+    def run_in_background(self, host='127.0.0.1', port=5001):
+        """
+        Start the server in a daemon thread (e.g. for tests and benchmarks)
+
+        Returns:
+            BaseWSGIServer:     Running server (stop with .shutdown())
+        """
+        from werkzeug.serving import make_server
+
+        server = make_server(host, port, self.app, threaded=True)
+        threading.Thread(target=server.serve_forever, name=f"inventory-server-{port}", daemon=True).start()
+        return server
+
+
+# If you want to run the server directly:
+if __name__ == '__main__':
+    server = InventoryServer()  # Initialize the InventoryServer
+    server.run()                # Start the Flask app
@@ -0,0 +1,254 @@
+"""
+Versioned schema migrations of the inventory database
+
+    The schema version is stored in the database file (PRAGMA user_version).
+    Every migration runs once, in order, in its own transaction.
+    Existing files (inventory.db, inventory_SW14.db) are upgraded in place:
+
+    python migrations.py inventory.db inventory_SW14.db         # upgrade to the latest version
+    python migrations.py --check inventory_SW14.db              # fail if a hot query scans a whole table
+"""
+import argparse
+import sqlite3
+
+
+# content of item_summary computed from scratch (the same rows the triggers of migration 3 keep up to date)
+#   used by migration 3 and by bulk loads which rebuild the table (bulk_csv.py)
+ITEM_SUMMARY_FILL = """INSERT INTO item_summary (itemID, name, units, cheapest_vendorID, cheapest_price, stock_value)
+        SELECT i.itemID, i.name, i.units, o.vendorID, o.price, i.units * o.price
+        FROM inventory AS i LEFT JOIN orderLookup AS o ON o.rowid = (
+            SELECT rowid FROM orderLookup WHERE itemID = i.itemID ORDER BY price, vendorID LIMIT 1)"""
+
+# (description, SQL script) - append new migrations, never change applied ones
+MIGRATIONS = [
+    ("base schema", """
+        CREATE TABLE IF NOT EXISTS inventory (itemID INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, category TEXT CHECK (category IN ('PC', 'Resistor', 'Other')), units INTEGER NOT NULL CHECK (units >= 0));
+        CREATE TABLE IF NOT EXISTS vendors (vendorID INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL, name TEXT NOT NULL, url TEXT);
+        CREATE TABLE IF NOT EXISTS orderLookup (itemID INTEGER REFERENCES inventory (itemID) ON DELETE CASCADE ON UPDATE CASCADE, vendorID REFERENCES vendors (vendorID) ON DELETE CASCADE ON UPDATE CASCADE, orderNr INTEGER NOT NULL, price NUMERIC CHECK (price > 0));
+    """),
+    ("orderLookup indexes", """
+        -- scan_item: orderNr -> itemID (covering, also serves lookups by orderNr alone)
+        CREATE INDEX IF NOT EXISTS orderLookup_orderNr_itemID ON orderLookup (orderNr, itemID);
+        -- get_orders: all order options of an item
+        CREATE INDEX IF NOT EXISTS orderLookup_itemID ON orderLookup (itemID);
+        -- deleting / renumbering a vendor (ON DELETE / ON UPDATE CASCADE)
+        CREATE INDEX IF NOT EXISTS orderLookup_vendorID ON orderLookup (vendorID);
+        ANALYZE;
+    """),
+    ("item_summary: cheapest vendor and stock value per item, kept up to date by triggers", f"""
+        -- cheapest order option per item (and its price) directly from the index
+        CREATE INDEX IF NOT EXISTS orderLookup_itemID_price ON orderLookup (itemID, price);
+
+        CREATE TABLE item_summary (
+            itemID INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            units INTEGER NOT NULL,
+            cheapest_vendorID INTEGER,          -- NULL: no order option
+            cheapest_price NUMERIC,
+            stock_value NUMERIC                 -- units * cheapest_price
+        );
+
+        {ITEM_SUMMARY_FILL};
+
+        CREATE TRIGGER item_summary_item_insert AFTER INSERT ON inventory BEGIN
+            INSERT INTO item_summary (itemID, name, units, cheapest_vendorID, cheapest_price, stock_value)
+            SELECT new.itemID, new.name, new.units, o.vendorID, o.price, new.units * o.price
+            FROM (SELECT 1) LEFT JOIN orderLookup AS o ON o.rowid = (
+                SELECT rowid FROM orderLookup WHERE itemID = new.itemID ORDER BY price, vendorID LIMIT 1);
+        END;
+
+        CREATE TRIGGER item_summary_item_update AFTER UPDATE OF name, units ON inventory BEGIN
+            UPDATE item_summary SET name = new.name, units = new.units, stock_value = new.units * cheapest_price
+            WHERE itemID = new.itemID;
+        END;
+
+        CREATE TRIGGER item_summary_item_renumber AFTER UPDATE OF itemID ON inventory BEGIN
+            UPDATE item_summary SET itemID = new.itemID WHERE itemID = old.itemID;
+        END;
+
+        CREATE TRIGGER item_summary_item_delete AFTER DELETE ON inventory BEGIN
+            DELETE FROM item_summary WHERE itemID = old.itemID;
+        END;
+
+        CREATE TRIGGER item_summary_order_insert AFTER INSERT ON orderLookup BEGIN
+            UPDATE item_summary SET (cheapest_vendorID, cheapest_price) = (
+                SELECT vendorID, price FROM orderLookup WHERE itemID = new.itemID ORDER BY price, vendorID LIMIT 1)
+            WHERE itemID = new.itemID;
+            UPDATE item_summary SET stock_value = units * cheapest_price WHERE itemID = new.itemID;
+        END;
+
+        CREATE TRIGGER item_summary_order_update AFTER UPDATE OF itemID, vendorID, price ON orderLookup BEGIN
+            UPDATE item_summary SET (cheapest_vendorID, cheapest_price) = (
+                SELECT vendorID, price FROM orderLookup WHERE itemID = item_summary.itemID ORDER BY price, vendorID LIMIT 1)
+            WHERE itemID IN (old.itemID, new.itemID);
+            UPDATE item_summary SET stock_value = units * cheapest_price WHERE itemID IN (old.itemID, new.itemID);
+        END;
+
+        CREATE TRIGGER item_summary_order_delete AFTER DELETE ON orderLookup BEGIN
+            UPDATE item_summary SET (cheapest_vendorID, cheapest_price) = (
+                SELECT vendorID, price FROM orderLookup WHERE itemID = old.itemID ORDER BY price, vendorID LIMIT 1)
+            WHERE itemID = old.itemID;
+            UPDATE item_summary SET stock_value = units * cheapest_price WHERE itemID = old.itemID;
+        END;
+    """),
+    ("inventory_fts: FTS5 name index (trigram), kept in sync by triggers", """
+        -- IF NOT EXISTS: older versions created the index outside the migrations
+        CREATE VIRTUAL TABLE IF NOT EXISTS inventory_fts USING fts5(
+            name, content='inventory', content_rowid='itemID', tokenize='trigram'
+        );
+
+        CREATE TRIGGER IF NOT EXISTS inventory_fts_insert AFTER INSERT ON inventory BEGIN
+            INSERT INTO inventory_fts(rowid, name) VALUES (new.itemID, new.name);
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS inventory_fts_delete AFTER DELETE ON inventory BEGIN
+            INSERT INTO inventory_fts(inventory_fts, rowid, name) VALUES ('delete', old.itemID, old.name);
+        END;
+
+        -- only renames touch the index (scanning items updates units only)
+        CREATE TRIGGER IF NOT EXISTS inventory_fts_update AFTER UPDATE OF itemID, name ON inventory BEGIN
+            INSERT INTO inventory_fts(inventory_fts, rowid, name) VALUES ('delete', old.itemID, old.name);
+            INSERT INTO inventory_fts(rowid, name) VALUES (new.itemID, new.name);
+        END;
+
+        INSERT INTO inventory_fts(inventory_fts) VALUES ('rebuild');
+    """),
+]
+
+# migrations which need an optional feature of the SQLite build: without it, migrating stops before them
+#   (the version stays below -> the database is upgraded later by a build which has the feature)
+OPTIONAL_MIGRATIONS = {
+    4: "FTS5 mit Trigram-Tokenizer",
+}
+
+# queries on the hot path: name -> (SQL, example parameters), must not scan a whole table
+HOT_QUERIES = {
+    "get_orders": ("SELECT itemID,vendorID,orderNr,price FROM orderLookup WHERE itemID = ?", (1,)),
+    "scan_item": ("SELECT o.itemID, i.name, i.units, o.vendorID, v.name, o.orderNr, o.price FROM orderLookup AS o "
+                  "JOIN inventory AS i ON i.itemID = o.itemID LEFT JOIN vendors AS v ON v.vendorID = o.vendorID "
+                  "WHERE o.orderNr = ? ORDER BY o.itemID", (1,)),
+    "scan_item (update)": ("UPDATE inventory SET units = units + 1 WHERE itemID = ? RETURNING units", (1,)),
+    "item by ID": ("SELECT itemID,name,units FROM inventory WHERE itemID = ?", (1,)),
+}
+
+
+def has_table(db: sqlite3.Connection, name: str) -> bool:
+    return db.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def split_statements(script: str) -> list[str]:
+    """
+    Split an SQL script into complete statements (triggers contain ';' themselves)
+    """
+    statements, current = [], ""
+    for line in script.splitlines(keepends=True):
+        if line.lstrip().startswith("--"):
+            continue
+        current += line
+        if sqlite3.complete_statement(current):
+            statements.append(current.strip())
+            current = ""
+    return statements
+
+
+def schema_version(db: sqlite3.Connection) -> int:
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(db: sqlite3.Connection, target: int = len(MIGRATIONS)) -> list[str]:
+    """
+    Apply all pending migrations up to a version
+
+    Parameters:
+        db (Connection):    Inventory database (no open transaction)
+        target (int):       Version to upgrade to (default: latest)
+
+    Returns:
+        list:   Descriptions of the applied migrations
+
+    Raises:
+        ValueError:     The database is newer than this program
+    """
+    version = schema_version(db)
+    if version > len(MIGRATIONS):
+        raise ValueError(f"Datenbank-Version {version} ist neuer als dieses Programm ({len(MIGRATIONS)})")
+
+    applied = []
+    for number, (description, script) in enumerate(MIGRATIONS[version:target], start=version + 1):
+        # DDL does not start a transaction implicitly -> BEGIN explicitly, a failed migration changes nothing
+        db.execute("BEGIN")
+        try:
+            for statement in split_statements(script):
+                db.execute(statement)
+            db.execute(f"PRAGMA user_version = {number}")
+        except sqlite3.OperationalError as e:
+            db.rollback()
+            if number not in OPTIONAL_MIGRATIONS:
+                raise
+            # e.g. "no such module: fts5" or "no such tokenizer: trigram"
+            print(f"Migration {number} übersprungen: {OPTIONAL_MIGRATIONS[number]} nicht verfügbar ({e})")
+            break
+        except sqlite3.Error:
+            db.rollback()
+            raise
+        db.commit()
+        applied.append(f"{number}: {description}")
+    return applied
+
+
+def full_scans(db: sqlite3.Connection, sql: str, parameters: tuple = ()) -> list[str]:
+    """
+    Full table scans in the query plan of a statement (EXPLAIN QUERY PLAN)
+
+    Returns:
+        list:   Plan lines like 'SCAN orderLookup' (empty: only index lookups)
+    """
+    plan = db.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+    # detail: 'SEARCH t USING INDEX ...' (lookup), 'SCAN t' or 'SCAN t USING COVERING INDEX ...' (reads all rows)
+    #   FTS5 tables are always 'SCAN t VIRTUAL TABLE INDEX ...', the MATCH is done by the index
+    return [detail for _, _, _, detail in plan if detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail]
+
+
+def check_query_plans(db: sqlite3.Connection, queries: dict = None) -> dict[str, list[str]]:
+    """
+    Check that the hot queries use indexes
+
+    Returns:
+        dict:   Query name -> full scans, only queries which regressed
+    """
+    queries = HOT_QUERIES if queries is None else queries
+    regressions = {}
+    for name, (sql, parameters) in queries.items():
+        scans = full_scans(db, sql, parameters)
+        if scans:
+            regressions[name] = scans
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upgrade inventory databases to the latest schema version")
+    parser.add_argument("databases", nargs="+", help="Database files (upgraded in place)")
+    parser.add_argument("--check", action="store_true", help="Only check the query plans of the hot queries")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.databases:
+        db = sqlite3.connect(path)
+        if not args.check:
+            before = schema_version(db)
+            applied = migrate(db)
+            print(f"{path}: Version {before} -> {schema_version(db)}")
+            for description in applied:
+                print(f"    {description}")
+
+        for name, scans in check_query_plans(db).items():
+            print(f"{path}: '{name}' durchsucht die ganze Tabelle: {', '.join(scans)}")
+            failed = True
+        db.close()
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,13 @@
-import sqlite3
+from itertools import takewhile
+
+from inventory_db import InventoryDB
+from table_renderer import TableRenderer
 
 class DatabaseInterface:
     def __init__(self, db_path:str):
-        self.db = sqlite3.connect(db_path)
-        self.cursor = self.db.cursor()
+        # all queries are named, parameterized statements (see inventory_db.py)
+        self.inventory = InventoryDB(db_path)
+        self.db = self.inventory.db
 
         self.main_menu = """+----------+-------------------------------------------------+
 | Auswahl  | Beschreibung                                    |
@@ -16,7 +20,11 @@ class DatabaseInterface:
 +----------+-------------------------------------------------+
 | 4        | Artikel scannen (nach Bestellnummer)            |
 +----------+-------------------------------------------------+
-| 5        | Beenden                                         |
+| 5        | Artikel im Stapel scannen (Datei / Scanner)     |
++----------+-------------------------------------------------+
+| 6        | Einkaufsübersicht (günstigster Lieferant, Wert) |
++----------+-------------------------------------------------+
+| 7        | Beenden                                         |
 +----------+-------------------------------------------------+
 """
 
@@ -24,16 +32,9 @@ class DatabaseInterface:
         print(self.main_menu)
 
     def list_vendors(self):
-
-        sql_command = "SELECT vendorID,name,url FROM vendors"
-        self.cursor.execute(sql_command)
-
-        print("""+-------------+-------------------------+------------------------------+
-| vendorID    | name                    | url                          |
-+-------------+-------------------------+------------------------------+""")
-        for vendorID,name,url in self.cursor:
-            print(f"""| {str(vendorID):<12}| {name:<24}| {url:<29}|
-+-------------+-------------------------+------------------------------+""")
+        # streamed page by page (see table_renderer.py)
+        table = TableRenderer(["vendorID", "name", "url"])
+        table.render(self.inventory.iter_pages("vendors_page"), more=self.next_page)
         
 
         # TODO: Implementieren Sie den Code hier
@@ -45,35 +46,26 @@ class DatabaseInterface:
         print(sub_menu)
         item_name = input("\nGeben Sie den Artikelnamen ein: ")
 
-        # get all items first
-        sql_command = f"SELECT itemID,name,category,units FROM inventory"
-        self.cursor.execute(sql_command)
+        # search in the database (FTS5 index, see inventory_search.py), one page at a time
+        table = TableRenderer(["ID", "Name", "Category", "Units"])
+        if table.render(self.inventory.iter_search_pages(item_name), more=self.next_page) == 0:
+            print("Keine Artikel gefunden")
 
-        print("""+----------+---------------------+------------------+-----------------------+
-| ID       | Name                | Category         | Units                 |
-+----------+---------------------+------------------+-----------------------+""")
-              
-        for id,name,category,units in self.cursor:
-            if item_name.upper() in name.upper():
-                print(f"""| {str(id):<9}| {name:<19} | {category:<16} | {str(units):<22}|
-+----------+---------------------+------------------+-----------------------+""")
+    def next_page(self) -> bool:
+        return input("ENTER für die nächste Seite, 'q' zum Abbrechen: ").lower() != "q"
 
     def get_orders(self):
         sub_menu = """+----------+-------------------------------------------------+
 | 3        | Bestellmöglichkeiten abrufen (nach ItemID)      |
 +----------+-------------------------------------------------+"""
         print(sub_menu)
-        item_id = input("\nGeben Sie die ItemID ein: ")
-        
-
-        sql_command = f"SELECT itemID,vendorID,orderNr,price FROM orderLookup WHERE itemID == {item_id}"
-        self.cursor.execute(sql_command)
+        item_id = input("\nGeben Sie die ItemID ein: ").strip()
 
         print("""+----------+-------------+------------------+---------------+
  ItemID    | vendorID    | orderNr          | Preis [CHF]   |
 +----------+-------------+------------------+---------------+""")
 
-        for itemID,vendorID,orderNr,price in self.cursor:
+        for itemID,vendorID,orderNr,price in self.inventory.orders_for_item(item_id):
             print(f"""| {str(itemID):<8} | {str(vendorID):<11} |  {str(orderNr):<16}| {str(price):<13} |
 +----------+-------------+------------------+---------------+""")
 
@@ -82,40 +74,73 @@ class DatabaseInterface:
 | 4        | Artikel scannen (nach Bestellnummer)            |
 +----------+-------------------------------------------------+"""
         print(sub_menu)
-        order_nr = input("\nGeben Sie die Bestellnummer ein: ")
+        order_nr = input("\nGeben Sie die Bestellnummer ein: ").strip()
         print(f"\nScanne Artikel mit Bestellnummer {order_nr}...")
         
         # search for article with this number
-        sql_query = f"SELECT itemID,orderNr FROM orderLookup where orderNr == {order_nr}"
-        self.cursor.execute(sql_query)
-
-        item_ids = []
-        for itemID,orderNr in self.cursor:
-            item_ids.append(itemID)
+        matches = self.inventory.scan_lookup(order_nr)
         
-        if len(item_ids)>1:
+        if len(matches)>1:
             print(f"Found Multiple Element with the Same orderNr - select correct ItemID to add to inventory")
-        elif len(item_ids) ==1:
-            sql_query = f"UPDATE inventory SET units = units + ? WHERE itemID = ?;"
-            try:
-                self.cursor.execute(sql_query, (1,itemID))
-            except:
-                self.db.rollback()
-            else:
-                self.db.commit()
+            for match in matches:
+                print(f"    {match.itemID}: {match.name} ({match.vendor})")
+        elif len(matches) ==1:
+            item = self.inventory.add_units(matches[0].itemID, 1)
+            print(f"{item.name} (ItemID {item.itemID}): {item.units} Stück an Lager")
         else:
             print(f"No Item found with this orderNr")
 
+    def batch_scan(self, source: str = None):
+        sub_menu = """+----------+-------------------------------------------------+
+| 5        | Artikel im Stapel scannen (Datei / Scanner)     |
++----------+-------------------------------------------------+"""
+        print(sub_menu)
+        if source is None:
+            source = input("\nDatei oder Scanner-Gerät (leer: Bestellnummern eingeben): ").strip()
+
+        # all scans are applied at the end in one transaction
+        #   a scanner device never ends -> a line 'ENDE' (e.g. a printed barcode) ends the batch
+        if source:
+            with open(source) as scans:
+                result = self.inventory.batch_scan(takewhile(lambda line: line.strip().upper() != "ENDE", scans))
+        else:
+            print("Eine Bestellnummer pro Zeile, leere Zeile oder 'ENDE' zum Abschliessen:")
+            result = self.inventory.batch_scan(takewhile(lambda line: line.strip().upper() != "ENDE", iter(input, "")))
+
+        print("""+----------+---------------------+-----------------------+
+| ID       | Name                | Hinzugefügt           |
++----------+---------------------+-----------------------+""")
+        for item_id, units in sorted(result.added.items()):
+            item = self.inventory.item(item_id)
+            print(f"""| {item_id:<8} | {item.name:<19} | {units:<21} |""")
+        print("""+----------+---------------------+-----------------------+""")
+
+        for order_nr, count in result.unknown.items():
+            print(f"Unbekannte Bestellnummer {order_nr} ({count}x gescannt)")
+        for order_nr, (count, item_ids) in result.ambiguous.items():
+            print(f"Mehrdeutige Bestellnummer {order_nr} ({count}x gescannt): ItemIDs {', '.join(map(str, item_ids))}")
+
+    def purchasing_report(self):
+        sub_menu = """+----------+-------------------------------------------------+
+| 6        | Einkaufsübersicht (günstigster Lieferant, Wert) |
++----------+-------------------------------------------------+"""
+        print(sub_menu)
+
+        # precomputed table (kept up to date by triggers, see migrations.py) -> no join over all orders
+        table = TableRenderer(["ID", "Name", "Units", "vendorID", "Lieferant", "Preis [CHF]", "Wert [CHF]"])
+        table.render(self.inventory.iter_pages("summary_page"), more=self.next_page)
+        print(f"Gesamtwert des Lagers: {self.inventory.stock_value():.2f} CHF")
+
     def end_menu(self):
         print("""+----------+-------------------------------------------------+
-|  5       | Programm beendet. Auf Wiedersehen!              |
+|  7       | Programm beendet. Auf Wiedersehen!              |
 +----------+-------------------------------------------------+""")
 
 
     def run(self):
         while True:
             self.display_menu()
-            choice = input("\nWählen Sie eine Option (1-5): ")
+            choice = input("\nWählen Sie eine Option (1-7): ")
 
             if choice == "1":
                 self.list_vendors()
@@ -126,10 +151,14 @@ class DatabaseInterface:
             elif choice == "4":
                 self.scan_item()
             elif choice == "5":
+                self.batch_scan()
+            elif choice == "6":
+                self.purchasing_report()
+            elif choice == "7":
                 self.end_menu()
                 break
             else:
-                print("\nUngültige Eingabe. Bitte wählen Sie eine gültige Option (1-5).\n")
+                print("\nUngültige Eingabe. Bitte wählen Sie eine gültige Option (1-7).\n")
             
             # warte bis enter gedrückt zum weitermachen
             input("Drücker ENTER um zurück zum Hauptmenu zu gelangen")
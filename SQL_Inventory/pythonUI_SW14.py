@@ -1,9 +1,13 @@
-import sqlite3
+from itertools import takewhile
+
+from inventory_db import InventoryDB
+from table_renderer import TableRenderer
 
 class DatabaseInterface:
     def __init__(self, db_path:str):
-        self.db = sqlite3.connect(db_path)
-        self.cursor = self.db.cursor()
+        # all queries are named, parameterized statements (see inventory_db.py)
+        self.inventory = InventoryDB(db_path)
+        self.db = self.inventory.db
 
         self.main_menu = """+----------+-------------------------------------------------+
 | Auswahl  | Beschreibung                                    |
@@ -16,7 +20,11 @@ class DatabaseInterface:
 +----------+-------------------------------------------------+
 | 4        | Artikel scannen (nach Bestellnummer)            |
 +----------+-------------------------------------------------+
-| 5        | Beenden                                         |
+| 5        | Artikel im Stapel scannen (Datei / Scanner)     |
++----------+-------------------------------------------------+
+| 6        | Einkaufsübersicht (günstigster Lieferant, Wert) |
++----------+-------------------------------------------------+
+| 7        | Beenden                                         |
 +----------+-------------------------------------------------+
 """
 
@@ -24,16 +32,9 @@ class DatabaseInterface:
         print(self.main_menu)
 
     def list_vendors(self):
-
-        sql_command = "SELECT vendorID,name,url FROM vendors"
-        self.cursor.execute(sql_command)
-
-        print("""+-------------+-------------------------+------------------------------+
-| vendorID    | name                    | url                          |
-+-------------+-------------------------+------------------------------+""")
-        for vendorID,name,url in self.cursor:
-            print(f"""| {str(vendorID):<12}| {name:<24}| {url:<29}|
-+-------------+-------------------------+------------------------------+""")
+        # streamed page by page (see table_renderer.py)
+        table = TableRenderer(["vendorID", "name", "url"])
+        table.render(self.inventory.iter_pages("vendors_page"), more=self.next_page)
         
 
     def list_items(self):
@@ -43,35 +44,26 @@ class DatabaseInterface:
         print(sub_menu)
         item_name = input("\nGeben Sie den Artikelnamen ein: ")
 
-        # get all items first
-        sql_command = f"SELECT itemID,name,category,units FROM inventory"
-        self.cursor.execute(sql_command)
+        # search in the database (FTS5 index, see inventory_search.py), one page at a time
+        table = TableRenderer(["ID", "Name", "Category", "Units"])
+        if table.render(self.inventory.iter_search_pages(item_name), more=self.next_page) == 0:
+            print("Keine Artikel gefunden")
 
-        print("""+----------+---------------------+------------------+-----------------------+
-| ID       | Name                | Category         | Units                 |
-+----------+---------------------+------------------+-----------------------+""")
-              
-        for id,name,category,units in self.cursor:
-            if item_name.upper() in name.upper():
-                print(f"""| {str(id):<9}| {name:<19} | {category:<16} | {str(units):<22}|
-+----------+---------------------+------------------+-----------------------+""")
+    def next_page(self) -> bool:
+        return input("ENTER für die nächste Seite, 'q' zum Abbrechen: ").lower() != "q"
 
     def get_orders(self):
         sub_menu = """+----------+-------------------------------------------------+
 | 3        | Bestellmöglichkeiten abrufen (nach ItemID)      |
 +----------+-------------------------------------------------+"""
         print(sub_menu)
-        item_id = input("\nGeben Sie die ItemID ein: ")
-        
+        item_id = input("\nGeben Sie die ItemID ein: ").strip()
 
-        sql_command = f"SELECT itemID,orderNr,price FROM orderLookup WHERE itemID == {item_id}"
-        
-        self.cursor.execute(sql_command)
         print("""+----------+-------------+----------------------+------------+
 | 3        | itemID      | orderNr              | price CHF  |
 +----------+-------------+----------------------+------------+""")
-        for itemID,orderNr,price in self.cursor:
-            print(f"""|          | {itemID:<11} | {orderNr:<20} | {price:<10} |""")
+        for order in self.inventory.orders_for_item(item_id):
+            print(f"""|          | {order.itemID:<11} | {order.orderNr:<20} | {order.price:<10} |""")
         print("""+----------+-------------+----------------------+------------+""")
 
     def scan_item(self):
@@ -79,64 +71,85 @@ class DatabaseInterface:
 | 4        | Artikel scannen (nach Bestellnummer)            |
 +----------+-------------------------------------------------+"""
         print(sub_menu)
-        order_nr = input("\nGeben Sie die Bestellnummer ein: ")
-        
-        sql_command = f"""SELECT itemID,orderNr,price FROM orderLookup WHERE orderNr = {order_nr}"""
-        
-        self.cursor.execute(sql_command)
-
-        orders = {}
+        order_nr = input("\nGeben Sie die Bestellnummer ein: ").strip()
+
+        # 2 statements per scan: one join for the lookup, one UPDATE ... RETURNING for the new stock
+        matches = self.inventory.scan_lookup(order_nr)
+        if not matches:
+            print(f"No Item found with orderNr {order_nr}")
+            return
+
+        item = None
+        for match in matches:
+            answer = input(f"Found item {match.name} ({match.vendor}, {match.price} CHF) with given orderNr {match.orderNr} - Do you want to add this? [Y/N]")
+            if answer.upper() == "Y":
+                print(f"Adding 1 to {match.name} with id {match.itemID}")
+                item = self.inventory.add_units(match.itemID, 1)
+                break
 
-        for itemID,orderNr,price in self.cursor:
-            
-            orders[orderNr] = {}
-            orders[orderNr]["itemID"] = itemID
-            orders[orderNr]["price"] = price
-
-        for orderNr in orders:
-            if str(orderNr) == str(order_nr):
-                second_select = f"""SELECT itemID,name from inventory WHERE itemID == {itemID}"""
-                self.cursor.execute(second_select)
-
-                for itemID,name in self.cursor:
-                    answer = input(f"Found item {name} with given orderNr {orderNr} - Do you want to add this? [Y/N]")
-
-                    if answer.upper() == "Y":
-                        
-                        try:
-                            print(f"Adding 1 to {name} with id {itemID}")
-                            update_query = f"""UPDATE inventory SET units = units + 1 WHERE itemID = {itemID};"""
-                            self.cursor.execute(update_query)
-                        except:
-                            self.db.rollback()
-                        else:
-                            self.db.commit()
-                            break
+        if item is None:
+            return
         print(f"New Inventory:")
 
-        sql_3 = f"""SELECT itemID,name,units FROM inventory WHERE itemID = {itemID}"""
-        
-        self.cursor.execute(sql_3)
-
         print("""+----------+---------------------+-----------------------+
 | ID       | Name                | Units                 |
 +----------+---------------------+-----------------------+""")
-        for itemID,name,units in self.cursor:
-             print(f"""| {itemID:<8} | {name:<18} | {units:<21} |""")
+        print(f"""| {item.itemID:<8} | {item.name:<18} | {item.units:<21} |""")
 
         print("""+----------+---------------------+-----------------------+""")
         
 
+    def batch_scan(self, source: str = None):
+        sub_menu = """+----------+-------------------------------------------------+
+| 5        | Artikel im Stapel scannen (Datei / Scanner)     |
++----------+-------------------------------------------------+"""
+        print(sub_menu)
+        if source is None:
+            source = input("\nDatei oder Scanner-Gerät (leer: Bestellnummern eingeben): ").strip()
+
+        # all scans are applied at the end in one transaction
+        #   a scanner device never ends -> a line 'ENDE' (e.g. a printed barcode) ends the batch
+        if source:
+            with open(source) as scans:
+                result = self.inventory.batch_scan(takewhile(lambda line: line.strip().upper() != "ENDE", scans))
+        else:
+            print("Eine Bestellnummer pro Zeile, leere Zeile oder 'ENDE' zum Abschliessen:")
+            result = self.inventory.batch_scan(takewhile(lambda line: line.strip().upper() != "ENDE", iter(input, "")))
+
+        print("""+----------+---------------------+-----------------------+
+| ID       | Name                | Hinzugefügt           |
++----------+---------------------+-----------------------+""")
+        for item_id, units in sorted(result.added.items()):
+            item = self.inventory.item(item_id)
+            print(f"""| {item_id:<8} | {item.name:<19} | {units:<21} |""")
+        print("""+----------+---------------------+-----------------------+""")
+
+        for order_nr, count in result.unknown.items():
+            print(f"Unbekannte Bestellnummer {order_nr} ({count}x gescannt)")
+        for order_nr, (count, item_ids) in result.ambiguous.items():
+            print(f"Mehrdeutige Bestellnummer {order_nr} ({count}x gescannt): ItemIDs {', '.join(map(str, item_ids))}")
+
+    def purchasing_report(self):
+        sub_menu = """+----------+-------------------------------------------------+
+| 6        | Einkaufsübersicht (günstigster Lieferant, Wert) |
++----------+-------------------------------------------------+"""
+        print(sub_menu)
+
+        # precomputed table (kept up to date by triggers, see migrations.py) -> no join over all orders
+        table = TableRenderer(["ID", "Name", "Units", "vendorID", "Lieferant", "Preis [CHF]", "Wert [CHF]"])
+        table.render(self.inventory.iter_pages("summary_page"), more=self.next_page)
+        print(f"Gesamtwert des Lagers: {self.inventory.stock_value():.2f} CHF")
+
     def end_menu(self):
         print("""+----------+-------------------------------------------------+
-|  5       | Programm beendet. Auf Wiedersehen!              |
+|  7       | Programm beendet. Auf Wiedersehen!              |
 +----------+-------------------------------------------------+""")
 
 
     def run(self):
         while True:
             self.display_menu()
-            choice = input("\nWählen Sie eine Option (1-5): ")
+            choice = input("\nWählen Sie eine Option (1-7): ")
 
             if choice == "1":
                 self.list_vendors()
@@ -147,10 +160,14 @@ class DatabaseInterface:
             elif choice == "4":
                 self.scan_item()
             elif choice == "5":
+                self.batch_scan()
+            elif choice == "6":
+                self.purchasing_report()
+            elif choice == "7":
                 self.end_menu()
                 break
             else:
-                print("\nUngültige Eingabe. Bitte wählen Sie eine gültige Option (1-5).\n")
+                print("\nUngültige Eingabe. Bitte wählen Sie eine gültige Option (1-7).\n")
             
             # warte bis enter gedrückt zum weitermachen
             input("Drücker ENTER um zurück zum Hauptmenu zu gelangen")
@@ -0,0 +1,88 @@
+"""
+ASCII tables for listings of any length
+
+    Rows are rendered one page at a time: the column widths are computed per page and
+    every page is written with a single write() -> the first page appears immediately,
+    memory stays constant (one page) no matter how many rows follow.
+"""
+import sys
+from typing import Callable, Iterable, Iterator
+
+
+MAX_WIDTH = 40          # longer values are cut (…)
+
+
+def page_widths(columns: list[str], rows: list[tuple], max_width: int = MAX_WIDTH) -> list[int]:
+    """
+    Width of every column on this page (title or longest value, at most max_width)
+    """
+    widths = [len(title) for title in columns]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(cell(value)))
+    return [min(width, max_width) for width in widths]
+
+
+def cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+class TableRenderer:
+    """
+    Writes pages of rows as ASCII tables
+
+    Attributes:
+        columns (list[str]):    Column titles
+        out (TextIO):           Output (default: sys.stdout)
+        max_width (int):        Max. width of a column
+    """
+
+    def __init__(self, columns: list[str], out=None, max_width: int = MAX_WIDTH) -> None:
+        self.columns = columns
+        self.out = out or sys.stdout
+        self.max_width = max_width
+
+    def page(self, rows: list[tuple]) -> None:
+        """
+        Write one page: header, rows and bottom line
+        """
+        widths = page_widths(self.columns, rows, self.max_width)
+        line = "+" + "+".join("-" * (width + 2) for width in widths) + "+\n"
+
+        parts = [line, self.__row(self.columns, widths), line]
+        parts.extend(self.__row(row, widths) for row in rows)
+        parts.append(line)
+        self.out.write("".join(parts))
+        self.out.flush()
+
+    def render(self, pages: Iterable[list[tuple]], more: Callable[[], bool] = None) -> int:
+        """
+        Write all pages
+
+        Parameters:
+            pages (Iterable):   Pages of rows (e.g. InventoryDB.iter_pages), fetched one after the other
+            more (Callable):    Asked before every further page, False stops (None: write all pages)
+
+        Returns:
+            int:    Number of rows written
+        """
+        count = 0
+        pages: Iterator = iter(pages)
+        rows = next(pages, None)
+        while rows:
+            self.page(rows)
+            count += len(rows)
+
+            rows = next(pages, None)
+            if rows and more is not None and not more():
+                break
+        return count
+
+    def __row(self, values: tuple, widths: list[int]) -> str:
+        cells = []
+        for value, width in zip(values, widths):
+            text = cell(value)
+            if len(text) > width:
+                text = text[:width - 1] + "…"
+            cells.append(f" {text:<{width}} ")
+        return "|" + "|".join(cells) + "|\n"